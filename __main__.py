@@ -4,9 +4,25 @@ Entry point for running QGIS MCP Server as a module.
 
 Usage:
     python -m qgis_mcp_server
+    python -m qgis_mcp_server --version
 """
 
-from src.qgis_mcp_server import main
+import argparse
 
 if __name__ == "__main__":
-    main()
+    # --help and --version are answered before the server is imported
+    parser = argparse.ArgumentParser(
+        prog="qgis_mcp_server",
+        description="QGIS MCP Server (stdio transport for MCP clients)",
+    )
+    parser.add_argument("--version", action="store_true", help="show version and exit")
+    args = parser.parse_args()
+
+    from src.qgis_mcp_server import __version__
+
+    if args.version:
+        print(__version__)
+    else:
+        from src.qgis_mcp_server import main
+
+        main()
@@ -15,8 +15,41 @@ Prerequisites:
 
 from qgis_mcp import connect
 import os
+import sys
 import time
 
+
+def _render_bar(progress, width):
+    filled = int(width * progress / 100)
+    return f"[{'█' * filled}{'░' * (width - filled)}] {progress}%"
+
+
+# Progress is an integer 0-100, so every default-width bar can be built once
+_BARS = tuple(_render_bar(p, 40) for p in range(101))
+
+
+def progress_bar(progress, width=40):
+    """Create a progress bar"""
+    if width == 40 and 0 <= progress <= 100:
+        return _BARS[progress]
+    return _render_bar(progress, width)
+
+
+class TTYLine:
+    """Single terminal line redrawn in place, at most every `interval` seconds"""
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.last = 0.0
+
+    def update(self, text, force=False):
+        now = time.monotonic()
+        if force or now - self.last >= self.interval:
+            sys.stdout.write(f"\r{text}")
+            sys.stdout.flush()
+            self.last = now
+
+
 def main():
     token = os.getenv('QGIS_MCP_TOKEN')
     if not token:
@@ -57,27 +90,20 @@ def main():
 
         print(f"✓ Operation started: {operation_id}")
 
-        # Monitor progress
+        # Wait for completion (server notifies on progress, no polling)
         print("Monitoring progress:")
-        while True:
-            status = client.get_operation_status(operation_id)
-
-            state = status['state']
-            progress = status.get('progress', 0)
-
-            if state == 'running':
-                print(f"  Progress: {progress}%", end='\r')
-                time.sleep(0.5)
-
-            elif state == 'completed':
-                print(f"  Progress: 100% - Complete!     ")
-                result = client.get_operation_result(operation_id)
-                print(f"✓ Result: {result['OUTPUT']}")
-                break
+        line = TTYLine()
+        status = client.wait_for_operation(
+            operation_id,
+            progress_callback=lambda progress: line.update(f"  Progress: {progress}%")
+        )
 
-            elif state == 'failed':
-                print(f"✗ Failed: {status.get('error', 'Unknown error')}")
-                break
+        if status['status'] == 'completed':
+            print(f"\r  Progress: 100% - Complete!     ")
+            result = client.get_operation_result(operation_id)
+            print(f"✓ Result: {result['OUTPUT']}")
+        else:
+            print(f"\n✗ Failed: {status.get('error') or 'Unknown error'}")
 
         # Example 2: Multiple parallel operations
         print("\n[Example 2/3] Multiple parallel operations")
@@ -100,28 +126,27 @@ def main():
             operations[op_id] = distance
             print(f"  ✓ Buffer {distance}m: {op_id[:8]}...")
 
-        # Wait for all to complete
+        # Wait for all to complete: one batched request per completion,
+        # the server blocks until any of the pending operations finishes
         print("\nWaiting for completion...")
-        completed = 0
+        pending = dict(operations)
+
+        while pending:
+            statuses = client.get_operation_status_batch(list(pending), wait=10)
 
-        while completed < len(operations):
-            for op_id, distance in operations.items():
-                status = client.get_operation_status(op_id)
+            for op_id, status in statuses.items():
+                if status and not status['completed']:
+                    continue
 
-                if status['state'] == 'completed' and op_id in operations:
+                # Iterating the response, not `pending`, so popping is safe
+                distance = pending.pop(op_id)
+                if status is None:
+                    print(f"  ✗ Buffer {distance}m no longer known to the server")
+                elif status['status'] == 'completed':
                     result = client.get_operation_result(op_id)
                     print(f"  ✓ Buffer {distance}m complete: {result['OUTPUT']}")
-                    operations.pop(op_id)  # Remove from tracking
-                    completed += 1
-                    break  # Restart loop
-
-                elif status['state'] == 'failed':
+                else:
                     print(f"  ✗ Buffer {distance}m failed")
-                    operations.pop(op_id)
-                    completed += 1
-                    break
-
-            time.sleep(0.5)
 
         print(f"✓ All operations completed!")
 
@@ -129,12 +154,6 @@ def main():
         print("\n[Example 3/3] Progress monitoring with visual indicator")
         print("-" * 70)
 
-        def progress_bar(progress, width=40):
-            """Create a progress bar"""
-            filled = int(width * progress / 100)
-            bar = "█" * filled + "░" * (width - filled)
-            return f"[{bar}] {progress}%"
-
         print("Starting large buffer operation...")
         operation_id = client.execute_processing_async(
             algorithm="native:buffer",
@@ -148,26 +167,20 @@ def main():
 
         print(f"Operation ID: {operation_id}\n")
 
-        while True:
-            status = client.get_operation_status(operation_id)
-            state = status['state']
-            progress = status.get('progress', 0)
-
-            if state == 'running':
-                print(f"\r{progress_bar(progress)}", end='')
-                time.sleep(0.3)
-
-            elif state == 'completed':
-                print(f"\r{progress_bar(100)}")
-                result = client.get_operation_result(operation_id)
-                print(f"\n✓ Operation completed!")
-                print(f"  Result: {result['OUTPUT']}")
-                break
-
-            elif state == 'failed':
-                print(f"\r{progress_bar(progress)}")
-                print(f"\n✗ Operation failed: {status.get('error')}")
-                break
+        line = TTYLine()
+        status = client.wait_for_operation(
+            operation_id,
+            progress_callback=lambda progress: line.update(progress_bar(progress))
+        )
+
+        if status['status'] == 'completed':
+            line.update(progress_bar(100), force=True)
+            result = client.get_operation_result(operation_id)
+            print(f"\n✓ Operation completed!")
+            print(f"  Result: {result['OUTPUT']}")
+        else:
+            line.update(progress_bar(status.get('progress', 0)), force=True)
+            print(f"\n✗ Operation failed: {status.get('error')}")
 
         # Bonus: Cancel operation
         print("\n[Bonus] Canceling operation")
@@ -58,7 +58,8 @@ def main():
 
         features = client.get_features(
             layer_id=layer_id,
-            limit=5  # Get first 5 features
+            limit=5,  # Get first 5 features
+            geometry='bbox'  # Extent is enough for display; skip full geometry
         )
 
         print(f"✓ Retrieved {len(features)} features from '{layer_name}':")
@@ -67,7 +68,8 @@ def main():
             print(f"\n  Feature {i}:")
             print(f"    ID: {feature['id']}")
             print(f"    Attributes: {feature['attributes']}")
-            print(f"    Geometry: {feature['geometry'][:50]}...")  # First 50 chars
+            if feature['geometry']:
+                print(f"    Geometry: {feature['geometry']['type']} within {feature['geometry']['bbox']}")
 
         # Execute simple processing
         if len(layers) > 0 and layers[0]['type'] == 'vector':
@@ -47,89 +47,69 @@ def main():
         print(f"✓ Input layer: {input_layer['name']} ({input_layer['feature_count']} features)")
         print(f"✓ Clip layer: {clip_layer['name']} ({clip_layer['feature_count']} features)")
 
-        # Step 2: Buffer
-        print("\n[Step 2/6] Creating buffer (5km)...")
-
-        buffer_result = client.execute_processing(
-            algorithm="native:buffer",
-            parameters={
-                "INPUT": input_layer['id'],
-                "DISTANCE": 5000,  # 5 kilometers
-                "SEGMENTS": 16,
-                "END_CAP_STYLE": 0,  # Round
-                "JOIN_STYLE": 0,  # Round
-                "DISSOLVE": False,
-                "OUTPUT": "memory:buffered"
-            }
-        )
-
-        buffered_layer_id = buffer_result['OUTPUT']
-        print(f"✓ Buffer created: {buffered_layer_id}")
-
-        # Step 3: Dissolve
-        print("\n[Step 3/6] Dissolving buffers...")
-
-        dissolve_result = client.execute_processing(
-            algorithm="native:dissolve",
-            parameters={
-                "INPUT": buffered_layer_id,
-                "FIELD": [],  # Dissolve all into one
-                "OUTPUT": "memory:dissolved"
-            }
-        )
-
-        dissolved_layer_id = dissolve_result['OUTPUT']
-        print(f"✓ Dissolved: {dissolved_layer_id}")
-
-        # Step 4: Clip
-        print("\n[Step 4/6] Clipping to study area...")
-
-        clip_result = client.execute_processing(
-            algorithm="native:clip",
-            parameters={
-                "INPUT": dissolved_layer_id,
-                "OVERLAY": clip_layer['id'],
-                "OUTPUT": "memory:clipped"
-            }
-        )
-
-        clipped_layer_id = clip_result['OUTPUT']
-        print(f"✓ Clipped: {clipped_layer_id}")
-
-        # Step 5: Calculate area
-        print("\n[Step 5/6] Calculating area...")
-
-        area_result = client.execute_processing(
-            algorithm="qgis:fieldcalculator",
-            parameters={
-                "INPUT": clipped_layer_id,
-                "FIELD_NAME": "area_km2",
-                "FIELD_TYPE": 0,  # Float
-                "FIELD_LENGTH": 10,
-                "FIELD_PRECISION": 2,
-                "FORMULA": "$area / 1000000",  # Convert m² to km²
-                "OUTPUT": "memory:with_area"
-            }
-        )
-
-        final_layer_id = area_result['OUTPUT']
-        print(f"✓ Area calculated: {final_layer_id}")
+        # Steps 2-5 run as one server-side pipeline; each step reads the
+        # previous step's output, so no intermediate layer comes back here.
+        print("\n[Steps 2-5/6] Buffer (5km) → dissolve → clip → calculate area...")
+
+        pipeline = client.execute_pipeline([
+            {
+                "algorithm_id": "native:buffer",
+                "parameters": {
+                    "INPUT": input_layer['id'],
+                    "DISTANCE": 5000,  # 5 kilometers
+                    "SEGMENTS": 16,
+                    "END_CAP_STYLE": 0,  # Round
+                    "JOIN_STYLE": 0,  # Round
+                    "DISSOLVE": False,
+                    "OUTPUT": "memory:buffered"
+                }
+            },
+            {
+                "algorithm_id": "native:dissolve",
+                "parameters": {
+                    "INPUT": "$step1.OUTPUT",
+                    "FIELD": [],  # Dissolve all into one
+                    "OUTPUT": "memory:dissolved"
+                }
+            },
+            {
+                "algorithm_id": "native:clip",
+                "parameters": {
+                    "INPUT": "$step2.OUTPUT",
+                    "OVERLAY": clip_layer['id'],
+                    "OUTPUT": "memory:clipped"
+                }
+            },
+            {
+                "algorithm_id": "qgis:fieldcalculator",
+                "parameters": {
+                    "INPUT": "$step3.OUTPUT",
+                    "FIELD_NAME": "area_km2",
+                    "FIELD_TYPE": 0,  # Float
+                    "FIELD_LENGTH": 10,
+                    "FIELD_PRECISION": 2,
+                    "FORMULA": "$area / 1000000",  # Convert m² to km²
+                    "OUTPUT": "memory:with_area"
+                }
+            },
+        ])
+
+        # Only the last step's layer is kept (and added to the project);
+        # the in-memory layers of steps 2-4 are discarded on the server
+        final_layer_id = pipeline['result']['OUTPUT']
+        print(f"✓ Buffer → dissolve → clip → area: {final_layer_id}")
 
         # Step 6: Get statistics
         print("\n[Step 6/6] Extracting statistics...")
 
-        # Get features from final layer
-        final_features = client.get_features(
-            layer_id=final_layer_id,
-            limit=100
-        )
-
-        total_area = sum(f['attributes'].get('area_km2', 0) for f in final_features)
+        # Aggregate on the server instead of fetching every feature
+        total_area = client.aggregate(final_layer_id, 'area_km2', 'sum')
+        feature_count = client.aggregate(final_layer_id, '*', 'count')
 
         print(f"✓ Analysis complete!")
         print(f"\nResults:")
         print(f"  - Input features: {input_layer['feature_count']}")
-        print(f"  - Buffered features: {len(final_features)}")
+        print(f"  - Buffered features: {feature_count}")
         print(f"  - Total area: {total_area:,.2f} km²")
 
         # Optional: Export to file
@@ -4,7 +4,7 @@ Map Rendering Example
 
 This example demonstrates:
 - Rendering maps at different resolutions
-- Exporting to different formats (PNG, JPG, PDF)
+- Streaming renders straight to PNG files
 - Rendering specific extents
 - Batch map generation
 
@@ -13,6 +13,7 @@ Prerequisites:
 - At least one layer loaded in QGIS
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from qgis_mcp import connect
 import os
 from pathlib import Path
@@ -47,54 +48,48 @@ def main():
         # Render 1: Screen resolution (96 DPI)
         print("\n[2/5] Rendering screen resolution map (96 DPI)...")
 
-        screen_map = client.render_map(
+        screen_path = output_dir / "map_screen.png"
+        screen_size = client.render_map_to_file(
+            screen_path,
             width=1920,
             height=1080,
             dpi=96,
             format="PNG"
         )
 
-        screen_path = output_dir / "map_screen.png"
-        with open(screen_path, "wb") as f:
-            f.write(screen_map)
-
         print(f"✓ Saved: {screen_path}")
-        print(f"  Size: {len(screen_map) / 1024:.1f} KB")
+        print(f"  Size: {screen_size / 1024:.1f} KB")
 
         # Render 2: Print resolution (300 DPI)
-        print("\n[3/5] Rendering print resolution map (300 DPI, PDF)...")
+        print("\n[3/5] Rendering print resolution map (300 DPI)...")
 
-        print_map = client.render_map(
+        print_path = output_dir / "map_print.png"
+        print_size = client.render_map_to_file(
+            print_path,
             width=3300,   # A4 width at 300 DPI
             height=2550,  # A4 height at 300 DPI
             dpi=300,
-            format="PDF"
+            format="PNG"
         )
 
-        print_path = output_dir / "map_print.pdf"
-        with open(print_path, "wb") as f:
-            f.write(print_map)
-
         print(f"✓ Saved: {print_path}")
-        print(f"  Size: {len(print_map) / 1024:.1f} KB")
+        print(f"  Size: {print_size / 1024:.1f} KB")
 
-        # Render 3: JPG (smaller file size)
-        print("\n[4/5] Rendering compressed map (JPG)...")
+        # Render 3: Thumbnail (smaller file size). The server only encodes
+        # PNG; render_map_to_file rejects other formats.
+        print("\n[4/5] Rendering thumbnail map...")
 
-        jpg_map = client.render_map(
-            width=1920,
-            height=1080,
+        thumb_path = output_dir / "map_thumbnail.png"
+        thumb_size = client.render_map_to_file(
+            thumb_path,
+            width=480,
+            height=270,
             dpi=96,
-            format="JPG",
-            quality=85
+            format="PNG"
         )
 
-        jpg_path = output_dir / "map_compressed.jpg"
-        with open(jpg_path, "wb") as f:
-            f.write(jpg_map)
-
-        print(f"✓ Saved: {jpg_path}")
-        print(f"  Size: {len(jpg_map) / 1024:.1f} KB")
+        print(f"✓ Saved: {thumb_path}")
+        print(f"  Size: {thumb_size / 1024:.1f} KB")
 
         # Render 4: Custom extent
         print("\n[5/5] Rendering custom extent...")
@@ -109,14 +104,16 @@ def main():
             x_margin = (xmax - xmin) * 0.1
             y_margin = (ymax - ymin) * 0.1
 
-            custom_extent = [
-                xmin - x_margin,
-                ymin - y_margin,
-                xmax + x_margin,
-                ymax + y_margin
-            ]
+            custom_extent = {
+                "xmin": xmin - x_margin,
+                "ymin": ymin - y_margin,
+                "xmax": xmax + x_margin,
+                "ymax": ymax + y_margin
+            }
 
-            custom_map = client.render_map(
+            custom_path = output_dir / "map_custom_extent.png"
+            client.render_map_to_file(
+                custom_path,
                 width=1024,
                 height=768,
                 dpi=96,
@@ -124,48 +121,49 @@ def main():
                 extent=custom_extent
             )
 
-            custom_path = output_dir / "map_custom_extent.png"
-            with open(custom_path, "wb") as f:
-                f.write(custom_map)
-
             print(f"✓ Saved: {custom_path}")
             print(f"  Extent: {custom_extent}")
 
-        # Bonus: Batch render multiple formats
-        print("\n[Bonus] Batch rendering all formats...")
+        # Bonus: Batch render multiple sizes
+        print("\n[Bonus] Batch rendering several sizes...")
 
-        formats = {
-            "PNG": {"format": "PNG"},
-            "JPG": {"format": "JPG", "quality": 90},
-            "PDF": {"format": "PDF"},
+        sizes = {
+            "small": {"width": 400, "height": 300},
+            "medium": {"width": 800, "height": 600},
+            "large": {"width": 1600, "height": 1200},
         }
 
-        for name, params in formats.items():
-            print(f"  - Rendering {name}...", end=" ")
-
-            map_data = client.render_map(
-                width=800,
-                height=600,
-                dpi=150,
-                **params
+        # Renders are independent: keep several in flight at once. Each
+        # thread borrows its own pooled connection, which the client
+        # authenticates on first use.
+        def _render(item):
+            name, params = item
+            batch_path = output_dir / f"map_batch_{name}.png"
+            size = client.render_map_to_file(
+                batch_path, dpi=150, format="PNG", **params
             )
+            return name, size
 
-            ext = name.lower()
-            batch_path = output_dir / f"map_batch.{ext}"
-
-            with open(batch_path, "wb") as f:
-                f.write(map_data)
+        print(f"  - Rendering {', '.join(sizes)} in parallel...")
+        with ThreadPoolExecutor(max_workers=len(sizes)) as executor:
+            results = list(executor.map(_render, sizes.items()))
 
-            print(f"✓ ({len(map_data) / 1024:.1f} KB)")
+        for name, size in results:
+            print(f"  - {name}: ✓ ({size / 1024:.1f} KB)")
 
     print("\n" + "=" * 70)
     print("✓ Map rendering completed!")
     print(f"\nGenerated maps in: {output_dir.absolute()}")
     print("\nFiles created:")
 
-    for file in sorted(output_dir.glob("*")):
-        size_kb = file.stat().st_size / 1024
-        print(f"  - {file.name} ({size_kb:.1f} KB)")
+    # scandir reports the file type with each entry, so is_file() needs no
+    # syscall; stat() still makes one call per file for the size
+    with os.scandir(output_dir) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+
+    for entry in entries:
+        if entry.is_file():
+            print(f"  - {entry.name} ({entry.stat().st_size / 1024:.1f} KB)")
 
     print("=" * 70)
 
@@ -55,16 +55,6 @@ Usage Examples:
 Token is displayed in QGIS message log.
 """
 
-from .qgis_mcp_server_secure import (
-    SecureQGISMCPServer,
-    start_secure_server
-)
-
-from .qgis_mcp_server_optimized import (
-    OptimizedQGISMCPServer,
-    start_optimized_server
-)
-
 __version__ = '2.0.0-optimized'
 __all__ = [
     'SecureQGISMCPServer',
@@ -74,6 +64,30 @@ __all__ = [
     'classFactory'
 ]
 
+# Server classes are imported on first use (PEP 562), so loading the plugin
+# does not pull in both server stacks up front
+_LAZY_EXPORTS = {
+    'SecureQGISMCPServer': '.qgis_mcp_server_secure',
+    'start_secure_server': '.qgis_mcp_server_secure',
+    'OptimizedQGISMCPServer': '.qgis_mcp_server_optimized',
+    'start_optimized_server': '.qgis_mcp_server_optimized',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 def classFactory(iface):
     """
@@ -3,20 +3,21 @@ Async Command Executor for QGIS MCP Server
 Provides non-blocking execution of long-running operations with progress reporting
 """
 
+import asyncio
+import heapq
+import inspect
+import itertools
+import logging
+import os
 import time
 import threading
 import traceback
-from typing import Dict, Any, Optional, Callable
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable
 from enum import Enum
 from datetime import datetime
 
-try:
-    from PyQt5.QtCore import QThread, pyqtSignal, QObject
-    HAS_QT = True
-except ImportError:
-    HAS_QT = False
-    print("Warning: PyQt5 not available, async operations will use threading.Thread")
-
 try:
     from qgis.core import QgsMessageLog, Qgis
     HAS_QGIS = True
@@ -24,6 +25,38 @@ except ImportError:
     HAS_QGIS = False
 
 
+logger = logging.getLogger(__name__)
+
+# Per-operation lifecycle messages go to the QGIS message log (a signal
+# marshalled to the GUI thread) only at or above this level; below it they
+# are plain `logging` records, which are near free when disabled
+_QGIS_LOG_LEVEL = getattr(
+    logging, os.environ.get("QGIS_MCP_LOG_LEVEL", "WARNING").upper(), logging.WARNING
+)
+
+
+def _log_operation(message: str, level: int = logging.INFO) -> None:
+    """Log an operation lifecycle event"""
+    logger.log(level, message)
+
+    if HAS_QGIS and level >= _QGIS_LOG_LEVEL:
+        if level >= logging.ERROR:
+            qgis_level = Qgis.Critical
+        elif level >= logging.WARNING:
+            qgis_level = Qgis.Warning
+        else:
+            qgis_level = Qgis.Info
+        QgsMessageLog.logMessage(message, "QGIS MCP Async", qgis_level)
+
+
+def _accepts_cancel_event(handler: Callable) -> bool:
+    """Check whether a handler declares a _cancel_event parameter"""
+    try:
+        return "_cancel_event" in inspect.signature(handler).parameters
+    except (TypeError, ValueError):
+        return False
+
+
 class OperationStatus(Enum):
     """Status of async operation"""
     PENDING = "pending"
@@ -34,268 +67,397 @@ class OperationStatus(Enum):
     TIMEOUT = "timeout"
 
 
+# Terminal states, as a set so membership tests build no tuple per call
+FINISHED_STATUSES = frozenset({
+    OperationStatus.COMPLETED, OperationStatus.FAILED,
+    OperationStatus.CANCELLED, OperationStatus.TIMEOUT
+})
+ACTIVE_STATUSES = frozenset({OperationStatus.PENDING, OperationStatus.RUNNING})
+
+
 class AsyncOperationResult:
     """Result container for async operations"""
 
+    # One instance per tracked operation, kept for up to cleanup_after
+    __slots__ = (
+        "request_id", "_status", "_status_str", "_completed", "on_status_change", "progress", "progress_message",
+        "result", "error", "start_time", "end_time", "_start_mono", "_end_mono",
+        "cancelled", "on_change", "_changed", "_final_dict", "partial_results",
+        "_transition_lock"
+    )
+
     def __init__(self, request_id: str):
         self.request_id = request_id
-        self.status = OperationStatus.PENDING
+        self._status = OperationStatus.PENDING
+        self._status_str = OperationStatus.PENDING.value
+        self._completed = False
+        self._transition_lock = threading.Lock()
+        self.on_status_change: Optional[
+            Callable[[str, OperationStatus, OperationStatus], None]
+        ] = None
         self.progress = 0
         self.progress_message = ""
         self.result = None
         self.error = None
         self.start_time = time.time()
         self.end_time = None
+        self._start_mono = time.monotonic()  # For elapsed time; immune to clock jumps
+        self._end_mono: Optional[float] = None
         self.cancelled = False
+        self.on_change: Optional[Callable[[], None]] = None
+        self._changed = threading.Condition()
+        self._final_dict: Optional[Dict[str, Any]] = None
+        self.partial_results: List[Any] = []
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        elapsed = (self.end_time or time.time()) - self.start_time
+    @property
+    def status(self) -> OperationStatus:
+        """Current operation status"""
+        return self._status
 
-        return {
-            "request_id": self.request_id,
-            "status": self.status.value,
-            "progress": self.progress,
-            "progress_message": self.progress_message,
-            "result": self.result,
-            "error": self.error,
-            "elapsed_seconds": round(elapsed, 2),
-            "completed": self.status in (OperationStatus.COMPLETED, OperationStatus.FAILED, OperationStatus.CANCELLED, OperationStatus.TIMEOUT)
-        }
+    @status.setter
+    def status(self, value: OperationStatus) -> None:
+        self.transition(value)
 
+    def transition(self, value: OperationStatus, **fields: Any) -> bool:
+        """
+        Move to a new status unless the operation already finished
 
-if HAS_QT:
-    class AsyncCommandExecutor(QThread):
+        Worker, server and watchdog threads race to finish an operation;
+        the check, the field updates and the status-count callback happen
+        under one lock, so exactly one of them wins and a finished state is
+        never left.
+
+        Args:
+            value: New status
+            **fields: Attributes (result, error, ...) set along with it
+
+        Returns:
+            True if this call made the transition
         """
-        Qt-based async command executor
-        Runs commands in separate thread with progress reporting
+        with self._transition_lock:
+            old = self._status
+            if old is value or old in FINISHED_STATUSES:
+                return False
+
+            for name, field_value in fields.items():
+                setattr(self, name, field_value)
+
+            finished = value in FINISHED_STATUSES
+            if finished:
+                self.mark_ended()
+            self._status = value
+            # Derived once per transition so to_dict() does plain attribute reads
+            self._status_str = value.value
+            self._completed = finished
+            if self.on_status_change:
+                self.on_status_change(self.request_id, old, value)
+            return True
+
+    def mark_ended(self) -> None:
+        """Record the end of the operation"""
+        self.end_time = time.time()
+        self._end_mono = time.monotonic()
+
+    def notify_changed(self) -> None:
+        """Wake up any waiters blocked in wait_for_change()"""
+        self._final_dict = None
+        with self._changed:
+            self._changed.notify_all()
+
+        if self.on_change:
+            self.on_change()
+
+    def is_finished(self) -> bool:
+        """Check whether the operation reached a terminal state"""
+        return self._completed
+
+    def wait_for_change(self, last_progress: int, min_delta: int = 5,
+                        timeout: Optional[float] = None) -> bool:
         """
+        Block until progress moved by min_delta or the operation finished
 
-        # Signals for communication
-        finished = pyqtSignal(str, object)  # request_id, result
-        progress = pyqtSignal(str, int, str)  # request_id, percentage, message
-        error = pyqtSignal(str, str)  # request_id, error_message
+        Args:
+            last_progress: Progress value the caller already knows about
+            min_delta: Minimum progress change that wakes the waiter
+            timeout: Maximum seconds to wait (None to wait forever)
 
-        def __init__(
-            self,
-            request_id: str,
-            command_type: str,
-            handler: Callable,
-            params: Dict[str, Any],
-            timeout: Optional[float] = None
-        ):
-            """
-            Initialize async executor
-
-            Args:
-                request_id: Unique request identifier
-                command_type: Type of command to execute
-                handler: Function to execute
-                params: Parameters for handler
-                timeout: Timeout in seconds (None for no timeout)
-            """
-            super().__init__()
-            self.request_id = request_id
-            self.command_type = command_type
-            self.handler = handler
-            self.params = params
-            self.timeout = timeout or 300.0  # 5 minutes default
-            self.cancelled = False
-            self.result_obj = AsyncOperationResult(request_id)
-
-        def run(self):
-            """Execute command in thread"""
-            if HAS_QGIS:
-                QgsMessageLog.logMessage(
-                    f"Starting async operation: {self.request_id} ({self.command_type})",
-                    "QGIS MCP Async",
-                    Qgis.Info
-                )
+        Returns:
+            True if woken by a change, False on timeout
+        """
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self.is_finished() or abs(self.progress - last_progress) >= min_delta,
+                timeout=timeout
+            )
 
-            self.result_obj.status = OperationStatus.RUNNING
-            self.progress.emit(self.request_id, 0, "Starting...")
+    def wait_for_partials(self, start: int, timeout: Optional[float] = None) -> bool:
+        """
+        Block until more than start partial results exist or the operation finished
 
-            try:
-                # Execute with timeout monitoring
-                result = self._execute_with_timeout()
-
-                if not self.cancelled:
-                    self.result_obj.status = OperationStatus.COMPLETED
-                    self.result_obj.result = result
-                    self.result_obj.progress = 100
-                    self.result_obj.end_time = time.time()
-
-                    self.progress.emit(self.request_id, 100, "Completed")
-                    self.finished.emit(self.request_id, result)
-
-                    if HAS_QGIS:
-                        QgsMessageLog.logMessage(
-                            f"Async operation completed: {self.request_id}",
-                            "QGIS MCP Async",
-                            Qgis.Success
-                        )
-
-            except TimeoutError:
-                self.result_obj.status = OperationStatus.TIMEOUT
-                self.result_obj.error = f"Operation timed out after {self.timeout}s"
-                self.result_obj.end_time = time.time()
-
-                error_msg = f"Timeout after {self.timeout}s"
-                self.error.emit(self.request_id, error_msg)
-
-                if HAS_QGIS:
-                    QgsMessageLog.logMessage(
-                        f"Async operation timeout: {self.request_id}",
-                        "QGIS MCP Async",
-                        Qgis.Warning
-                    )
+        Args:
+            start: Number of partial results the caller already has
+            timeout: Maximum seconds to wait (None to wait forever)
 
-            except Exception as e:
-                self.result_obj.status = OperationStatus.FAILED
-                self.result_obj.error = str(e)
-                self.result_obj.end_time = time.time()
-
-                error_msg = f"{type(e).__name__}: {str(e)}"
-                self.error.emit(self.request_id, error_msg)
-
-                if HAS_QGIS:
-                    QgsMessageLog.logMessage(
-                        f"Async operation failed: {self.request_id}\n{traceback.format_exc()}",
-                        "QGIS MCP Async",
-                        Qgis.Critical
-                    )
-
-        def _execute_with_timeout(self) -> Any:
-            """Execute handler with timeout monitoring"""
-            start_time = time.time()
-
-            # Create progress callback
-            def report_progress(percent: int, message: str = ""):
-                if self.cancelled:
-                    raise InterruptedError("Operation cancelled")
-
-                self.result_obj.progress = percent
-                self.result_obj.progress_message = message
-                self.progress.emit(self.request_id, percent, message)
-
-                # Check timeout
-                if time.time() - start_time > self.timeout:
-                    raise TimeoutError(f"Operation exceeded {self.timeout}s timeout")
-
-            # Add progress callback to params
-            params_with_progress = self.params.copy()
-            params_with_progress['_progress_callback'] = report_progress
-
-            # Execute handler
-            result = self.handler(**params_with_progress)
-
-            return result
-
-        def cancel(self):
-            """Cancel the operation"""
-            self.cancelled = True
-            self.result_obj.status = OperationStatus.CANCELLED
-            self.result_obj.cancelled = True
-            self.result_obj.end_time = time.time()
-
-            if HAS_QGIS:
-                QgsMessageLog.logMessage(
-                    f"Async operation cancelled: {self.request_id}",
-                    "QGIS MCP Async",
-                    Qgis.Info
-                )
+        Returns:
+            True if woken by a change, False on timeout
+        """
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self.is_finished() or len(self.partial_results) > start,
+                timeout=timeout
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to dictionary for JSON serialization
+
+        Finished operations never change again, so their dict is built once
+        and shared; callers must treat it as read-only. The snapshot is taken
+        under the transition lock, so a dict is only cached when every field
+        in it was read after the operation finished.
+        """
+        final = self._final_dict
+        if final is not None:
+            return final
+
+        with self._transition_lock:
+            completed = self._completed
+            elapsed = (self._end_mono or time.monotonic()) - self._start_mono
+
+            data = {
+                "request_id": self.request_id,
+                "status": self._status_str,
+                "progress": self.progress,
+                "progress_message": self.progress_message,
+                "result": self.result,
+                "error": self.error,
+                "elapsed_seconds": round(elapsed, 2),
+                "completed": completed
+            }
+            if self.partial_results:
+                data["partial_count"] = len(self.partial_results)
+
+            if completed:
+                self._final_dict = data
+        return data
+
+
+class AsyncCommandExecutor:
+    """
+    Async command executor
+    Runs one command on the manager's shared worker pool with progress reporting
+    """
+
+    PROGRESS_EMIT_INTERVAL = 0.05  # Max ~20 progress callbacks per second
+
+    def __init__(
+        self,
+        request_id: str,
+        command_type: str,
+        handler: Callable,
+        params: Dict[str, Any],
+        timeout: Optional[float] = None
+    ):
+        """
+        Initialize async executor
 
-else:
-    # Fallback to threading.Thread if Qt not available
-    class AsyncCommandExecutor(threading.Thread):
-        """Fallback async executor using threading.Thread"""
-
-        def __init__(
-            self,
-            request_id: str,
-            command_type: str,
-            handler: Callable,
-            params: Dict[str, Any],
-            timeout: Optional[float] = None
+        Args:
+            request_id: Unique request identifier
+            command_type: Type of command to execute
+            handler: Function to execute
+            params: Parameters for handler
+            timeout: Timeout in seconds (None for no timeout)
+        """
+        self.request_id = request_id
+        self.command_type = command_type
+        self.handler = handler
+        self.params = params
+        self.timeout = timeout or 300.0  # 5 minutes default
+        self.cancel_event = threading.Event()
+        # Handlers that declare _cancel_event can block on it (event.wait(...))
+        # and return as soon as cancel() or the timeout watchdog fires
+        self._extra_kwargs = (
+            {'_cancel_event': self.cancel_event} if _accepts_cancel_event(handler) else {}
+        )
+        self.future: Optional[Future] = None
+        self.result_obj = AsyncOperationResult(request_id)
+        self._callbacks = {'finished': [], 'progress': [], 'error': []}
+        self._last_emit_ts = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested"""
+        return self.cancel_event.is_set()
+
+    def run(self):
+        """Execute command on a pool worker"""
+        if self.cancelled or not self._mark_running():
+            return  # Cancelled or expired while still queued
+
+        try:
+            # Execute with timeout monitoring
+            result = self._execute_with_timeout()
+            if not self.cancelled:
+                self._mark_completed(result)
+        except TimeoutError:
+            self._mark_timeout()
+        except Exception as e:
+            if not self.cancelled:  # Handler aborted by cancellation otherwise
+                self._mark_failed(e)
+
+    async def run_async(self):
+        """Execute a coroutine handler on the manager's event loop"""
+        if self.cancelled or not self._mark_running():
+            return
+
+        try:
+            result = await asyncio.wait_for(
+                self.handler(
+                    **self.params, **self._extra_kwargs,
+                    _progress_callback=self._report_progress
+                ),
+                timeout=self.timeout
+            )
+            if not self.cancelled:
+                self._mark_completed(result)
+        except asyncio.TimeoutError:
+            self._mark_timeout()
+        except asyncio.CancelledError:
+            raise  # cancel() already recorded the status
+        except Exception as e:
+            if not self.cancelled:
+                self._mark_failed(e)
+
+    def _report_progress(self, percent: int, message: str = "", partial: Any = None):
+        """
+        Record progress; connected callbacks are throttled to PROGRESS_EMIT_INTERVAL
+
+        A non-None partial is appended to the operation's streamed results
+        before waiters are woken.
+        """
+        if partial is not None:
+            self.result_obj.partial_results.append(partial)
+
+        # Status queries and waiters always see the latest value
+        self.result_obj.progress = percent
+        self.result_obj.progress_message = message
+        self.result_obj.notify_changed()
+
+        now = time.monotonic()
+        if percent >= 100 or now - self._last_emit_ts >= self.PROGRESS_EMIT_INTERVAL:
+            self._last_emit_ts = now
+            self._emit('progress', self.request_id, percent, message)
+
+    def _mark_running(self) -> bool:
+        if not self.result_obj.transition(OperationStatus.RUNNING):
+            return False
+
+        _log_operation(f"Starting async operation: {self.request_id} ({self.command_type})")
+        self._emit('progress', self.request_id, 0, "Starting...")
+        return True
+
+    def _mark_completed(self, result: Any):
+        if not self.result_obj.transition(
+            OperationStatus.COMPLETED, result=result, progress=100
         ):
-            super().__init__(daemon=True)
-            self.request_id = request_id
-            self.command_type = command_type
-            self.handler = handler
-            self.params = params
-            self.timeout = timeout or 300.0
-            self.cancelled = False
-            self.result_obj = AsyncOperationResult(request_id)
-            self._callbacks = {'finished': [], 'progress': [], 'error': []}
-
-        def run(self):
-            """Execute command in thread"""
-            self.result_obj.status = OperationStatus.RUNNING
-            self._emit('progress', self.request_id, 0, "Starting...")
+            return  # Cancelled or expired meanwhile
+        self.result_obj.notify_changed()
 
-            try:
-                result = self._execute_with_timeout()
+        self._emit('progress', self.request_id, 100, "Completed")
+        self._emit('finished', self.request_id, result)
 
-                if not self.cancelled:
-                    self.result_obj.status = OperationStatus.COMPLETED
-                    self.result_obj.result = result
-                    self.result_obj.progress = 100
-                    self.result_obj.end_time = time.time()
+        _log_operation(f"Async operation completed: {self.request_id}")
 
-                    self._emit('progress', self.request_id, 100, "Completed")
-                    self._emit('finished', self.request_id, result)
+    def _mark_timeout(self) -> bool:
+        if not self.result_obj.transition(
+            OperationStatus.TIMEOUT, error=f"Operation timed out after {self.timeout}s"
+        ):
+            return False  # Already expired by the manager's watchdog, or cancelled
+        self.result_obj.notify_changed()
+        self._emit('error', self.request_id, f"Timeout after {self.timeout}s")
+
+        _log_operation(f"Async operation timeout: {self.request_id}", logging.WARNING)
+        return True
+
+    def _mark_failed(self, e: Exception):
+        if not self.result_obj.transition(OperationStatus.FAILED, error=str(e)):
+            return
+        self.result_obj.notify_changed()
+        self._emit('error', self.request_id, f"{type(e).__name__}: {str(e)}")
+
+        _log_operation(
+            f"Async operation failed: {self.request_id}\n{traceback.format_exc()}",
+            logging.ERROR
+        )
 
-            except TimeoutError:
-                self.result_obj.status = OperationStatus.TIMEOUT
-                self.result_obj.error = f"Operation timed out after {self.timeout}s"
-                self.result_obj.end_time = time.time()
-                self._emit('error', self.request_id, f"Timeout after {self.timeout}s")
+    def _execute_with_timeout(self) -> Any:
+        """Execute handler with timeout monitoring"""
+        deadline = time.monotonic() + self.timeout
+        _mono = time.monotonic
 
-            except Exception as e:
-                self.result_obj.status = OperationStatus.FAILED
-                self.result_obj.error = str(e)
-                self.result_obj.end_time = time.time()
-                self._emit('error', self.request_id, f"{type(e).__name__}: {str(e)}")
+        # Create progress callback
+        def report_progress(percent: int, message: str = "", partial: Any = None):
+            if self.cancelled:
+                raise InterruptedError("Operation cancelled")
 
-        def _execute_with_timeout(self) -> Any:
-            """Execute handler with timeout monitoring"""
-            start_time = time.time()
+            self._report_progress(percent, message, partial)
 
-            def report_progress(percent: int, message: str = ""):
-                if self.cancelled:
-                    raise InterruptedError("Operation cancelled")
+            # Check timeout
+            if _mono() > deadline:
+                raise TimeoutError(f"Operation exceeded {self.timeout}s timeout")
 
-                self.result_obj.progress = percent
-                self.result_obj.progress_message = message
-                self._emit('progress', self.request_id, percent, message)
+        # Called with the GIL held on purpose: handlers are Python code driving
+        # QGIS/GDAL, whose native calls already release the GIL internally, so
+        # pooled workers overlap wherever the heavy lifting happens. The
+        # callback goes in as its own keyword so params is never copied.
+        return self.handler(
+            **self.params, **self._extra_kwargs, _progress_callback=report_progress
+        )
 
-                if time.time() - start_time > self.timeout:
-                    raise TimeoutError(f"Operation exceeded {self.timeout}s timeout")
+    def expire(self):
+        """
+        Time the operation out from outside the worker
 
-            params_with_progress = self.params.copy()
-            params_with_progress['_progress_callback'] = report_progress
+        A handler blocked in native code cannot be interrupted; it is
+        abandoned and its eventual result discarded.
+        """
+        if not self._mark_timeout():
+            return
 
-            return self.handler(**params_with_progress)
+        self.cancel_event.set()
+        if self.future:
+            self.future.cancel()
 
-        def cancel(self):
-            """Cancel the operation"""
-            self.cancelled = True
-            self.result_obj.status = OperationStatus.CANCELLED
-            self.result_obj.cancelled = True
-            self.result_obj.end_time = time.time()
+    def cancel(self) -> bool:
+        """
+        Cancel the operation
 
-        def connect_signal(self, signal_name: str, callback: Callable):
-            """Connect callback to signal"""
-            if signal_name in self._callbacks:
-                self._callbacks[signal_name].append(callback)
+        Returns:
+            True if cancelled, False if it had already finished
+        """
+        if not self.result_obj.transition(OperationStatus.CANCELLED, cancelled=True):
+            return False
+
+        self.cancel_event.set()
+        if self.future:
+            self.future.cancel()  # Never starts if still queued
+        self.result_obj.notify_changed()
+
+        _log_operation(f"Async operation cancelled: {self.request_id}")
+        return True
 
-        def _emit(self, signal_name: str, *args):
-            """Emit signal to connected callbacks"""
-            for callback in self._callbacks.get(signal_name, []):
-                try:
-                    callback(*args)
-                except Exception as e:
-                    print(f"Error in callback: {e}")
+    def connect_signal(self, signal_name: str, callback: Callable):
+        """Connect callback to signal"""
+        if signal_name in self._callbacks:
+            self._callbacks[signal_name].append(callback)
+
+    def _emit(self, signal_name: str, *args):
+        """Emit signal to connected callbacks"""
+        for callback in self._callbacks.get(signal_name, []):
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in callback: {e}")
 
 
 class AsyncOperationManager:
@@ -312,10 +474,44 @@ class AsyncOperationManager:
             max_concurrent: Maximum concurrent operations
             cleanup_after: Seconds after which to cleanup completed operations
         """
-        self.max_concurrent = max_concurrent
         self.cleanup_after = cleanup_after
+        # Copy-on-write: writers swap in a new dict under _lock, readers
+        # (status queries, by far the most frequent calls) take no lock
         self.operations: Dict[str, AsyncCommandExecutor] = {}
         self._lock = threading.Lock()
+        self._any_changed = threading.Condition()
+        # Operation counts per status, kept current on every transition so
+        # the concurrency check and get_stats need no scan over history
+        self._by_status: Dict[OperationStatus, int] = {status: 0 for status in OperationStatus}
+        # (finish time, request_id) of finished operations, oldest first
+        self._completion_heap: List[tuple] = []
+        self._count_lock = threading.Lock()
+        # Timeout enforcement: one watchdog thread sleeping until the
+        # earliest (deadline, seq, executor ref) entry. Weak references, so a
+        # long timeout does not pin a finished, cleaned-up operation
+        self._deadlines: List[tuple] = []
+        self._deadline_seq = itertools.count()
+        self._deadline_cond = threading.Condition()
+        self._watchdog: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.max_concurrent = max_concurrent
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+
+    @property
+    def max_concurrent(self) -> int:
+        """Maximum concurrent operations (also the worker pool size)"""
+        return self._max_concurrent
+
+    @max_concurrent.setter
+    def max_concurrent(self, value: int) -> None:
+        # Workers are reused across operations; resizing swaps in a new pool
+        # and lets the old one finish whatever it is running
+        old_pool = self._pool
+        self._max_concurrent = value
+        self._pool = ThreadPoolExecutor(max_workers=value, thread_name_prefix="qgis-mcp-async")
+        if old_pool:
+            old_pool.shutdown(wait=False)
 
     def start_operation(
         self,
@@ -339,18 +535,18 @@ class AsyncOperationManager:
             AsyncOperationResult with initial status
 
         Raises:
-            RuntimeError: If too many concurrent operations
+            RuntimeError: If too many concurrent operations, or after shutdown()
         """
         with self._lock:
+            if self._closed:
+                raise RuntimeError("Async operation manager is shut down")
+
             # Check if operation already exists
             if request_id in self.operations:
                 raise ValueError(f"Operation {request_id} already exists")
 
-            # Check concurrent limit
-            active_count = sum(
-                1 for op in self.operations.values()
-                if op.result_obj.status == OperationStatus.RUNNING
-            )
+            # Check concurrent limit (queued operations count too)
+            active_count = self._active_count()
 
             if active_count >= self.max_concurrent:
                 raise RuntimeError(
@@ -368,20 +564,87 @@ class AsyncOperationManager:
             )
 
             # Store executor
-            self.operations[request_id] = executor
-
-            # Start execution
-            executor.start()
-
-            if HAS_QGIS:
-                QgsMessageLog.logMessage(
-                    f"Started async operation: {request_id} ({command_type})",
-                    "QGIS MCP Async",
-                    Qgis.Info
+            executor.result_obj.on_change = self._notify_any_changed
+            executor.result_obj.on_status_change = self._on_status_change
+            with self._count_lock:
+                self._by_status[OperationStatus.PENDING] += 1
+            self.operations = {**self.operations, request_id: executor}
+
+            # Coroutine handlers share one event loop; blocking ones get a
+            # pooled worker thread
+            if inspect.iscoroutinefunction(handler):
+                executor.future = asyncio.run_coroutine_threadsafe(
+                    executor.run_async(), self._get_loop()
                 )
+            else:
+                executor.future = self._pool.submit(executor.run)
+
+            self._watch_deadline(executor)
 
             return executor.result_obj
 
+    def _on_status_change(self, request_id: str, old: OperationStatus,
+                          new: OperationStatus) -> None:
+        """Keep per-status counts and the completion heap in step with transitions"""
+        with self._count_lock:
+            self._by_status[old] -= 1
+            self._by_status[new] += 1
+            if new in FINISHED_STATUSES and old not in FINISHED_STATUSES:
+                heapq.heappush(self._completion_heap, (time.monotonic(), request_id))
+
+    def _active_count(self) -> int:
+        """Number of queued or running operations"""
+        return self._by_status[OperationStatus.PENDING] + self._by_status[OperationStatus.RUNNING]
+
+    def _watch_deadline(self, executor: AsyncCommandExecutor) -> None:
+        """Register an operation's timeout with the watchdog"""
+        deadline = time.monotonic() + executor.timeout
+        with self._deadline_cond:
+            heapq.heappush(
+                self._deadlines, (deadline, next(self._deadline_seq), weakref.ref(executor))
+            )
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(
+                    target=self._watchdog_loop,
+                    name="qgis-mcp-watchdog",
+                    daemon=True
+                )
+                self._watchdog.start()
+            self._deadline_cond.notify()
+
+    def _watchdog_loop(self) -> None:
+        """Expire operations whose handlers overrun their timeout"""
+        while True:
+            with self._deadline_cond:
+                while True:
+                    if self._closed:
+                        return
+                    if not self._deadlines:
+                        self._deadline_cond.wait()
+                        continue
+
+                    delay = self._deadlines[0][0] - time.monotonic()
+                    if delay <= 0:
+                        _, _, executor_ref = heapq.heappop(self._deadlines)
+                        break
+                    self._deadline_cond.wait(delay)
+
+            # Enforced even if the handler never calls its progress callback
+            executor = executor_ref()
+            if executor is not None:
+                executor.expire()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the event loop for coroutine handlers, starting it on first use"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=self._loop.run_forever,
+                name="qgis-mcp-asyncio",
+                daemon=True
+            ).start()
+        return self._loop
+
     def get_status(self, request_id: str) -> Optional[Dict[str, Any]]:
         """
         Get operation status
@@ -392,12 +655,115 @@ class AsyncOperationManager:
         Returns:
             Status dictionary or None if not found
         """
-        with self._lock:
-            executor = self.operations.get(request_id)
-            if not executor:
-                return None
+        executor = self.operations.get(request_id)
+        if not executor:
+            return None
+
+        return executor.result_obj.to_dict()
+
+    def wait_for_change(
+        self,
+        request_id: str,
+        last_progress: int = -1,
+        timeout: Optional[float] = None,
+        min_delta: int = 5
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Wait for an operation to finish or report new progress
+
+        Replaces client-side status polling: the caller is parked until the
+        executor signals a change instead of re-querying on a fixed interval.
+
+        Args:
+            request_id: Request identifier
+            last_progress: Progress value the caller has already seen
+            timeout: Maximum seconds to wait
+            min_delta: Minimum progress change that wakes the caller
+
+        Returns:
+            Status dictionary or None if not found
+        """
+        executor = self.operations.get(request_id)
+        if not executor:
+            return None
+
+        executor.result_obj.wait_for_change(last_progress, min_delta, timeout)
+        return executor.result_obj.to_dict()
+
+    def get_partial_results(
+        self,
+        request_id: str,
+        start: int = 0,
+        wait: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the partial results an operation streamed after the first start
+
+        Args:
+            request_id: Request identifier
+            start: Number of partial results the caller already has
+            wait: If set, block up to this many seconds for a new result
+
+        Returns:
+            Dictionary with the new 'results', the 'next' start index and
+            whether the operation 'completed', or None if not found
+        """
+        executor = self.operations.get(request_id)
+        if not executor:
+            return None
 
-            return executor.result_obj.to_dict()
+        result_obj = executor.result_obj
+        if wait:
+            result_obj.wait_for_partials(start, wait)
+
+        # Read completion first: once finished, no results can follow the slice
+        completed = result_obj.is_finished()
+        results = result_obj.partial_results[start:]
+
+        return {
+            "request_id": request_id,
+            "results": results,
+            "next": start + len(results),
+            "completed": completed,
+            "status": result_obj.to_dict()["status"]
+        }
+
+    def get_status_batch(
+        self,
+        request_ids: List[str],
+        wait: Optional[float] = None
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get the status of several operations in one call
+
+        Args:
+            request_ids: Request identifiers
+            wait: If set, block up to this many seconds until at least one
+                of the operations has finished
+
+        Returns:
+            Mapping of request ID to status dictionary (None if not found)
+        """
+        operations = self.operations
+        results = {rid: operations.get(rid) for rid in request_ids}
+
+        if wait:
+            tracked = [ex.result_obj for ex in results.values() if ex]
+            with self._any_changed:
+                self._any_changed.wait_for(
+                    lambda: not tracked or any(r.is_finished() for r in tracked),
+                    timeout=wait
+                )
+
+        return {
+            rid: ex.result_obj.to_dict() if ex else None
+            for rid, ex in results.items()
+        }
+
+    def _notify_any_changed(self) -> None:
+        """Wake up waiters blocked in get_status_batch()"""
+        with self._any_changed:
+            self._any_changed.notify_all()
 
     def cancel_operation(self, request_id: str) -> bool:
         """
@@ -414,19 +780,7 @@ class AsyncOperationManager:
             if not executor:
                 return False
 
-            if executor.result_obj.status not in (OperationStatus.PENDING, OperationStatus.RUNNING):
-                return False
-
-            executor.cancel()
-
-            if HAS_QGIS:
-                QgsMessageLog.logMessage(
-                    f"Cancelled async operation: {request_id}",
-                    "QGIS MCP Async",
-                    Qgis.Info
-                )
-
-            return True
+            return executor.cancel()
 
     def cleanup_completed(self) -> int:
         """
@@ -436,19 +790,25 @@ class AsyncOperationManager:
             Number of operations cleaned up
         """
         with self._lock:
-            now = time.time()
+            now = time.monotonic()
             to_remove = []
 
-            for request_id, executor in self.operations.items():
-                result = executor.result_obj
-
-                # Check if completed and old enough
-                if result.end_time and (now - result.end_time > self.cleanup_after):
-                    to_remove.append(request_id)
+            # Only the expired prefix of the heap is touched, not every operation
+            with self._count_lock:
+                heap = self._completion_heap
+                while heap and now - heap[0][0] > self.cleanup_after:
+                    _, request_id = heapq.heappop(heap)
+                    executor = self.operations.get(request_id)
+                    if executor and executor.result_obj.is_finished():
+                        self._by_status[executor.result_obj.status] -= 1
+                        to_remove.append(request_id)
 
             # Remove old operations
-            for request_id in to_remove:
-                del self.operations[request_id]
+            if to_remove:
+                removed = set(to_remove)
+                self.operations = {
+                    rid: ex for rid, ex in self.operations.items() if rid not in removed
+                }
 
             if to_remove and HAS_QGIS:
                 QgsMessageLog.logMessage(
@@ -466,11 +826,10 @@ class AsyncOperationManager:
         Returns:
             List of operation status dictionaries
         """
-        with self._lock:
-            return [
-                executor.result_obj.to_dict()
-                for executor in self.operations.values()
-            ]
+        return [
+            executor.result_obj.to_dict()
+            for executor in self.operations.values()
+        ]
 
     def cancel_all(self) -> int:
         """
@@ -482,8 +841,7 @@ class AsyncOperationManager:
         with self._lock:
             cancelled = 0
             for executor in self.operations.values():
-                if executor.result_obj.status in (OperationStatus.PENDING, OperationStatus.RUNNING):
-                    executor.cancel()
+                if executor.cancel():
                     cancelled += 1
 
             if cancelled and HAS_QGIS:
@@ -495,6 +853,27 @@ class AsyncOperationManager:
 
             return cancelled
 
+    def shutdown(self) -> None:
+        """
+        Cancel all operations and stop the worker pool, event loop and watchdog
+
+        The manager accepts no new operations afterwards.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self.cancel_all()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+        with self._deadline_cond:
+            self._deadlines.clear()
+            self._deadline_cond.notify()
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get statistics about async operations
@@ -502,18 +881,16 @@ class AsyncOperationManager:
         Returns:
             Dictionary with operation statistics
         """
-        with self._lock:
-            stats = {
-                "total_operations": len(self.operations),
-                "by_status": {},
-                "max_concurrent": self.max_concurrent
+        with self._count_lock:
+            by_status = {
+                status.value: count for status, count in self._by_status.items() if count
             }
 
-            for executor in self.operations.values():
-                status = executor.result_obj.status.value
-                stats["by_status"][status] = stats["by_status"].get(status, 0) + 1
-
-            return stats
+        return {
+            "total_operations": sum(by_status.values()),
+            "by_status": by_status,
+            "max_concurrent": self.max_concurrent
+        }
 
 
 # Global async operation manager instance
@@ -531,3 +908,12 @@ def get_async_manager() -> AsyncOperationManager:
         )
 
     return _global_async_manager
+
+
+def shutdown_async_manager() -> None:
+    """Shut down the global manager; the next get_async_manager() creates a fresh one"""
+    global _global_async_manager
+
+    manager, _global_async_manager = _global_async_manager, None
+    if manager is not None:
+        manager.shutdown()
@@ -3,42 +3,52 @@ Optimization module for QGIS MCP
 Provides caching, spatial indexing, and efficient data access
 """
 
-import base64
-from typing import Dict, Any, Optional, List, Set
-from collections import OrderedDict
+import binascii
+import threading
+from collections import defaultdict
+from functools import partial
+from itertools import islice
+from typing import Dict, Any, Callable, Hashable, Optional, List, Set, Tuple
 from qgis.core import (
     QgsProject, QgsMapLayer, QgsFeatureRequest, QgsExpression,
-    QgsRectangle, QgsWkbTypes, QgsMessageLog, Qgis
+    QgsRectangle, QgsSimplifyMethod, QgsWkbTypes, QgsMessageLog, Qgis
 )
 
 
+_MISS = object()
+
+
 class LRUCache:
-    """Least Recently Used cache implementation"""
+    """
+    Least Recently Used cache implementation
+
+    Relies on plain dict insertion order: re-inserting a key makes it the
+    most recent, and the first key is always the least recently used.
+    """
 
     def __init__(self, max_size: int = 1000):
-        self.cache = OrderedDict()
+        self.cache: Dict[Hashable, Any] = {}
         self.max_size = max_size
 
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: Hashable) -> Optional[Any]:
         """Get value from cache, moving it to end (most recently used)"""
-        if key not in self.cache:
+        cache = self.cache
+        value = cache.pop(key, _MISS)
+        if value is _MISS:
             return None
 
-        # Move to end
-        self.cache.move_to_end(key)
-        return self.cache[key]
+        # Re-insert at the end
+        cache[key] = value
+        return value
 
-    def put(self, key: str, value: Any) -> None:
+    def put(self, key: Hashable, value: Any) -> None:
         """Put value in cache, evicting oldest if at capacity"""
-        if key in self.cache:
-            # Update existing key
-            self.cache.move_to_end(key)
-        else:
-            # Add new key, evict oldest if needed
-            if len(self.cache) >= self.max_size:
-                self.cache.popitem(last=False)
+        cache = self.cache
+        if cache.pop(key, _MISS) is _MISS and len(cache) >= self.max_size:
+            # New key, evict oldest
+            del cache[next(iter(cache))]
 
-        self.cache[key] = value
+        cache[key] = value
 
     def clear(self) -> None:
         """Clear the cache"""
@@ -49,56 +59,218 @@ class LRUCache:
         return len(self.cache)
 
 
+def _geometry_size(geom_data: Dict[str, Any]) -> int:
+    """Approximate memory held by a cached geometry: its encoded WKB"""
+    data = geom_data.get("data")
+    return len(data) if data is not None else 0
+
+
 class GeometryCache:
-    """Cache for simplified geometries"""
+    """
+    Cache for simplified geometries
 
-    def __init__(self, max_size: int = 1000):
+    Bounded both by entry count and by total encoded WKB size, so a few
+    thousand large polygons cannot grow it without limit. Feature requests
+    run on the server's worker threads, so every access to the entries and
+    their bookkeeping holds ``_lock``.
+    """
+
+    def __init__(self, max_size: int = 1000, max_bytes: int = 64 * 1024 * 1024):
         self.cache = LRUCache(max_size)
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        # layer_id -> keys of its cached geometries, for O(k) invalidation
+        self._layer_index: Dict[str, Set[Tuple[str, int, float]]] = defaultdict(set)
         self.hits = 0
         self.misses = 0
+        self._lock = threading.Lock()
 
-    def get_geometry(self, layer_id: str, feature_id: int) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _key(
+        layer_id: str, feature_id: int, simplify_tolerance: Optional[float]
+    ) -> Tuple[str, int, float]:
+        # A tuple hashes faster than a formatted string and needs no formatting;
+        # simplified and full geometries of one feature are different entries
+        return (layer_id, feature_id, simplify_tolerance or 0)
+
+    def get_geometry(
+        self,
+        layer_id: str,
+        feature_id: int,
+        simplify_tolerance: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
         """Get cached geometry data"""
-        key = f"{layer_id}_{feature_id}"
-        geom_data = self.cache.get(key)
+        key = self._key(layer_id, feature_id, simplify_tolerance)
+        with self._lock:
+            geom_data = self.cache.get(key)
 
-        if geom_data:
-            self.hits += 1
-        else:
-            self.misses += 1
+            if geom_data:
+                self.hits += 1
+            else:
+                self.misses += 1
 
         return geom_data
 
-    def put_geometry(self, layer_id: str, feature_id: int, geom_data: Dict[str, Any]):
-        """Cache geometry data"""
-        key = f"{layer_id}_{feature_id}"
-        self.cache.put(key, geom_data)
+    def put_geometry(
+        self,
+        layer_id: str,
+        feature_id: int,
+        geom_data: Dict[str, Any],
+        simplify_tolerance: Optional[float] = None
+    ):
+        """Cache geometry data, evicting least recently used entries as needed"""
+        size = _geometry_size(geom_data)
+        if size > self.max_bytes:
+            return
+
+        key = self._key(layer_id, feature_id, simplify_tolerance)
+        entries = self.cache.cache
+
+        with self._lock:
+            old = entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= _geometry_size(old)
+
+            # Evict here rather than in LRUCache.put() so the byte count and
+            # layer index stay exact
+            while entries and (
+                len(entries) >= self.cache.max_size
+                or self.total_bytes + size > self.max_bytes
+            ):
+                self._evict(next(iter(entries)))
+
+            entries[key] = geom_data
+            self.total_bytes += size
+            self._layer_index[layer_id].add(key)
+
+    def _evict(self, key: Tuple[str, int, float]) -> None:
+        """Remove one entry and its bookkeeping; caller holds ``_lock``"""
+        self.total_bytes -= _geometry_size(self.cache.cache.pop(key))
+
+        layer_keys = self._layer_index[key[0]]
+        layer_keys.discard(key)
+        if not layer_keys:
+            del self._layer_index[key[0]]
+
+    def invalidate_layer(self, layer_id: str) -> int:
+        """
+        Remove all cached geometries of a layer
+
+        Returns:
+            Number of entries removed
+        """
+        entries = self.cache.cache
+        with self._lock:
+            keys = self._layer_index.pop(layer_id, ())
+            for key in keys:
+                self.total_bytes -= _geometry_size(entries.pop(key))
+        return len(keys)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        total = self.hits + self.misses
-        hit_rate = (self.hits / total * 100) if total > 0 else 0
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            size, total_bytes = self.cache.size(), self.total_bytes
+
+        total = hits + misses
+        hit_rate = (hits / total * 100) if total > 0 else 0
 
         return {
-            "size": self.cache.size(),
+            "size": size,
             "max_size": self.cache.max_size,
-            "hits": self.hits,
-            "misses": self.misses,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
             "hit_rate": round(hit_rate, 2)
         }
 
     def clear(self):
         """Clear cache and statistics"""
-        self.cache.clear()
-        self.hits = 0
-        self.misses = 0
+        with self._lock:
+            self.cache.clear()
+            self.total_bytes = 0
+            self._layer_index.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_PLAIN_VALUES = (str, int, float, bool)
+
+
+def serialize_attribute_value(value: Any) -> Any:
+    """
+    Make an attribute or aggregate value serializable
+
+    NULL (None or a null QVariant) becomes None, plain Python values pass
+    through, and anything else (QDate, QDateTime, QTime) becomes a string.
+    """
+    if value is None or isinstance(value, _PLAIN_VALUES):
+        return value
+    is_null = getattr(value, "isNull", None)
+    if callable(is_null) and is_null():
+        return None
+    return str(value)
+
+
+def _build_feature_rows(
+    features,
+    field_names: List[str],
+    date_fields: List[Tuple[int, str]],
+    geometry_of: Optional[Any] = None
+) -> List[Dict[str, Any]]:
+    """
+    Marshal features into {"id", "attributes", "geometry"} dicts
+
+    Args:
+        features: Feature iterator
+        field_names: Field names in attribute order
+        date_fields: (index, name) of fields whose values are sent as strings
+        geometry_of: Callable returning a feature's geometry data, or None to
+            skip geometries
+
+    Returns:
+        List of feature dicts
+    """
+    rows = []
+    append = rows.append
+
+    for feature in features:
+        # All attribute values in one call instead of one per field
+        values = feature.attributes()
+        attrs = dict(zip(field_names, values))
+
+        # Handle special types
+        for idx, field_name in date_fields:
+            attrs[field_name] = serialize_attribute_value(values[idx])
+
+        append({
+            "id": feature.id(),
+            "attributes": attrs,
+            "geometry": geometry_of(feature) if geometry_of else None
+        })
+
+    return rows
 
 
 class OptimizedFeatureAccess:
     """Optimized feature access with spatial indexing and caching"""
 
-    def __init__(self):
+    # Smaller geometries (points, short lines) are cheaper to re-encode than
+    # to look up, so they are not cached
+    MIN_CACHED_WKB_BYTES = 128
+
+    def __init__(self, binary_wkb: bool = False):
+        """
+        Args:
+            binary_wkb: Return WKB as raw bytes instead of base64 text; only
+                for binary-safe transports (MessagePack)
+        """
         self.geometry_cache = GeometryCache(max_size=1000)
+        self.binary_wkb = binary_wkb
+        # layer_id -> (field names, field type names), dropped when fields change
+        self._field_cache: Dict[str, Tuple[List[str], List[str]]] = {}
+        self._field_watched: Set[str] = set()
 
     def get_features_optimized(
         self,
@@ -108,6 +280,10 @@ class OptimizedFeatureAccess:
         filter_expression: Optional[str] = None,
         attributes_only: bool = False,
         simplify_tolerance: Optional[float] = None,
+        geometry: str = 'wkb',
+        columnar: bool = False,
+        on_batch: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        batch_size: int = 1000,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -120,10 +296,22 @@ class OptimizedFeatureAccess:
             filter_expression: Attribute filter expression
             attributes_only: Skip geometry if True
             simplify_tolerance: Simplify geometries if > 0
+            geometry: Geometry detail: 'wkb' (full), 'bbox' (extent only) or 'none'
+            columnar: Return parallel 'ids', 'columns' (one list per field) and
+                'geometries' lists instead of one dict per feature
+            on_batch: Called with each batch of up to batch_size feature dicts
+                as soon as it is built; the result then carries no 'features'
+            batch_size: Features per on_batch call
 
         Returns:
             Dictionary with features and metadata
         """
+        if geometry == 'none':
+            attributes_only = True
+
+        if on_batch is not None and (columnar or batch_size < 1):
+            raise ValueError("Batched delivery requires row layout and batch_size >= 1")
+
         project = QgsProject.instance()
 
         if layer_id not in project.mapLayers():
@@ -158,57 +346,134 @@ class OptimizedFeatureAccess:
         # Only fetch needed attributes
         if attributes_only:
             request.setFlags(QgsFeatureRequest.NoGeometry)
+        elif simplify_tolerance and simplify_tolerance > 0:
+            # Simplify in the provider (e.g. ST_Simplify in PostGIS) where supported
+            simplify_method = QgsSimplifyMethod()
+            simplify_method.setMethodType(QgsSimplifyMethod.OptimizeForRendering)
+            simplify_method.setTolerance(simplify_tolerance)
+            request.setSimplifyMethod(simplify_method)
 
         # Use spatial index if available
         if layer.hasSpatialIndex():
             request.setFlags(request.flags() | QgsFeatureRequest.UseSpatialIndex)
 
-        # Get field names once
-        field_names = [field.name() for field in layer.fields()]
-        field_types = [field.typeName() for field in layer.fields()]
-
-        # Fetch features
-        features_data = []
-
-        for feature in layer.getFeatures(request):
-            # Efficient attribute extraction by index
-            attrs = {}
-            for idx, field_name in enumerate(field_names):
-                value = feature.attribute(idx)
-
-                # Handle special types
-                if value is None:
-                    attrs[field_name] = None
-                elif field_types[idx] in ('QDate', 'QDateTime', 'QTime'):
-                    attrs[field_name] = str(value)
-                else:
-                    attrs[field_name] = value
-
-            # Optimized geometry handling
-            geom_data = None
-            if not attributes_only and feature.hasGeometry():
-                geom_data = self._get_geometry_data(
-                    layer_id,
-                    feature,
-                    simplify_tolerance
-                )
+        # Get field names once per layer schema
+        field_names, field_types = self._get_fields(layer_id, layer)
 
-            features_data.append({
-                "id": feature.id(),
-                "attributes": attrs,
-                "geometry": geom_data
-            })
+        # Only temporal fields need converting; find them once, not per value
+        date_fields = [
+            (idx, name) for idx, (name, type_name) in enumerate(zip(field_names, field_types))
+            if type_name in ('QDate', 'QDateTime', 'QTime')
+        ]
 
-        return {
+        result = {
             "layer_id": layer_id,
             "total_features": layer.featureCount(),
-            "returned_features": len(features_data),
-            "features": features_data,
             "fields": list(zip(field_names, field_types)),
-            "has_spatial_index": layer.hasSpatialIndex(),
-            "cache_stats": self.geometry_cache.get_stats()
+            "has_spatial_index": layer.hasSpatialIndex()
         }
 
+        # Resolved once so the per-feature loops make no mode decisions
+        geometry_of = None if attributes_only else partial(
+            self._feature_geometry, layer_id,
+            geometry=geometry, simplify_tolerance=simplify_tolerance
+        )
+
+        if columnar:
+            # Columnar layout: no per-feature dicts to allocate or encode
+            ids = []
+            rows = []
+            geometries = []
+            add_id, add_row, add_geometry = ids.append, rows.append, geometries.append
+
+            for feature in layer.getFeatures(request):
+                add_id(feature.id())
+                add_row(feature.attributes())
+                add_geometry(geometry_of(feature) if geometry_of else None)
+
+            # Transpose rows into one list per field
+            columns = {name: [] for name in field_names}
+            if rows:
+                columns.update(zip(field_names, map(list, zip(*rows))))
+
+            # Handle special types
+            for _, field_name in date_fields:
+                columns[field_name] = list(
+                    map(serialize_attribute_value, columns[field_name])
+                )
+
+            result["returned_features"] = len(ids)
+            result["ids"] = ids
+            result["columns"] = columns
+            result["geometries"] = geometries
+        elif on_batch is not None:
+            features = layer.getFeatures(request)
+            returned = 0
+            while True:
+                batch = _build_feature_rows(
+                    islice(features, batch_size), field_names, date_fields, geometry_of
+                )
+                if not batch:
+                    break
+                returned += len(batch)
+                on_batch(batch)
+
+            result["returned_features"] = returned
+        else:
+            features_data = _build_feature_rows(
+                layer.getFeatures(request), field_names, date_fields, geometry_of
+            )
+
+            result["returned_features"] = len(features_data)
+            result["features"] = features_data
+
+        result["cache_stats"] = self.geometry_cache.get_stats()
+        return result
+
+    def _feature_geometry(
+        self,
+        layer_id: str,
+        feature,
+        geometry: str,
+        simplify_tolerance: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a feature's geometry at the requested detail, None if it has none"""
+        if not feature.hasGeometry():
+            return None
+
+        if geometry == 'bbox':
+            geom = feature.geometry()
+            rect = geom.boundingBox()
+            return {
+                "type": QgsWkbTypes.displayString(geom.wkbType()),
+                "format": "bbox",
+                "bbox": [rect.xMinimum(), rect.yMinimum(), rect.xMaximum(), rect.yMaximum()]
+            }
+
+        return self._get_geometry_data(layer_id, feature, simplify_tolerance)
+
+    def _get_fields(self, layer_id: str, layer) -> Tuple[List[str], List[str]]:
+        """Get field names and type names, cached until the layer's fields change"""
+        fields = self._field_cache.get(layer_id)
+        if fields is None:
+            fields = (
+                [field.name() for field in layer.fields()],
+                [field.typeName() for field in layer.fields()]
+            )
+            self._field_cache[layer_id] = fields
+
+            if layer_id not in self._field_watched:
+                self._field_watched.add(layer_id)
+                layer.updatedFields.connect(partial(self._field_cache.pop, layer_id, None))
+                layer.willBeDeleted.connect(partial(self._forget_layer_fields, layer_id))
+
+        return fields
+
+    def _forget_layer_fields(self, layer_id: str) -> None:
+        """Drop a deleted layer's fields; a reloaded layer may reuse its ID"""
+        self._field_cache.pop(layer_id, None)
+        self._field_watched.discard(layer_id)
+
     def _get_geometry_data(
         self,
         layer_id: str,
@@ -217,34 +482,72 @@ class OptimizedFeatureAccess:
     ) -> Dict[str, Any]:
         """Get geometry data with caching"""
         # Check cache first
-        cached_geom = self.geometry_cache.get_geometry(layer_id, feature.id())
+        cached_geom = self.geometry_cache.get_geometry(
+            layer_id, feature.id(), simplify_tolerance
+        )
         if cached_geom:
             return cached_geom
 
+        # Already simplified by the request when a tolerance was given
         geometry = feature.geometry()
 
-        # Simplify if requested
-        if simplify_tolerance and simplify_tolerance > 0:
-            geometry = geometry.simplify(simplify_tolerance)
-
         # Use efficient WKB format instead of WKT
         wkb_bytes = geometry.asWkb()
 
+        if self.binary_wkb:
+            # Shipped as-is; base64 would add a third to the payload
+            wkb_format, wkb_data = "wkb", bytes(wkb_bytes)
+        else:
+            wkb_format = "wkb_base64"
+            wkb_data = binascii.b2a_base64(wkb_bytes, newline=False).decode('ascii')
+
+        # Plain floats, as in the 'bbox' geometry mode; no WKT string to build
+        rect = geometry.boundingBox()
         geom_data = {
             "type": QgsWkbTypes.displayString(geometry.wkbType()),
-            "format": "wkb_base64",
-            "data": base64.b64encode(wkb_bytes).decode('ascii'),
-            "bbox": geometry.boundingBox().asWktCoordinates()
+            "format": wkb_format,
+            "data": wkb_data,
+            "bbox": [rect.xMinimum(), rect.yMinimum(), rect.xMaximum(), rect.yMaximum()]
         }
 
         # Cache the result
-        self.geometry_cache.put_geometry(layer_id, feature.id(), geom_data)
+        if len(wkb_bytes) >= self.MIN_CACHED_WKB_BYTES:
+            self.geometry_cache.put_geometry(
+                layer_id, feature.id(), geom_data, simplify_tolerance
+            )
 
         return geom_data
 
+    def prefetch(self, layer_id: str, limit: int = 500) -> int:
+        """
+        Warm the geometry cache with the first features of a layer
+
+        Args:
+            layer_id: Layer ID
+            limit: Maximum number of features to read
+
+        Returns:
+            Number of geometries read
+        """
+        layer = QgsProject.instance().mapLayer(layer_id)
+        if layer is None or layer.type() != QgsMapLayer.VectorLayer:
+            return 0
+
+        request = QgsFeatureRequest()
+        request.setLimit(limit)
+        request.setNoAttributes()
+
+        warmed = 0
+        for feature in layer.getFeatures(request):
+            if feature.hasGeometry():
+                self._get_geometry_data(layer_id, feature)
+                warmed += 1
+        return warmed
+
     def clear_cache(self):
-        """Clear geometry cache"""
+        """Clear geometry and field caches"""
         self.geometry_cache.clear()
+        self._field_cache.clear()
         QgsMessageLog.logMessage(
             "Geometry cache cleared",
             "QGIS MCP Performance",
@@ -331,50 +634,69 @@ class PaginatedLayerAccess:
             return str(layer.type())
 
 
+class _CommandStats:
+    """Running timing statistics for one command type"""
+
+    __slots__ = ("count", "total_time", "min_time", "max_time", "slow_streak")
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.min_time = float('inf')
+        self.max_time = 0.0
+        self.slow_streak = 0  # Consecutive slow calls, for log throttling
+
+
 class PerformanceMonitor:
     """Monitor and log performance metrics"""
 
+    SLOW_COMMAND_SECONDS = 1.0
+    # While a command stays slow, log only its first and every Nth slow call
+    SLOW_LOG_EVERY = 50
+
     def __init__(self):
-        self.command_stats = {}
+        self.command_stats: Dict[str, _CommandStats] = {}
 
     def record_command(self, command_type: str, elapsed_time: float):
         """Record command execution time"""
-        if command_type not in self.command_stats:
-            self.command_stats[command_type] = {
-                "count": 0,
-                "total_time": 0,
-                "min_time": float('inf'),
-                "max_time": 0
-            }
+        stats = self.command_stats.get(command_type)
+        if stats is None:
+            stats = self.command_stats.setdefault(command_type, _CommandStats())
 
-        stats = self.command_stats[command_type]
-        stats["count"] += 1
-        stats["total_time"] += elapsed_time
-        stats["min_time"] = min(stats["min_time"], elapsed_time)
-        stats["max_time"] = max(stats["max_time"], elapsed_time)
+        stats.count += 1
+        stats.total_time += elapsed_time
+        if elapsed_time < stats.min_time:
+            stats.min_time = elapsed_time
+        if elapsed_time > stats.max_time:
+            stats.max_time = elapsed_time
 
         # Log slow commands
-        if elapsed_time > 1.0:
-            QgsMessageLog.logMessage(
-                f"SLOW COMMAND: {command_type} took {elapsed_time:.2f}s",
-                "QGIS MCP Performance",
-                Qgis.Warning
-            )
+        if elapsed_time > self.SLOW_COMMAND_SECONDS:
+            stats.slow_streak += 1
+            if stats.slow_streak == 1 or stats.slow_streak % self.SLOW_LOG_EVERY == 0:
+                QgsMessageLog.logMessage(
+                    f"SLOW COMMAND: {command_type} took {elapsed_time:.2f}s "
+                    f"({stats.slow_streak} slow in a row)",
+                    "QGIS MCP Performance",
+                    Qgis.Warning
+                )
+        else:
+            stats.slow_streak = 0
 
     def get_performance_report(self) -> Dict[str, Any]:
         """Get performance statistics"""
         commands = []
 
         for cmd_type, stats in self.command_stats.items():
-            avg_time = stats["total_time"] / stats["count"] if stats["count"] > 0 else 0
+            avg_time = stats.total_time / stats.count if stats.count > 0 else 0
 
             commands.append({
                 "command": cmd_type,
-                "calls": stats["count"],
-                "total_time": round(stats["total_time"], 3),
+                "calls": stats.count,
+                "total_time": round(stats.total_time, 3),
                 "avg_time": round(avg_time, 3),
-                "min_time": round(stats["min_time"], 3),
-                "max_time": round(stats["max_time"], 3)
+                "min_time": round(stats.min_time, 3),
+                "max_time": round(stats.max_time, 3)
             })
 
         # Sort by total time
@@ -5,7 +5,15 @@ and comprehensive message validation using JSON Schema.
 
 import struct
 import json
-from typing import Dict, Any, Optional
+import threading
+import weakref
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import ormsgpack
+    HAS_ORMSGPACK = True
+except ImportError:
+    HAS_ORMSGPACK = False
 
 try:
     import msgpack
@@ -13,9 +21,21 @@ try:
 except ImportError:
     HAS_MSGPACK = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import fastjsonschema
+    HAS_FASTJSONSCHEMA = True
+except ImportError:
+    HAS_FASTJSONSCHEMA = False
+
 try:
     import jsonschema
-    from jsonschema import validate, ValidationError
+    from jsonschema import ValidationError
     HAS_JSONSCHEMA = True
 except ImportError:
     HAS_JSONSCHEMA = False
@@ -154,6 +174,8 @@ MESSAGE_SCHEMAS = {
                         "maxLength": 10000
                     },
                     "attributes_only": {"type": "boolean"},
+                    "geometry": {"enum": ["wkb", "bbox", "none"]},
+                    "columnar": {"type": "boolean"},
                     "simplify_tolerance": {
                         "type": "number",
                         "minimum": 0,
@@ -166,6 +188,40 @@ MESSAGE_SCHEMAS = {
         "additionalProperties": False
     },
 
+    "aggregate": {
+        "type": "object",
+        "required": ["type", "id", "data"],
+        "properties": {
+            "type": {"const": "aggregate"},
+            "id": {"type": ["string", "integer"]},
+            "data": {
+                "type": "object",
+                "required": ["layer_id", "field"],
+                "properties": {
+                    "layer_id": {
+                        "type": "string",
+                        "minLength": 1,
+                        "maxLength": 256
+                    },
+                    "field": {
+                        "type": "string",
+                        "minLength": 1,
+                        "maxLength": 1000
+                    },
+                    "op": {
+                        "enum": ["count", "sum", "mean", "min", "max", "median", "stdev", "range"]
+                    },
+                    "filter_expression": {
+                        "type": "string",
+                        "maxLength": 10000
+                    }
+                },
+                "additionalProperties": False
+            }
+        },
+        "additionalProperties": False
+    },
+
     "load_layer": {
         "type": "object",
         "required": ["type", "id", "data"],
@@ -199,6 +255,10 @@ MESSAGE_SCHEMAS = {
             "type": {"const": "response"},
             "id": {"type": ["string", "integer"]},
             "success": {"type": "boolean"},
+            "epoch": {
+                "type": "integer",
+                "minimum": 0
+            },
             "data": {
                 "type": ["object", "array", "string", "number", "boolean", "null"]
             },
@@ -211,6 +271,27 @@ MESSAGE_SCHEMAS = {
     }
 }
 
+# Validators compiled once; jsonschema.validate() rebuilds one per message.
+# fastjsonschema generates a Python function per schema, checking only what
+# that schema needs; the jsonschema validators are the fallback.
+if HAS_FASTJSONSCHEMA:
+    _VALIDATORS = {
+        name: fastjsonschema.compile(schema)
+        for name, schema in MESSAGE_SCHEMAS.items()
+    }
+    _VALIDATION_ERROR = fastjsonschema.JsonSchemaException
+elif HAS_JSONSCHEMA:
+    _VALIDATORS = {
+        name: jsonschema.validators.validator_for(schema)(schema).validate
+        for name, schema in MESSAGE_SCHEMAS.items()
+    }
+    _VALIDATION_ERROR = ValidationError
+else:
+    _VALIDATORS = {}
+    _VALIDATION_ERROR = None
+
+HAS_SCHEMA_VALIDATION = bool(_VALIDATORS)
+
 
 class ProtocolHandler:
     """Handles message serialization and deserialization with length-prefix protocol"""
@@ -222,6 +303,12 @@ class ProtocolHandler:
     # Maximum message size: 10MB (more conservative than before)
     MAX_MESSAGE_SIZE = 10 * 1024 * 1024
 
+    # Payloads below this are joined to their header for a single send
+    COALESCE_SIZE = 16 * 1024
+
+    # First read per message: header plus the start (often all) of the body
+    INITIAL_READ_SIZE = 8192
+
     def __init__(self, use_msgpack: bool = True, validate_schema: bool = True):
         """
         Initialize protocol handler
@@ -230,14 +317,22 @@ class ProtocolHandler:
             use_msgpack: Use MessagePack if available, otherwise use JSON
             validate_schema: Validate messages against JSON schema
         """
-        self.use_msgpack = use_msgpack and HAS_MSGPACK
-        self.validate_schema = validate_schema and HAS_JSONSCHEMA
+        # Bytes read past the end of the previous message, per socket;
+        # weak keys so closed sockets drop out on their own
+        self._leftover = weakref.WeakKeyDictionary()
 
-        if self.validate_schema and not HAS_JSONSCHEMA:
+        # Long-lived msgpack Packer, one per thread since a handler is shared
+        # by client threads and a Packer is not thread-safe
+        self._local = threading.local()
+
+        self.use_msgpack = use_msgpack and (HAS_ORMSGPACK or HAS_MSGPACK)
+        self.validate_schema = validate_schema and HAS_SCHEMA_VALIDATION
+
+        if validate_schema and not HAS_SCHEMA_VALIDATION:
             import warnings
             warnings.warn(
                 "jsonschema not available, message validation disabled. "
-                "Install with: pip install jsonschema"
+                "Install with: pip install jsonschema (or fastjsonschema)"
             )
 
     def serialize(self, data: Dict[str, Any]) -> bytes:
@@ -255,18 +350,32 @@ class ProtocolHandler:
         """
         try:
             if self.use_msgpack:
-                return msgpack.packb(data, use_bin_type=True)
+                if HAS_ORMSGPACK:
+                    # Same wire format as msgpack with use_bin_type=True
+                    return ormsgpack.packb(data, option=ormsgpack.OPT_NON_STR_KEYS)
+                return self._msgpack_packer().pack(data)
+            elif HAS_ORJSON:
+                # Encodes straight to bytes; datetime/UUID need no conversion
+                return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
             else:
                 return json.dumps(data).encode('utf-8')
         except (TypeError, ValueError) as e:
             raise ProtocolException(f"Serialization failed: {e}")
 
+    def _msgpack_packer(self) -> "msgpack.Packer":
+        """Get this thread's reusable msgpack Packer"""
+        packer = getattr(self._local, "packer", None)
+        if packer is None:
+            packer = msgpack.Packer(use_bin_type=True, autoreset=True)
+            self._local.packer = packer
+        return packer
+
     def deserialize(self, data: bytes) -> Dict[str, Any]:
         """
         Deserialize bytes to dictionary
 
         Args:
-            data: Bytes to deserialize
+            data: Bytes to deserialize (bytearray and memoryview also work)
 
         Returns:
             Deserialized dictionary
@@ -276,9 +385,14 @@ class ProtocolHandler:
         """
         try:
             if self.use_msgpack:
-                result = msgpack.unpackb(data, raw=False)
+                if HAS_ORMSGPACK:
+                    result = ormsgpack.unpackb(data)
+                else:
+                    result = msgpack.unpackb(data, raw=False)
+            elif HAS_ORJSON:
+                result = orjson.loads(data)
             else:
-                result = json.loads(data.decode('utf-8'))
+                result = json.loads(str(data, 'utf-8'))
 
             if not isinstance(result, dict):
                 raise ProtocolException(
@@ -314,33 +428,43 @@ class ProtocolHandler:
 
         message_type = message.get("type")
 
-        # Get appropriate schema
-        schema = MESSAGE_SCHEMAS.get(message_type)
-        if not schema:
+        # Get appropriate validator
+        validator = _VALIDATORS.get(message_type)
+        if validator is None:
             # Use base schema for unknown types
-            schema = MESSAGE_SCHEMAS["base"]
+            validator = _VALIDATORS["base"]
 
         # Validate against schema
         try:
-            validate(instance=message, schema=schema)
-        except ValidationError as e:
+            validator(message)
+        except _VALIDATION_ERROR as e:
             raise ProtocolException(f"Schema validation failed: {e.message}")
 
-    def pack_message(self, message_dict: Dict[str, Any]) -> bytes:
+    def encode_frame(
+        self,
+        message_dict: Dict[str, Any],
+        validated: bool = False
+    ) -> Tuple[bytes, bytes]:
         """
-        Pack a message with length prefix
+        Encode a message as separate length header and payload
+
+        Lets callers hand both parts to a vectored write (sendmsg,
+        writelines) instead of copying the payload behind the header.
 
         Args:
-            message_dict: Message dictionary to pack
+            message_dict: Message dictionary to encode
+            validated: Skip schema validation; only for messages built by
+                trusted code (e.g. server responses), never for relayed input
 
         Returns:
-            Packed message with length prefix
+            Tuple of (4-byte length header, serialized payload)
 
         Raises:
             ProtocolException: If message validation or packing fails
         """
         # Validate message structure
-        self.validate_message(message_dict)
+        if not validated:
+            self.validate_message(message_dict)
 
         # Serialize message
         message_bytes = self.serialize(message_dict)
@@ -356,22 +480,64 @@ class ProtocolHandler:
         # Pack length as 4-byte header
         header = struct.pack(self.MESSAGE_HEADER_FORMAT, message_len)
 
+        return header, message_bytes
+
+    def pack_message(self, message_dict: Dict[str, Any], validated: bool = False) -> bytes:
+        """
+        Pack a message with length prefix
+
+        Args:
+            message_dict: Message dictionary to pack
+            validated: Skip schema validation (see encode_frame)
+
+        Returns:
+            Packed message with length prefix
+
+        Raises:
+            ProtocolException: If message validation or packing fails
+        """
+        header, message_bytes = self.encode_frame(message_dict, validated)
         return header + message_bytes
 
-    def send_message(self, socket, message_dict: Dict[str, Any]) -> None:
+    def send_message(
+        self,
+        socket,
+        message_dict: Dict[str, Any],
+        validated: bool = False
+    ) -> None:
         """
         Send a message over a socket with length prefix
 
         Args:
             socket: Socket to send on
             message_dict: Message to send
+            validated: Skip schema validation (see pack_message)
 
         Raises:
             ProtocolException: If message is invalid or too large
             socket.error: If send fails
         """
-        packed_message = self.pack_message(message_dict)
-        socket.sendall(packed_message)
+        header, payload = self.encode_frame(message_dict, validated)
+
+        # Copying a small payload behind the header is cheaper than a
+        # vectored write; large ones are sent without joining the two
+        if len(payload) < self.COALESCE_SIZE:
+            socket.sendall(header + payload)
+            return
+
+        try:
+            sent = socket.sendmsg([header, payload])
+        except (AttributeError, NotImplementedError):
+            # No scatter-gather (TLS sockets, Windows)
+            socket.sendall(header)
+            socket.sendall(payload)
+            return
+
+        if sent < len(header):
+            socket.sendall(header[sent:])
+            socket.sendall(payload)
+        elif sent < len(header) + len(payload):
+            socket.sendall(memoryview(payload)[sent - len(header):])
 
     def receive_message(
         self,
@@ -397,13 +563,21 @@ class ProtocolHandler:
             socket.settimeout(timeout)
 
         try:
-            # Read exact header size
-            header_data = self._recv_exact(socket, self.HEADER_SIZE)
-            if not header_data:
-                return None
+            # Read the header, usually together with the body in one recv
+            data = self._leftover.pop(socket, b'')
+            while len(data) < self.HEADER_SIZE:
+                chunk = socket.recv(self.INITIAL_READ_SIZE)
+                if not chunk:
+                    if not data:
+                        return None
+                    raise ProtocolException(
+                        f"Socket closed before message complete "
+                        f"({len(data)}/{self.HEADER_SIZE} bytes received)"
+                    )
+                data += chunk
 
             # Unpack message length
-            message_len = struct.unpack(self.MESSAGE_HEADER_FORMAT, header_data)[0]
+            message_len = struct.unpack_from(self.MESSAGE_HEADER_FORMAT, data)[0]
 
             # Validate size
             if message_len > self.MAX_MESSAGE_SIZE:
@@ -415,10 +589,25 @@ class ProtocolHandler:
             if message_len == 0:
                 raise ProtocolException("Received message with zero length")
 
-            # Read exact message size
-            message_data = self._recv_exact(socket, message_len)
-            if not message_data:
-                return None
+            # Read whatever part of the body the first recv did not bring
+            end = self.HEADER_SIZE + message_len
+            if len(data) < end:
+                message_data = bytearray(message_len)
+                received = len(data) - self.HEADER_SIZE
+                message_data[:received] = memoryview(data)[self.HEADER_SIZE:]
+                if self._recv_exact(
+                    socket, message_len - received, message_data, received
+                ) is None:
+                    if received:
+                        raise ProtocolException(
+                            f"Socket closed before message complete "
+                            f"({received}/{message_len} bytes received)"
+                        )
+                    return None
+            else:
+                message_data = data[self.HEADER_SIZE:end]
+                if len(data) > end:
+                    self._leftover[socket] = data[end:]
 
             # Deserialize
             message = self.deserialize(message_data)
@@ -432,47 +621,64 @@ class ProtocolHandler:
             if timeout is not None:
                 socket.settimeout(None)  # Reset to blocking
 
-    def _recv_exact(self, socket, num_bytes: int) -> Optional[bytes]:
+    def _recv_exact(
+        self,
+        socket,
+        num_bytes: int,
+        buf: Optional[bytearray] = None,
+        offset: int = 0
+    ) -> Optional[bytearray]:
         """
         Receive exactly num_bytes from socket
 
+        Data is received in place, so every byte is copied only once.
+
         Args:
             socket: Socket to receive from
             num_bytes: Number of bytes to receive
+            buf: Buffer to fill from offset (a new one by default)
+            offset: Position in buf where received data starts
 
         Returns:
-            Received bytes or None if connection closed
+            Filled buffer or None if connection closed
 
         Raises:
             socket.error: If receive fails
             ProtocolException: If connection closes prematurely
         """
-        chunks = []
-        bytes_received = 0
-
-        while bytes_received < num_bytes:
-            chunk = socket.recv(min(num_bytes - bytes_received, 8192))
-            if not chunk:
+        if buf is None:
+            buf = bytearray(num_bytes)
+        view = memoryview(buf)
+        end = offset + num_bytes
+        pos = offset
+
+        while pos < end:
+            n = socket.recv_into(view[pos:end], min(end - pos, 65536))
+            if not n:
                 # Connection closed
-                if bytes_received == 0:
+                if pos == offset:
                     return None
                 raise ProtocolException(
                     f"Socket closed before message complete "
-                    f"({bytes_received}/{num_bytes} bytes received)"
+                    f"({pos - offset}/{num_bytes} bytes received)"
                 )
 
-            chunks.append(chunk)
-            bytes_received += len(chunk)
+            pos += n
 
-        return b''.join(chunks)
+        return buf
 
 
 class BufferedProtocolHandler(ProtocolHandler):
     """Protocol handler with internal buffer for non-blocking sockets"""
 
+    # Consumed bytes are only cut off the buffer's head once they are at
+    # least this many and at least half the buffer, so the memmove is rare
+    COMPACT_THRESHOLD = 4096
+
     def __init__(self, use_msgpack: bool = True, validate_schema: bool = True):
         super().__init__(use_msgpack, validate_schema)
         self.buffer = bytearray()
+        self._read_off = 0  # Start of unconsumed data in buffer
         self.expected_message_size = None
 
     def feed_data(self, data: bytes) -> None:
@@ -485,9 +691,10 @@ class BufferedProtocolHandler(ProtocolHandler):
         Raises:
             ProtocolException: If buffer exceeds maximum size
         """
-        if len(self.buffer) + len(data) > self.MAX_MESSAGE_SIZE:
+        buffered = len(self.buffer) - self._read_off
+        if buffered + len(data) > self.MAX_MESSAGE_SIZE:
             raise ProtocolException(
-                f"Buffer overflow: {len(self.buffer) + len(data)} bytes "
+                f"Buffer overflow: {buffered + len(data)} bytes "
                 f"exceeds maximum of {self.MAX_MESSAGE_SIZE}"
             )
 
@@ -503,16 +710,18 @@ class BufferedProtocolHandler(ProtocolHandler):
         Raises:
             ProtocolException: If message is invalid or size exceeds limit
         """
+        start = self._read_off
+
         # Need at least header size
-        if len(self.buffer) < self.HEADER_SIZE:
+        if len(self.buffer) - start < self.HEADER_SIZE:
             return None
 
         # Parse message size if not already done
         if self.expected_message_size is None:
-            header_data = bytes(self.buffer[:self.HEADER_SIZE])
-            self.expected_message_size = struct.unpack(
+            self.expected_message_size = struct.unpack_from(
                 self.MESSAGE_HEADER_FORMAT,
-                header_data
+                self.buffer,
+                start
             )[0]
 
             # Validate size
@@ -528,32 +737,42 @@ class BufferedProtocolHandler(ProtocolHandler):
                 raise ProtocolException("Received message with zero length")
 
         # Check if we have the complete message
-        total_size = self.HEADER_SIZE + self.expected_message_size
-        if len(self.buffer) < total_size:
+        end = start + self.HEADER_SIZE + self.expected_message_size
+        if len(self.buffer) < end:
             return None
 
-        # Extract message data
-        message_data = bytes(
-            self.buffer[self.HEADER_SIZE:total_size]
-        )
-
-        # Remove processed data from buffer
-        del self.buffer[:total_size]
-        self.expected_message_size = None
-
-        # Deserialize
-        message = self.deserialize(message_data)
+        # Deserialize straight from the buffer, then mark it consumed
+        # (the view must be released before the bytearray can shrink)
+        try:
+            with memoryview(self.buffer)[start + self.HEADER_SIZE:end] as message_data:
+                message = self.deserialize(message_data)
+        finally:
+            self._consume(end)
+            self.expected_message_size = None
 
         # Validate message structure
         self.validate_message(message)
 
         return message
 
+    def _consume(self, end: int) -> None:
+        """Advance the read offset to end, compacting the buffer when worthwhile"""
+        if end == len(self.buffer):
+            # Everything consumed: emptying is free, no data to move
+            self.buffer.clear()
+            self._read_off = 0
+        elif end > self.COMPACT_THRESHOLD and end * 2 > len(self.buffer):
+            del self.buffer[:end]
+            self._read_off = 0
+        else:
+            self._read_off = end
+
     def clear_buffer(self) -> None:
         """Clear the internal buffer"""
         self.buffer.clear()
+        self._read_off = 0
         self.expected_message_size = None
 
     def get_buffer_size(self) -> int:
         """Get current buffer size"""
-        return len(self.buffer)
+        return len(self.buffer) - self._read_off
@@ -11,20 +11,47 @@ Features:
 - Performance monitoring and metrics
 """
 
+import asyncio
+import base64
+import hashlib
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
 import uuid
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from typing import Dict, Any, Optional, Callable
 from pathlib import Path
 
 try:
-    from qgis.core import QgsMessageLog, Qgis, QgsProject, QgsVectorLayer, QgsRasterLayer
+    from qgis.core import (
+        QgsProject, QgsVectorLayer, QgsRasterLayer, QgsMapLayer,
+        QgsMapSettings, QgsMapRendererParallelJob, QgsRectangle
+    )
     from qgis.utils import iface
+    from PyQt5.QtGui import QColor, QImage
+    from PyQt5.QtCore import (
+        QSize, QByteArray, QBuffer, QIODevice, QObject, QThread, Qt, pyqtSignal
+    )
     HAS_QGIS = True
 except ImportError:
     HAS_QGIS = False
 
+# Pillow wheels ship zlib-ng, which deflates PNGs faster than Qt's zlib
+try:
+    from PIL import Image as PILImage
+    HAS_PILLOW = True
+except ImportError:
+    HAS_PILLOW = False
+
 from .qgis_mcp_server_secure import SecureQGISMCPServer
-from .async_executor import get_async_manager, OperationStatus
+from .async_executor import get_async_manager, shutdown_async_manager, OperationStatus
+from .protocol import ProtocolException
 from .optimization import (
     GeometryCache,
     OptimizedFeatureAccess,
@@ -33,6 +60,106 @@ from .optimization import (
 )
 from .security_improved import SecurityException
 
+# Processing.initialize() rescans every provider; it only needs to run once
+_processing_lock = threading.Lock()
+_processing_ready = False
+
+
+def _get_processing():
+    """Import the processing framework, initializing it on first use"""
+    global _processing_ready
+    import processing
+
+    if not _processing_ready:
+        with _processing_lock:
+            if not _processing_ready:
+                from processing.core.Processing import Processing
+                Processing.initialize()
+                _processing_ready = True
+    return processing
+
+
+if HAS_QGIS:
+    class _ProjectLayerAdder(QObject):
+        """
+        Add layers created on worker threads to the project
+
+        The project and its layer tree may only be changed from the main
+        thread, so workers hand their layers over with a queued signal and
+        wait for the main thread to add them. Must be created on the main
+        thread.
+        """
+
+        _add_requested = pyqtSignal(object, object)
+
+        def __init__(self):
+            super().__init__()
+            self._add_requested.connect(self._add, Qt.QueuedConnection)
+
+        def _add(self, layers: list, done: threading.Event) -> None:
+            try:
+                project = QgsProject.instance()
+                for layer in layers:
+                    if not project.mapLayer(layer.id()):
+                        project.addMapLayer(layer)
+            finally:
+                done.set()
+
+        def add_layers(self, layers: list, timeout: float) -> None:
+            """Add layers from the main thread, blocking until they are in the project"""
+            done = threading.Event()
+            main_thread = self.thread()
+            if QThread.currentThread() is main_thread:
+                self._add(layers, done)
+                return
+
+            # Only the owning thread may push an object to another thread
+            for layer in layers:
+                layer.moveToThread(main_thread)
+            self._add_requested.emit(layers, done)
+            if not done.wait(timeout):
+                raise TimeoutError("Timed out adding layers to the project")
+
+
+# Processing outputs sent as they are; anything else goes through _serialize_output
+_PRIMITIVE_TYPES = (str, int, float, bool, type(None))
+
+
+def _serialize_output(value: Any) -> Any:
+    """Layers (anything with an id() method) become their ID, the rest a string"""
+    get_id = getattr(value, 'id', None)
+    return get_id() if callable(get_id) else str(value)
+
+
+def _encode_png(image: Any) -> bytes:
+    """Encode a rendered QImage as PNG, with Pillow when it is installed"""
+    if HAS_PILLOW and sys.byteorder == 'little':
+        # 32-bit QImage pixels are BGRA in memory on little-endian hosts;
+        # Pillow reads them in place and un-premultiplies in C
+        if image.format() == QImage.Format_ARGB32_Premultiplied:
+            raw_mode = 'BGRa'
+        else:
+            image = image.convertToFormat(QImage.Format_ARGB32)
+            raw_mode = 'BGRA'
+        bits = image.constBits()
+        bits.setsize(image.sizeInBytes())
+        pil_image = PILImage.frombuffer(
+            'RGBA', (image.width(), image.height()), bits,
+            'raw', raw_mode, image.bytesPerLine(), 1
+        )
+        buffer = BytesIO()
+        pil_image.save(buffer, 'PNG')
+        return buffer.getvalue()
+
+    # Qt encodes straight into a C++ buffer, with no Python write() calls
+    png = QByteArray()
+    buffer = QBuffer(png)
+    buffer.open(QIODevice.WriteOnly)
+    if not image.save(buffer, "PNG"):
+        raise RuntimeError("Failed to encode rendered image")
+    buffer.close()
+    return png.data()
+
 
 class OptimizedQGISMCPServer(SecureQGISMCPServer):
     """
@@ -46,6 +173,22 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
     - Better resource management
     """
 
+    LOG_CATEGORY = "QGIS MCP Optimized"
+    # Status long-polls are cheap; they only park on a condition variable
+    OPERATION_TYPES = {
+        **SecureQGISMCPServer.OPERATION_TYPES,
+        'wait_async_operation': 'cheap',
+        'check_async_status': 'cheap',
+        'check_async_status_batch': 'cheap',
+        'fetch_partial_results': 'cheap',
+    }
+    MAX_WAIT_SECONDS = 20.0  # Upper bound for a single wait_async_operation call
+    RENDER_CHUNK_SIZE = 1024 * 1024  # Largest slice returned by download_render_chunk
+    RENDER_ARTIFACT_TTL = 600.0  # Seconds a rendered file stays downloadable
+    LAYER_LIST_CACHE_SIZE = 64  # Distinct render layer lists kept resolved
+    PREFETCH_LAYERS = 5  # Most-queried layers warmed after list_layers
+    PREFETCH_FEATURES = 500  # Geometries warmed per layer
+
     def __init__(
         self,
         host: str = '127.0.0.1',
@@ -55,7 +198,9 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
         allowed_directories: Optional[list] = None,
         enable_async: bool = True,
         cache_size: int = 1000,
-        max_async_operations: int = 10
+        max_async_operations: int = 10,
+        tcp_nodelay: bool = True,
+        socket_path: Optional[str] = None
     ):
         """
         Initialize optimized QGIS MCP server
@@ -69,6 +214,8 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
             enable_async: Enable async command execution
             cache_size: Geometry cache size
             max_async_operations: Maximum concurrent async operations
+            tcp_nodelay: Disable Nagle's algorithm on client sockets
+            socket_path: Listen on this Unix domain socket instead of TCP
         """
         # Initialize parent
         super().__init__(
@@ -76,7 +223,9 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
             port=port,
             use_tls=use_tls,
             require_auth=require_auth,
-            allowed_directories=allowed_directories
+            allowed_directories=allowed_directories,
+            tcp_nodelay=tcp_nodelay,
+            socket_path=socket_path
         )
 
         # Async support
@@ -85,31 +234,93 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
             self.async_manager = get_async_manager()
             self.async_manager.max_concurrent = max_async_operations
 
+        # Event loop serving all client sockets
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._client_tasks: set = set()
+
+        # Renders written to disk for chunked download: request_id -> (path, created)
+        self._render_dir: Optional[str] = None
+        self._render_artifacts: Dict[str, tuple] = {}
+        self._render_lock = threading.Lock()
+
+        # Algorithm IDs already confirmed to exist in the processing registry
+        self._known_algorithms: set = set()
+
+        # Resolved render layers (layer_id -> layer), keyed by the sorted
+        # requested layer_ids. Renders resolve on worker threads while
+        # layersWillBeRemoved clears from the main thread: the generation
+        # counter, bumped on every clear, stops a resolve that raced a
+        # removal from storing layers that are about to be deleted
+        self._layer_list_cache: Dict[tuple, Dict[str, Any]] = {}
+        self._layer_list_lock = threading.Lock()
+        self._layer_list_generation = 0
+        if HAS_QGIS:
+            QgsProject.instance().layersWillBeRemoved.connect(self._clear_layer_list_cache)
+            self._layer_adder = _ProjectLayerAdder()
+
         # Enhanced caching
         self.geometry_cache = GeometryCache(max_size=cache_size)
-        self.feature_access = OptimizedFeatureAccess()
+        self.feature_access = OptimizedFeatureAccess(binary_wkb=self.protocol.use_msgpack)
         self.feature_access.geometry_cache = self.geometry_cache
 
-        # Register async command handlers
-        self.command_handlers.update({
+        # get_features counts per layer, used to pick layers to prefetch
+        self._layer_access: Counter = Counter()
+        # Threads start on first submit, so an idle pool costs nothing
+        self._prefetch_pool = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="qgis-mcp-prefetch"
+        )
+        self._prefetching: set = set()
+        # Handlers run on the dispatch pool: guards _layer_access and _prefetching
+        self._access_lock = threading.Lock()
+
+        # Register async command handlers. Availability is fixed for the
+        # server's lifetime, so it is decided here rather than on every call.
+        qgis_handlers = {
             'execute_code_async': self._handle_execute_code_async,
             'render_map_async': self._handle_render_map_async,
             'execute_processing_async': self._handle_execute_processing_async,
+            'execute_pipeline_async': self._handle_execute_pipeline_async,
             'get_features_async': self._handle_get_features_async,
+        }
+        status_handlers = {
             'check_async_status': self._handle_check_async_status,
+            'check_async_status_batch': self._handle_check_async_status_batch,
+            'wait_async_operation': self._handle_wait_async_operation,
             'cancel_async_operation': self._handle_cancel_async_operation,
             'list_async_operations': self._handle_list_async_operations,
+            'fetch_partial_results': self._handle_fetch_partial_results,
+        }
+        if not self.enable_async:
+            unavailable = self._unavailable_handler("Async operations not enabled")
+            qgis_handlers = dict.fromkeys(qgis_handlers, unavailable)
+            status_handlers = dict.fromkeys(status_handlers, unavailable)
+        elif not HAS_QGIS:
+            qgis_handlers = dict.fromkeys(
+                qgis_handlers, self._unavailable_handler("QGIS not available")
+            )
+
+        self.command_handlers.update(qgis_handlers)
+        self.command_handlers.update(status_handlers)
+        self.command_handlers.update({
             'clear_cache': self._handle_clear_cache,
             'invalidate_layer_cache': self._handle_invalidate_layer_cache,
+            'download_render_chunk': self._handle_download_render_chunk,
         })
 
-        if HAS_QGIS:
-            QgsMessageLog.logMessage(
-                f"Optimized QGIS MCP Server initialized (cache_size={cache_size}, "
-                f"async_enabled={enable_async})",
-                "QGIS MCP Optimized",
-                Qgis.Info
-            )
+        self._log(
+            f"Optimized QGIS MCP Server initialized (cache_size={cache_size}, "
+            f"async_enabled={enable_async})",
+            'Info'
+        )
+
+    @staticmethod
+    def _unavailable_handler(reason: str) -> Callable[[Dict[str, Any], str], Dict[str, Any]]:
+        """Build a handler for a command that is disabled on this server"""
+        def handler(message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
+            raise RuntimeError(reason)
+        return handler
 
     # ==================== Enhanced Command Handlers ====================
 
@@ -122,6 +333,8 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
 
         # Use optimized feature access
         result = self.feature_access.get_features_optimized(**data)
+        with self._access_lock:
+            self._layer_access[data['layer_id']] += 1
 
         return result
 
@@ -134,7 +347,43 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
         offset = data.get('offset', 0)
         limit = data.get('limit', 50)
 
-        return PaginatedLayerAccess.get_layers_paginated(offset=offset, limit=limit)
+        result = PaginatedLayerAccess.get_layers_paginated(offset=offset, limit=limit)
+
+        # Feature queries usually follow a listing; warm the likely layers meanwhile
+        self._schedule_prefetch()
+
+        return result
+
+    def _schedule_prefetch(self) -> None:
+        """Warm the geometry cache for the most-queried layers in the background"""
+        if not self.running:
+            return
+
+        with self._access_lock:
+            layer_ids = [
+                layer_id
+                for layer_id, _ in self._layer_access.most_common(self.PREFETCH_LAYERS)
+                if layer_id not in self._prefetching
+            ]
+            self._prefetching.update(layer_ids)
+
+        for i, layer_id in enumerate(layer_ids):
+            try:
+                self._prefetch_pool.submit(self._prefetch_layer, layer_id)
+            except RuntimeError:
+                # Server stopped meanwhile
+                with self._access_lock:
+                    self._prefetching.difference_update(layer_ids[i:])
+                return
+
+    def _prefetch_layer(self, layer_id: str) -> None:
+        try:
+            self.feature_access.prefetch(layer_id, limit=self.PREFETCH_FEATURES)
+        except Exception as e:
+            self._log(f"Prefetch failed for layer {layer_id}: {type(e).__name__}", 'Warning')
+        finally:
+            with self._access_lock:
+                self._prefetching.discard(layer_id)
 
     def _handle_get_stats(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
         """Enhanced statistics with cache and async metrics"""
@@ -153,12 +402,6 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
 
     def _handle_execute_code_async(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
         """Execute Python code asynchronously"""
-        if not self.enable_async:
-            raise RuntimeError("Async operations not enabled")
-
-        if not HAS_QGIS:
-            raise RuntimeError("QGIS not available")
-
         data = message.get('data', {})
         code = data.get('code', '')
         timeout = data.get('timeout', 300)
@@ -201,12 +444,6 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
 
     def _handle_render_map_async(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
         """Render map asynchronously"""
-        if not self.enable_async:
-            raise RuntimeError("Async operations not enabled")
-
-        if not HAS_QGIS:
-            raise RuntimeError("QGIS not available")
-
         data = message.get('data', {})
         request_id = data.get('request_id', str(uuid.uuid4()))
         timeout = data.get('timeout', 300)
@@ -216,13 +453,6 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
             if _progress_callback:
                 _progress_callback(10, "Preparing map canvas...")
 
-            # Import here to avoid circular imports
-            from qgis.core import QgsMapSettings, QgsMapRendererCustomPainterJob
-            from PyQt5.QtGui import QImage, QPainter
-            from PyQt5.QtCore import QSize
-            import base64
-            from io import BytesIO
-
             if _progress_callback:
                 _progress_callback(30, "Setting up renderer...")
 
@@ -231,13 +461,15 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
             height = render_params.get('height', 600)
             extent = render_params.get('extent')
             layer_ids = render_params.get('layer_ids', [])
+            encoding = render_params.get('encoding', 'base64')
 
             # Setup map settings
             settings = QgsMapSettings()
             settings.setOutputSize(QSize(width, height))
+            settings.setBackgroundColor(QColor(0, 0, 0, 0))  # Transparent background
+            settings.setFlag(QgsMapSettings.RenderPartialOutput, False)
 
             if extent:
-                from qgis.core import QgsRectangle
                 rect = QgsRectangle(
                     extent['xmin'], extent['ymin'],
                     extent['xmax'], extent['ymax']
@@ -248,43 +480,49 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
 
             # Set layers
             if layer_ids:
-                layers = [QgsProject.instance().mapLayer(lid) for lid in layer_ids]
-                layers = [l for l in layers if l is not None]
-                settings.setLayers(layers)
+                settings.setLayers(self._resolve_layers(layer_ids))
             elif iface:
                 settings.setLayers(iface.mapCanvas().layers())
 
             if _progress_callback:
                 _progress_callback(50, "Rendering map...")
 
-            # Create image
-            image = QImage(QSize(width, height), QImage.Format_ARGB32)
-            image.fill(0)  # Transparent background
-
-            # Render
-            painter = QPainter(image)
-            job = QgsMapRendererCustomPainterJob(settings, painter)
-            job.renderSynchronously()
-            painter.end()
+            # Layers render concurrently on QGIS's own thread pool
+            job = QgsMapRendererParallelJob(settings)
+            if _progress_callback:
+                job.renderingLayersFinished.connect(
+                    lambda: _progress_callback(70, "Rendering labels...")
+                )
+            job.start()
+            job.waitForFinished()
+            image = job.renderedImage()
 
             if _progress_callback:
                 _progress_callback(90, "Encoding image...")
 
-            # Convert to base64 PNG
-            buffer = BytesIO()
-            image.save(buffer, "PNG")
-            img_base64 = base64.b64encode(buffer.getvalue()).decode('ascii')
+            png = _encode_png(image)
+
+            if encoding == 'file':
+                # Leave the PNG on disk; the client pulls it with download_render_chunk
+                return self._store_render(request_id, png, width, height)
 
             if _progress_callback:
                 _progress_callback(100, "Render complete")
 
-            return {
-                'image_base64': img_base64,
+            result = {
                 'format': 'png',
                 'width': width,
                 'height': height
             }
 
+            # MessagePack carries bytes natively; base64 is only needed for JSON
+            if encoding == 'binary':
+                result['image'] = png
+            else:
+                result['image_base64'] = base64.b64encode(png).decode('ascii')
+
+            return result
+
         # Start async operation
         result = self.async_manager.start_operation(
             request_id=request_id,
@@ -300,14 +538,131 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
             'message': 'Map rendering started asynchronously'
         }
 
-    def _handle_execute_processing_async(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
-        """Execute QGIS processing algorithm asynchronously"""
-        if not self.enable_async:
-            raise RuntimeError("Async operations not enabled")
+    def _resolve_layers(self, layer_ids: list) -> list:
+        """Map layer IDs to project layers, skipping unknown IDs"""
+        # Sorted so any stacking order of the same layers shares one entry;
+        # the result is rebuilt in the requested (stacking) order below
+        key = tuple(sorted(layer_ids))
+        with self._layer_list_lock:
+            by_id = self._layer_list_cache.get(key)
+            generation = self._layer_list_generation
+
+        if by_id is None:
+            project = QgsProject.instance()
+            by_id = {}
+            for layer_id in key:
+                layer = project.mapLayer(layer_id)
+                if layer is not None:
+                    by_id[layer_id] = layer
+            # Only cache complete lists; an unknown ID may be added later
+            if len(by_id) == len(set(key)):
+                with self._layer_list_lock:
+                    if generation == self._layer_list_generation:
+                        if len(self._layer_list_cache) >= self.LAYER_LIST_CACHE_SIZE:
+                            self._layer_list_cache.clear()
+                        self._layer_list_cache[key] = by_id
+
+        return [by_id[layer_id] for layer_id in layer_ids if layer_id in by_id]
+
+    def _clear_layer_list_cache(self, layer_ids: Any = None) -> None:
+        """Drop resolved layer lists; connected to layersWillBeRemoved"""
+        with self._layer_list_lock:
+            self._layer_list_generation += 1
+            self._layer_list_cache.clear()
+
+    def _store_render(self, request_id: str, png: bytes, width: int, height: int) -> Dict[str, Any]:
+        """Save an encoded render to the render directory and register it for download"""
+        with self._render_lock:
+            if self._render_dir is None:
+                self._render_dir = tempfile.mkdtemp(prefix='qgis_mcp_render_')
+            render_dir = self._render_dir
+
+        # The file name is random; request_id comes from the client
+        fd, path = tempfile.mkstemp(suffix='.png', dir=render_dir)
+        with open(fd, 'wb') as f:
+            f.write(png)
+
+        with self._render_lock:
+            previous = self._render_artifacts.pop(request_id, None)
+            self._render_artifacts[request_id] = (path, time.monotonic())
+        if previous:
+            self._remove_file(previous[0])
+        self._purge_render_artifacts()
 
-        if not HAS_QGIS:
-            raise RuntimeError("QGIS not available")
+        return {
+            'format': 'png',
+            'width': width,
+            'height': height,
+            'image_size': len(png),
+            'content_hash': 'sha256:' + hashlib.sha256(png).hexdigest()
+        }
+
+    def _purge_render_artifacts(self, max_age: Optional[float] = None) -> None:
+        """Delete rendered files older than max_age (default RENDER_ARTIFACT_TTL)"""
+        if max_age is None:
+            max_age = self.RENDER_ARTIFACT_TTL
+        cutoff = time.monotonic() - max_age
+
+        with self._render_lock:
+            expired = [rid for rid, (_, created) in self._render_artifacts.items()
+                       if created <= cutoff]
+            paths = [self._render_artifacts.pop(rid)[0] for rid in expired]
+
+        for path in paths:
+            self._remove_file(path)
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def _handle_download_render_chunk(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
+        """Read a slice of a render produced with encoding='file'"""
+        data = message.get('data', {})
+        request_id = data.get('request_id')
+        offset = int(data.get('offset', 0))
+        length = min(int(data.get('length', self.RENDER_CHUNK_SIZE)), self.RENDER_CHUNK_SIZE)
 
+        if not request_id:
+            raise ValueError("request_id is required")
+        if offset < 0 or length <= 0:
+            raise ValueError("offset must be >= 0 and length > 0")
+
+        self._purge_render_artifacts()
+        with self._render_lock:
+            artifact = self._render_artifacts.get(request_id)
+        if artifact is None:
+            raise ValueError(f"Render not found or expired: {request_id}")
+
+        try:
+            fd = os.open(artifact[0], os.O_RDONLY)
+        except FileNotFoundError:
+            raise ValueError(f"Render not found or expired: {request_id}")
+        try:
+            size = os.fstat(fd).st_size
+            chunk = os.pread(fd, length, offset)
+        finally:
+            os.close(fd)
+
+        result = {
+            'request_id': request_id,
+            'offset': offset,
+            'size': size,
+            'eof': offset + len(chunk) >= size
+        }
+
+        # MessagePack carries bytes natively; base64 is only needed for JSON
+        if data.get('encoding') == 'binary':
+            result['data'] = chunk
+        else:
+            result['data_base64'] = base64.b64encode(chunk).decode('ascii')
+
+        return result
+
+    def _handle_execute_processing_async(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
+        """Execute QGIS processing algorithm asynchronously"""
         data = message.get('data', {})
         request_id = data.get('request_id', str(uuid.uuid4()))
         algorithm_id = data.get('algorithm_id')
@@ -319,19 +674,16 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
 
         # Create async handler
         def async_handler(_progress_callback=None, **kwargs):
-            import processing
-            from processing.core.Processing import Processing
-
             if _progress_callback:
                 _progress_callback(10, f"Loading algorithm: {algorithm_id}")
 
-            # Initialize processing
-            Processing.initialize()
+            processing = _get_processing()
 
             # Get algorithm
-            alg = processing.algorithmById(algorithm_id)
-            if not alg:
-                raise ValueError(f"Algorithm not found: {algorithm_id}")
+            if algorithm_id not in self._known_algorithms:
+                if not processing.algorithmById(algorithm_id):
+                    raise ValueError(f"Algorithm not found: {algorithm_id}")
+                self._known_algorithms.add(algorithm_id)
 
             if _progress_callback:
                 _progress_callback(20, "Preparing parameters...")
@@ -345,17 +697,9 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
             if _progress_callback:
                 _progress_callback(100, "Algorithm complete")
 
-            # Convert result to serializable format
-            serializable_result = {}
-            for key, value in result.items():
-                if isinstance(value, (str, int, float, bool, type(None))):
-                    serializable_result[key] = value
-                else:
-                    serializable_result[key] = str(value)
-
             return {
                 'algorithm_id': algorithm_id,
-                'result': serializable_result
+                'result': self._serialize_processing_result(result)
             }
 
         # Start async operation
@@ -373,14 +717,117 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
             'message': f'Processing algorithm {algorithm_id} started asynchronously'
         }
 
-    def _handle_get_features_async(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
-        """Get features asynchronously for large queries"""
-        if not self.enable_async:
-            raise RuntimeError("Async operations not enabled")
+    def _handle_execute_pipeline_async(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
+        """
+        Execute a chain of processing algorithms as one async operation
 
-        if not HAS_QGIS:
-            raise RuntimeError("QGIS not available")
+        Each step is {'algorithm_id': ..., 'parameters': {...}}. Parameter
+        values of the form '$stepN.KEY' (1-based) or '$prev.KEY' are replaced
+        with that output of an earlier step, so intermediate layers are passed
+        along in-process instead of round-tripping through the client.
+
+        Layers output by the last step are added to the project. In-memory
+        layers from earlier steps are discarded, so their outputs are
+        reported as null in 'steps'.
+        """
+        data = message.get('data', {})
+        request_id = data.get('request_id', str(uuid.uuid4()))
+        steps = data.get('steps', [])
+        timeout = data.get('timeout', 600)
+
+        if not steps:
+            raise ValueError("steps must be a non-empty list")
+        for step in steps:
+            if not isinstance(step, dict) or not step.get('algorithm_id'):
+                raise ValueError("every step requires an algorithm_id")
 
+        def async_handler(_progress_callback=None, **kwargs):
+            processing = _get_processing()
+
+            outputs = []
+            for index, step in enumerate(steps):
+                algorithm_id = step['algorithm_id']
+                if _progress_callback:
+                    _progress_callback(
+                        int(index / len(steps) * 100),
+                        f"Step {index + 1}/{len(steps)}: {algorithm_id}"
+                    )
+
+                parameters = {
+                    key: self._resolve_step_ref(value, outputs)
+                    for key, value in step.get('parameters', {}).items()
+                }
+                outputs.append(processing.run(algorithm_id, parameters))
+
+            # Intermediate layers die with the pipeline; keep the final ones
+            final_layers = [v for v in outputs[-1].values() if isinstance(v, QgsMapLayer)]
+            if final_layers:
+                self._layer_adder.add_layers(final_layers, timeout)
+
+            if _progress_callback:
+                _progress_callback(100, "Pipeline complete")
+
+            # Discarded layers have no ID a client could resolve
+            steps_out = [
+                self._serialize_processing_result({
+                    key: None if isinstance(value, QgsMapLayer) else value
+                    for key, value in output.items()
+                })
+                for output in outputs[:-1]
+            ]
+            final = self._serialize_processing_result(outputs[-1])
+            return {'steps': steps_out + [final], 'result': final}
+
+        result = self.async_manager.start_operation(
+            request_id=request_id,
+            command_type='execute_pipeline',
+            handler=async_handler,
+            params={},
+            timeout=timeout
+        )
+
+        return {
+            'request_id': request_id,
+            'status': result.status.value,
+            'message': f'Processing pipeline of {len(steps)} steps started asynchronously'
+        }
+
+    @staticmethod
+    def _resolve_step_ref(value: Any, outputs: list) -> Any:
+        """Replace a '$stepN.KEY' / '$prev.KEY' reference with an earlier output"""
+        if isinstance(value, list):
+            return [OptimizedQGISMCPServer._resolve_step_ref(v, outputs) for v in value]
+        if not isinstance(value, str) or not value.startswith('$'):
+            return value
+
+        ref, _, key = value[1:].partition('.')
+        if ref == 'prev':
+            index = len(outputs) - 1
+        elif ref.startswith('step') and ref[4:].isdigit():
+            index = int(ref[4:]) - 1
+        else:
+            return value
+
+        if not 0 <= index < len(outputs) or key not in outputs[index]:
+            raise ValueError(f"Unresolved pipeline reference: {value}")
+        return outputs[index][key]
+
+    @staticmethod
+    def _serialize_processing_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a processing result to a serializable dict (layers become IDs)"""
+        return {
+            key: value if isinstance(value, _PRIMITIVE_TYPES) else _serialize_output(value)
+            for key, value in result.items()
+        }
+
+    def _handle_get_features_async(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
+        """
+        Get features asynchronously for large queries
+
+        With 'stream': true the features are not returned in the final result;
+        each batch of 'batch_size' features is published as soon as it is read
+        and collected with fetch_partial_results while the query continues.
+        """
         data = message.get('data', {})
         request_id = data.get('request_id', str(uuid.uuid4()))
         timeout = data.get('timeout', 300)
@@ -390,6 +837,21 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
             if _progress_callback:
                 _progress_callback(10, "Starting feature query...")
 
+            if query_params.pop('stream', False) and _progress_callback:
+                limit = max(int(query_params.get('limit', 100)), 1)
+                streamed = 0
+
+                def on_batch(batch):
+                    nonlocal streamed
+                    streamed += len(batch)
+                    _progress_callback(
+                        min(10 + streamed * 89 // limit, 99),
+                        f"Streamed {streamed} features",
+                        partial=batch
+                    )
+
+                query_params['on_batch'] = on_batch
+
             result = self.feature_access.get_features_optimized(**query_params)
 
             if _progress_callback:
@@ -414,9 +876,6 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
 
     def _handle_check_async_status(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
         """Check status of async operation"""
-        if not self.enable_async:
-            raise RuntimeError("Async operations not enabled")
-
         data = message.get('data', {})
         request_id = data.get('request_id')
 
@@ -430,11 +889,64 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
 
         return status
 
+    def _handle_check_async_status_batch(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
+        """Check status of several async operations in one round-trip"""
+        data = message.get('data', {})
+        request_ids = data.get('request_ids')
+
+        if not request_ids or not isinstance(request_ids, list):
+            raise ValueError("request_ids must be a non-empty list")
+
+        wait = min(max(float(data.get('wait', 0)), 0.0), self.MAX_WAIT_SECONDS)
+
+        return {
+            'operations': self.async_manager.get_status_batch(request_ids, wait=wait)
+        }
+
+    def _handle_wait_async_operation(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
+        """Long-poll an async operation until it completes or reports new progress"""
+        data = message.get('data', {})
+        request_id = data.get('request_id')
+
+        if not request_id:
+            raise ValueError("request_id is required")
+
+        # Keep the wait well below the client's request timeout
+        timeout = min(max(float(data.get('timeout', self.MAX_WAIT_SECONDS)), 0.0),
+                      self.MAX_WAIT_SECONDS)
+
+        status = self.async_manager.wait_for_change(
+            request_id,
+            last_progress=int(data.get('last_progress', -1)),
+            timeout=timeout,
+            min_delta=int(data.get('min_delta', 5))
+        )
+
+        if not status:
+            raise ValueError(f"Operation not found: {request_id}")
+
+        return status
+
+    def _handle_fetch_partial_results(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
+        """Long-poll the results an async operation streamed after 'start'"""
+        data = message.get('data', {})
+        request_id = data.get('request_id')
+
+        if not request_id:
+            raise ValueError("request_id is required")
+
+        start = max(int(data.get('start', 0)), 0)
+        wait = min(max(float(data.get('wait', 0)), 0.0), self.MAX_WAIT_SECONDS)
+
+        partials = self.async_manager.get_partial_results(request_id, start=start, wait=wait)
+
+        if partials is None:
+            raise ValueError(f"Operation not found: {request_id}")
+
+        return partials
+
     def _handle_cancel_async_operation(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
         """Cancel async operation"""
-        if not self.enable_async:
-            raise RuntimeError("Async operations not enabled")
-
         data = message.get('data', {})
         request_id = data.get('request_id')
 
@@ -451,9 +963,6 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
 
     def _handle_list_async_operations(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
         """List all async operations"""
-        if not self.enable_async:
-            raise RuntimeError("Async operations not enabled")
-
         operations = self.async_manager.list_operations()
 
         return {
@@ -470,12 +979,7 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
         self.geometry_cache.clear()
         self.feature_access.clear_cache()
 
-        if HAS_QGIS:
-            QgsMessageLog.logMessage(
-                "All caches cleared",
-                "QGIS MCP Optimized",
-                Qgis.Info
-            )
+        self._log("All caches cleared", 'Info')
 
         return {
             'cleared': True,
@@ -492,25 +996,207 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
             raise ValueError("layer_id is required")
 
         # Clear all cache entries for this layer
-        # This is a simple implementation - could be optimized with layer-based indexing
-        cleared = 0
-        for key in list(self.geometry_cache.cache.cache.keys()):
-            if key.startswith(f"{layer_id}_"):
-                del self.geometry_cache.cache.cache[key]
-                cleared += 1
+        cleared = self.geometry_cache.invalidate_layer(layer_id)
 
-        if HAS_QGIS:
-            QgsMessageLog.logMessage(
-                f"Invalidated {cleared} cache entries for layer {layer_id}",
-                "QGIS MCP Optimized",
-                Qgis.Info
-            )
+        self._log(f"Invalidated {cleared} cache entries for layer {layer_id}", 'Info')
 
         return {
             'layer_id': layer_id,
             'cleared_entries': cleared
         }
 
+    # ==================== Connection Handling ====================
+
+    def start(self) -> None:
+        """
+        Start the server
+
+        All client sockets are multiplexed on one asyncio event loop, run in
+        the calling thread, instead of one thread per client. Command
+        handlers block on QGIS, so they run on a shared thread pool.
+        """
+        if self.running:
+            raise RuntimeError("Server is already running")
+
+        self._loop = asyncio.new_event_loop()
+        # Each connection has at most one request in flight, so one worker per
+        # allowed connection means long-polls never starve other clients
+        self._dispatch_pool = ThreadPoolExecutor(
+            max_workers=self.MAX_CONNECTIONS,
+            thread_name_prefix="qgis-mcp-dispatch"
+        )
+        self.running = True
+        self._start_time = time.monotonic()
+
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            self.stop()
+            self._loop.close()
+
+    async def _serve(self) -> None:
+        """Accept clients until stop() is called"""
+        self._stop_event = asyncio.Event()
+        if not self.running:
+            return  # stop() came first
+
+        ssl_context = None
+        if self.use_tls and self.tls_handler:
+            ssl_context = self.tls_handler.create_server_context()
+
+        # Owned by the asyncio server, not stored as server_socket (which
+        # stop() would close from another thread)
+        listen_sock = self._create_server_socket()
+        if self.socket_path is not None:
+            server = await asyncio.start_unix_server(
+                self._client_coro, sock=listen_sock, backlog=self.MAX_CONNECTIONS
+            )
+        else:
+            server = await asyncio.start_server(
+                self._client_coro, sock=listen_sock, ssl=ssl_context,
+                backlog=self.MAX_CONNECTIONS
+            )
+
+        self._log(f"Optimized server listening on {self._address()}", 'Success')
+
+        try:
+            await self._stop_event.wait()
+        finally:
+            server.close()
+            for task in list(self._client_tasks):
+                task.cancel()
+            await asyncio.gather(*self._client_tasks, return_exceptions=True)
+            await server.wait_closed()
+
+    def _request_stop(self) -> None:
+        """Wake _serve(); runs on the event loop"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def _client_coro(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one client connection"""
+        sock = writer.get_extra_info('socket')
+        if self.socket_path is not None:
+            # Unix domain peers are unnamed; the descriptor identifies them
+            client_id = f"unix:{sock.fileno() if sock is not None else 'unknown'}"
+        else:
+            peer = writer.get_extra_info('peername') or ('unknown', 0)
+            client_id = f"{peer[0]}:{peer[1]}"
+
+        # Check connection limit; coroutines share one thread, so no lock
+        if self.active_connections >= self.MAX_CONNECTIONS:
+            self._log(f"Connection limit reached, rejecting {client_id}", 'Warning')
+            writer.close()
+            return
+        self.active_connections += 1
+        self.total_connections += 1
+
+        if sock is not None:
+            self._configure_client_socket(sock)
+
+        task = asyncio.current_task()
+        self._client_tasks.add(task)
+        authenticated = not self.require_auth  # If auth not required, start authenticated
+        protocol = self.protocol
+        loop = asyncio.get_running_loop()
+
+        if self._log_connections:
+            self._log(f"Client connected: {client_id}", 'Info')
+
+        try:
+            while self.running:
+                # Read one length-prefixed frame
+                try:
+                    header = await asyncio.wait_for(
+                        reader.readexactly(protocol.HEADER_SIZE), self.CLIENT_TIMEOUT
+                    )
+                    message_len = struct.unpack(protocol.MESSAGE_HEADER_FORMAT, header)[0]
+
+                    if message_len > self.MAX_BUFFER_SIZE:
+                        self._log(
+                            f"Buffer overflow from {client_id} - closing connection",
+                            'Critical'
+                        )
+                        await self._send_error_async(writer, "1", "Request too large")
+                        break
+
+                    payload = await asyncio.wait_for(
+                        reader.readexactly(message_len), self.CLIENT_TIMEOUT
+                    )
+                except asyncio.TimeoutError:
+                    if self._log_connections:
+                        self._log(f"Client timeout: {client_id}", 'Info')
+                    break
+                except asyncio.IncompleteReadError:
+                    break  # Client disconnected
+
+                try:
+                    if message_len == 0:
+                        raise ProtocolException("Received message with zero length")
+                    message = protocol.deserialize(payload)
+                    protocol.validate_message(message)
+
+                    # Handlers block on QGIS; keep them off the event loop
+                    self.requests_in_flight += 1
+                    try:
+                        response = await loop.run_in_executor(
+                            self._dispatch_pool,
+                            self._process_message,
+                            message,
+                            client_id,
+                            authenticated
+                        )
+                    finally:
+                        self.requests_in_flight -= 1
+
+                    # Update authentication status
+                    if message.get('type') == 'authenticate' and response.get('success'):
+                        authenticated = True
+
+                    # Send response; built here, so no schema check needed
+                    writer.writelines(protocol.encode_frame(response, validated=True))
+                    await writer.drain()
+
+                except ProtocolException as e:
+                    self._log(f"Protocol error from {client_id}: {type(e).__name__}", 'Warning')
+                    await self._send_error_async(writer, "0", "Invalid request format")
+                    break
+
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            self._log(f"Unexpected error handling {client_id}: {type(e).__name__}", 'Critical')
+        finally:
+            self._client_tasks.discard(task)
+            writer.close()
+            self.active_connections -= 1
+
+            if self._log_connections:
+                self._log(f"Client disconnected: {client_id}", 'Info')
+
+    async def _send_error_async(
+        self,
+        writer: asyncio.StreamWriter,
+        msg_id: str,
+        error: str
+    ) -> None:
+        """Send error response"""
+        try:
+            response = {
+                'type': 'response',
+                'id': msg_id,
+                'success': False,
+                'error': error
+            }
+            writer.writelines(self.protocol.encode_frame(response, validated=True))
+            await writer.drain()
+        except Exception:
+            pass
+
     # ==================== Cleanup ====================
 
     def stop(self) -> None:
@@ -518,23 +1204,46 @@ class OptimizedQGISMCPServer(SecureQGISMCPServer):
         # Cancel all async operations
         if self.enable_async:
             cancelled = self.async_manager.cancel_all()
-            if HAS_QGIS and cancelled > 0:
-                QgsMessageLog.logMessage(
-                    f"Cancelled {cancelled} async operations on shutdown",
-                    "QGIS MCP Optimized",
-                    Qgis.Warning
-                )
+            if cancelled > 0:
+                self._log(f"Cancelled {cancelled} async operations on shutdown", 'Warning')
+            # Its worker pool, event loop and watchdog go with the server; the
+            # next server gets a fresh manager
+            shutdown_async_manager()
 
         # Call parent stop
         super().stop()
 
+        # Wake the event loop so start() returns
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._request_stop)
+            except RuntimeError:
+                pass  # Loop closed meanwhile
+        self._prefetch_pool.shutdown(wait=False, cancel_futures=True)
+
+        if HAS_QGIS:
+            try:
+                QgsProject.instance().layersWillBeRemoved.disconnect(self._clear_layer_list_cache)
+            except (TypeError, RuntimeError):
+                pass  # Already disconnected
+        self._clear_layer_list_cache()
+
+        # Downloads cannot outlive the server
+        with self._render_lock:
+            render_dir, self._render_dir = self._render_dir, None
+            self._render_artifacts.clear()
+        if render_dir:
+            shutil.rmtree(render_dir, ignore_errors=True)
+
 
 def start_optimized_server(
     port: int = 9876,
     use_tls: bool = False,
     require_auth: bool = True,
     enable_async: bool = True,
-    cache_size: int = 1000
+    cache_size: int = 1000,
+    socket_path: Optional[str] = None
 ) -> OptimizedQGISMCPServer:
     """
     Start optimized QGIS MCP server
@@ -545,6 +1254,7 @@ def start_optimized_server(
         require_auth: Require authentication
         enable_async: Enable async operations
         cache_size: Geometry cache size
+        socket_path: Listen on this Unix domain socket instead of TCP
 
     Returns:
         Running optimized server instance
@@ -557,7 +1267,8 @@ def start_optimized_server(
         use_tls=use_tls,
         require_auth=require_auth,
         enable_async=enable_async,
-        cache_size=cache_size
+        cache_size=cache_size,
+        socket_path=socket_path
     )
 
     # Start in background thread
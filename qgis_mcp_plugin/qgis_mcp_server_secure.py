@@ -14,12 +14,21 @@ Features:
 - Thread-safe operation
 """
 
+import logging
+import os
+import selectors
 import socket
+import ssl
+import stat
 import threading
 import time
 import traceback
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Set, Tuple
 from datetime import datetime
 
 try:
@@ -39,7 +48,44 @@ from .security_improved import (
 )
 from .protocol import BufferedProtocolHandler, ProtocolException
 from .tls_handler import TLSHandler
-from .optimization import OptimizedFeatureAccess, PaginatedLayerAccess, PerformanceMonitor
+from .optimization import (
+    OptimizedFeatureAccess,
+    PaginatedLayerAccess,
+    PerformanceMonitor,
+    serialize_attribute_value
+)
+
+# Per-connection events (connect, disconnect, idle timeout) are logged only
+# at this level or below; same variable as the async executor's log gate
+_LOG_CONNECTIONS = getattr(
+    logging, os.environ.get("QGIS_MCP_LOG_LEVEL", "WARNING").upper(), logging.WARNING
+) <= logging.INFO
+
+
+class _ClientConnection:
+    """Per-client state for the selector loop"""
+
+    __slots__ = (
+        "sock", "fd", "client_id", "protocol", "authenticated", "handshaking",
+        "busy", "closing", "closed", "events", "out", "vectored", "last_active"
+    )
+
+    def __init__(self, sock: socket.socket, client_id: str,
+                 authenticated: bool, handshaking: bool = False):
+        self.sock = sock
+        self.fd = sock.fileno()
+        self.client_id = client_id
+        self.protocol = BufferedProtocolHandler(use_msgpack=True, validate_schema=True)
+        self.authenticated = authenticated
+        self.handshaking = handshaking
+        self.busy = False  # A request is being processed by a worker
+        self.closing = False  # Close once the queued output is sent
+        self.closed = False
+        self.events = selectors.EVENT_READ  # Registered selector interest
+        self.out: deque = deque()  # Queued frame parts (bytes or memoryview)
+        # TLS sockets cannot scatter-gather; plain ones send parts in one call
+        self.vectored = hasattr(sock, 'sendmsg') and not isinstance(sock, ssl.SSLSocket)
+        self.last_active = time.monotonic()
 
 
 class SecureQGISMCPServer:
@@ -58,8 +104,26 @@ class SecureQGISMCPServer:
     - Generic error messages (no info disclosure)
     """
 
+    LOG_CATEGORY = "QGIS MCP Secure"
     MAX_BUFFER_SIZE = 10 * 1024 * 1024  # 10MB
+    # Constant part of every ping response; only the timestamp is filled in
+    _PING_TEMPLATE = {'pong': True, 'timestamp': '', 'server_version': '2.0.0-secure'}
+    # Rate limiting category per message type; anything else is 'normal'
+    OPERATION_TYPES: Dict[str, str] = {
+        'authenticate': 'authentication',
+        'execute_code': 'expensive',
+        'load_layer': 'expensive',
+        'ping': 'cheap',
+        'get_stats': 'cheap',
+    }
     MAX_CONNECTIONS = 10  # Limit concurrent connections
+    CLIENT_TIMEOUT = 60.0  # Idle seconds before a client is disconnected
+    RECV_SIZE = 65536  # Bytes read per readiness event
+    MAX_IOV = 64  # Frame parts handed to one sendmsg call, well under IOV_MAX
+    # Unsent bytes the kernel may queue per client before the socket stops
+    # reporting writable; buffer sizes themselves are left to autotuning
+    NOTSENT_LOWAT = 64 * 1024
+    MAX_LOGGED_FAILURES = 64  # Distinct (command, exception) tracebacks remembered
 
     def __init__(
         self,
@@ -67,7 +131,9 @@ class SecureQGISMCPServer:
         port: int = 9876,
         use_tls: bool = False,
         require_auth: bool = True,
-        allowed_directories: Optional[list] = None
+        allowed_directories: Optional[list] = None,
+        tcp_nodelay: bool = True,
+        socket_path: Optional[str] = None
     ):
         """
         Initialize secure QGIS MCP server
@@ -78,9 +144,15 @@ class SecureQGISMCPServer:
             use_tls: Enable TLS/SSL encryption
             require_auth: Require authentication (strongly recommended)
             allowed_directories: List of allowed directories for file operations
+            tcp_nodelay: Disable Nagle's algorithm on client sockets, so small
+                responses are not held back waiting for an ACK
+            socket_path: Listen on this Unix domain socket (owner-only, mode
+                0600) instead of TCP; skips the TCP/IP stack entirely. TLS is
+                not used on it since the traffic never leaves the kernel
 
         Raises:
             SecurityException: If attempting to bind to non-localhost address
+            ValueError: If socket_path is given on a platform without AF_UNIX
         """
         # SECURITY: Force localhost-only binding
         if host not in ('127.0.0.1', 'localhost', '::1'):
@@ -91,8 +163,14 @@ class SecureQGISMCPServer:
 
         self.host = '127.0.0.1'  # Always force IPv4 localhost
         self.port = port
+        if socket_path is not None and not hasattr(socket, 'AF_UNIX'):
+            raise ValueError("Unix domain sockets are not supported on this platform")
+        self.socket_path = socket_path
+        use_tls = use_tls and socket_path is None
         self.use_tls = use_tls
         self.require_auth = require_auth
+        self.tcp_nodelay = tcp_nodelay
+        self._log_connections = HAS_QGIS and _LOG_CONNECTIONS
 
         # Security components
         self.auth_manager = AuthenticationManager()
@@ -107,121 +185,156 @@ class SecureQGISMCPServer:
         self.tls_handler = TLSHandler() if use_tls else None
 
         # Performance optimization
-        self.feature_access = OptimizedFeatureAccess()
+        self.feature_access = OptimizedFeatureAccess(binary_wkb=self.protocol.use_msgpack)
         self.perf_monitor = PerformanceMonitor()
 
         # Server state
         self.server_socket: Optional[socket.socket] = None
         self.running = False
-        self.client_threads: list = []
         self.active_connections = 0
-        self._conn_lock = threading.Lock()
+        self.total_connections = 0
+        self.requests_in_flight = 0
+        # (command, exception type) pairs whose traceback was already logged
+        self._logged_failures: Set[Tuple[str, str]] = set()
+        self._start_time: Optional[float] = None  # time.monotonic() when start() began serving
+
+        # Selector loop state; only touched by the thread running start()
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._clients: Dict[int, _ClientConnection] = {}
+        self._recv_view: Optional[memoryview] = None
+        self._dispatch_pool: Optional[ThreadPoolExecutor] = None
+        # Finished requests handed from workers to the loop, plus its wakeup pipe
+        self._dispatched: deque = deque()
+        self._wakeup_recv: Optional[socket.socket] = None
+        self._wakeup_send: Optional[socket.socket] = None
+
+        # Bumped whenever project layers change; sent with every response so
+        # clients know when cached layer listings are stale
+        self.layer_epoch = 0
+        if HAS_QGIS:
+            QgsProject.instance().layersAdded.connect(self._bump_layer_epoch)
+            QgsProject.instance().layersRemoved.connect(self._bump_layer_epoch)
 
         # Command handlers
         self.command_handlers: Dict[str, Callable] = {
             'authenticate': self._handle_authenticate,
             'list_layers': self._handle_list_layers,
             'get_features': self._handle_get_features,
+            'aggregate': self._handle_aggregate,
             'load_layer': self._handle_load_layer,
             'execute_code': self._handle_execute_code,
             'get_stats': self._handle_get_stats,
             'ping': self._handle_ping,
         }
 
-        if HAS_QGIS:
-            QgsMessageLog.logMessage(
-                f"Secure QGIS MCP Server initialized on {self.host}:{self.port}",
-                "QGIS MCP Secure",
-                Qgis.Info
-            )
+        self._log(f"Secure QGIS MCP Server initialized on {self.host}:{self.port}", 'Info')
+        if self.require_auth:
+            self._log(f"Authentication token: {self.auth_manager.api_token}", 'Info')
 
-            if self.require_auth:
-                token = self.auth_manager.api_token
-                QgsMessageLog.logMessage(
-                    f"Authentication token: {token}",
-                    "QGIS MCP Secure",
-                    Qgis.Info
-                )
+    def _log(self, message: str, level: str) -> None:
+        """Write to the QGIS message log; level names a Qgis.MessageLevel"""
+        if HAS_QGIS:
+            QgsMessageLog.logMessage(message, self.LOG_CATEGORY, getattr(Qgis, level))
 
     def start(self) -> None:
-        """Start the secure server"""
+        """
+        Start the secure server
+
+        All sockets are served from one selector loop in the calling thread
+        (epoll/kqueue where available) instead of one thread per client.
+        Handlers block on QGIS, so each request runs on a worker pool and
+        its response is handed back to the loop.
+        """
         if self.running:
             raise RuntimeError("Server is already running")
 
-        # Create server socket
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-
-        # Bind to localhost only
-        self.server_socket.bind((self.host, self.port))
-        self.server_socket.listen(self.MAX_CONNECTIONS)
+        ssl_context = None
+        if self.use_tls and self.tls_handler:
+            ssl_context = self.tls_handler.create_server_context()
+
+        self.server_socket = self._create_server_socket()
+        self.server_socket.setblocking(False)
+
+        self._recv_view = memoryview(bytearray(self.RECV_SIZE))
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.server_socket, selectors.EVENT_READ)
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self._wakeup_send.setblocking(False)
+        self._selector.register(self._wakeup_recv, selectors.EVENT_READ)
+
+        # Each connection has at most one request in flight, so one worker per
+        # allowed connection means long-polls never starve other clients
+        self._dispatch_pool = ThreadPoolExecutor(
+            max_workers=self.MAX_CONNECTIONS,
+            thread_name_prefix="qgis-mcp-dispatch"
+        )
 
         self.running = True
+        self._start_time = time.monotonic()
 
-        if HAS_QGIS:
-            QgsMessageLog.logMessage(
-                f"Secure server listening on {self.host}:{self.port}",
-                "QGIS MCP Secure",
-                Qgis.Success
-            )
+        self._log(f"Secure server listening on {self._address()}", 'Success')
 
-        # Accept connections in main thread
         try:
+            # Sleep until I/O, a wakeup from a worker or stop(), or the next
+            # idle-client deadline; with no clients the loop never polls
+            timeout = None
             while self.running:
-                self.server_socket.settimeout(1.0)  # Allow checking self.running
-
-                try:
-                    client_socket, client_addr = self.server_socket.accept()
-
-                    # Check connection limit
-                    with self._conn_lock:
-                        if self.active_connections >= self.MAX_CONNECTIONS:
-                            if HAS_QGIS:
-                                QgsMessageLog.logMessage(
-                                    f"Connection limit reached, rejecting {client_addr}",
-                                    "QGIS MCP Secure",
-                                    Qgis.Warning
-                                )
-                            client_socket.close()
-                            continue
-
-                        self.active_connections += 1
-
-                    # Wrap with TLS if enabled
-                    if self.use_tls and self.tls_handler:
-                        try:
-                            client_socket = self.tls_handler.wrap_socket(
-                                client_socket,
-                                server_side=True
-                            )
-                        except Exception as e:
-                            if HAS_QGIS:
-                                QgsMessageLog.logMessage(
-                                    f"TLS handshake failed: {type(e).__name__}",
-                                    "QGIS MCP Secure",
-                                    Qgis.Critical
-                                )
-                            client_socket.close()
-                            with self._conn_lock:
-                                self.active_connections -= 1
-                            continue
-
-                    # Handle client in new thread
-                    client_thread = threading.Thread(
-                        target=self._handle_client,
-                        args=(client_socket, client_addr),
-                        daemon=True
-                    )
-                    client_thread.start()
-                    self.client_threads.append(client_thread)
-
-                except socket.timeout:
-                    continue
-                except OSError:
-                    break
-
+                for key, mask in self._selector.select(timeout):
+                    if key.fileobj is self.server_socket:
+                        self._accept_clients(ssl_context)
+                    elif key.fileobj is self._wakeup_recv:
+                        self._drain_wakeups()
+                    else:
+                        self._service_client(key.data, mask)
+
+                self._finish_dispatched()
+                timeout = self._close_idle_clients()
+        except OSError:
+            pass  # Listening socket closed by stop()
         finally:
             self.stop()
+            for conn in list(self._clients.values()):
+                self._close_client(conn)
+            self._selector.close()
+            self._wakeup_recv.close()
+            self._wakeup_send.close()
+
+    def _address(self) -> str:
+        """Where the server listens, for log messages"""
+        return self.socket_path or f"{self.host}:{self.port}"
+
+    def _create_server_socket(self) -> socket.socket:
+        """Create the bound, listening server socket (TCP or Unix domain)"""
+        if self.socket_path is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+            # Bind to localhost only
+            sock.bind((self.host, self.port))
+            sock.listen(self.MAX_CONNECTIONS)
+            return sock
+
+        self._remove_socket_file()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(self.socket_path)
+            os.chmod(self.socket_path, 0o600)
+            sock.listen(self.MAX_CONNECTIONS)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _remove_socket_file(self) -> None:
+        """Remove a stale Unix socket file, refusing to delete anything else"""
+        try:
+            mode = os.lstat(self.socket_path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise SecurityException(f"Refusing to replace non-socket file: {self.socket_path}")
+        os.unlink(self.socket_path)
 
     def stop(self) -> None:
         """Stop the server gracefully"""
@@ -230,126 +343,341 @@ class SecureQGISMCPServer:
 
         self.running = False
 
+        if HAS_QGIS:
+            try:
+                QgsProject.instance().layersAdded.disconnect(self._bump_layer_epoch)
+                QgsProject.instance().layersRemoved.disconnect(self._bump_layer_epoch)
+            except TypeError:
+                pass  # Already disconnected
+
+        # Let the loop see running=False now instead of at its next timeout
+        self._wakeup()
+
         if self.server_socket:
             try:
                 self.server_socket.close()
             except:
                 pass
 
-        # Wait for client threads to finish (with timeout)
-        for thread in self.client_threads:
-            thread.join(timeout=2.0)
+        if self.socket_path is not None:
+            try:
+                self._remove_socket_file()
+            except (OSError, SecurityException):
+                pass
 
-        if HAS_QGIS:
-            QgsMessageLog.logMessage(
-                "Secure server stopped",
-                "QGIS MCP Secure",
-                Qgis.Info
-            )
+        if self._dispatch_pool is not None:
+            self._dispatch_pool.shutdown(wait=False, cancel_futures=True)
 
-    def _handle_client(self, client_socket: socket.socket, client_addr: tuple) -> None:
-        """
-        Handle individual client connection
+        self._log("Secure server stopped", 'Info')
 
-        Args:
-            client_socket: Client socket
-            client_addr: Client address (IP, port)
-        """
-        client_id = f"{client_addr[0]}:{client_addr[1]}"
-        protocol_handler = BufferedProtocolHandler(use_msgpack=True, validate_schema=True)
-        authenticated = not self.require_auth  # If auth not required, start authenticated
+    def _wakeup(self) -> None:
+        """Interrupt select() from another thread"""
+        try:
+            self._wakeup_send.send(b'\0')
+        except (AttributeError, OSError):
+            pass  # Loop not started, already closed, or already woken
 
-        if HAS_QGIS:
-            QgsMessageLog.logMessage(
-                f"Client connected: {client_id}",
-                "QGIS MCP Secure",
-                Qgis.Info
+    def _drain_wakeups(self) -> None:
+        try:
+            while self._wakeup_recv.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _accept_clients(self, ssl_context: Optional[ssl.SSLContext]) -> None:
+        """Accept every pending connection"""
+        while True:
+            try:
+                client_socket, client_addr = self.server_socket.accept()
+            except BlockingIOError:
+                return
+
+            # Check connection limit
+            if self.active_connections >= self.MAX_CONNECTIONS:
+                self._log(f"Connection limit reached, rejecting {client_addr}", 'Warning')
+                client_socket.close()
+                continue
+
+            client_socket.setblocking(False)
+            self._configure_client_socket(client_socket)
+            handshaking = False
+
+            # Wrap with TLS if enabled; the handshake runs from the loop too
+            if ssl_context is not None:
+                try:
+                    client_socket = ssl_context.wrap_socket(
+                        client_socket,
+                        server_side=True,
+                        do_handshake_on_connect=False
+                    )
+                except (ssl.SSLError, OSError) as e:
+                    self._log(f"TLS handshake failed: {type(e).__name__}", 'Critical')
+                    client_socket.close()
+                    continue
+                handshaking = True
+
+            # Unix domain peers are unnamed; the descriptor identifies them
+            if client_socket.family in (socket.AF_INET, socket.AF_INET6):
+                client_id = f"{client_addr[0]}:{client_addr[1]}"
+            else:
+                client_id = f"unix:{client_socket.fileno()}"
+
+            conn = _ClientConnection(
+                client_socket,
+                client_id,
+                authenticated=not self.require_auth,  # If auth not required, start authenticated
+                handshaking=handshaking
             )
+            self._clients[client_socket.fileno()] = conn
+            self.active_connections += 1
+            self.total_connections += 1
+            self._selector.register(client_socket, selectors.EVENT_READ, conn)
 
+            if self._log_connections:
+                self._log(f"Client connected: {conn.client_id}", 'Info')
+
+    def _configure_client_socket(self, sock: socket.socket) -> None:
+        """Apply TCP options to an accepted socket, before any TLS wrap"""
+        if sock.family not in (socket.AF_INET, socket.AF_INET6):
+            return  # Unix domain socket
+
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(self.tcp_nodelay))
+
+        # Keeps a large response from parking megabytes in the kernel ahead
+        # of later replies (Linux and macOS)
+        notsent_lowat = getattr(socket, 'TCP_NOTSENT_LOWAT', None)
+        if notsent_lowat is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, notsent_lowat, self.NOTSENT_LOWAT)
+            except OSError:
+                pass  # Not supported by this kernel
+
+    def _service_client(self, conn: '_ClientConnection', mask: int) -> None:
+        """Handle readiness of a client socket"""
+        if conn.handshaking:
+            self._continue_handshake(conn)
+            return
+
+        if mask & selectors.EVENT_WRITE:
+            self._flush_client(conn)
+        if mask & selectors.EVENT_READ and not conn.closed:
+            self._read_client(conn)
+
+    def _continue_handshake(self, conn: '_ClientConnection') -> None:
         try:
-            client_socket.settimeout(60.0)  # 60 second timeout
+            conn.sock.do_handshake()
+        except ssl.SSLWantReadError:
+            self._set_interest(conn, selectors.EVENT_READ)
+            return
+        except ssl.SSLWantWriteError:
+            self._set_interest(conn, selectors.EVENT_WRITE)
+            return
+        except (ssl.SSLError, OSError) as e:
+            self._log(f"TLS handshake failed: {type(e).__name__}", 'Critical')
+            self._close_client(conn)
+            return
 
-            while self.running:
-                # Receive data
-                try:
-                    data = client_socket.recv(8192)
-                    if not data:
-                        break
+        conn.handshaking = False
+        conn.last_active = time.monotonic()
+        self._update_interest(conn)
 
-                    # Feed to protocol handler
-                    protocol_handler.feed_data(data)
-
-                    # Check buffer size
-                    if protocol_handler.get_buffer_size() > self.MAX_BUFFER_SIZE:
-                        if HAS_QGIS:
-                            QgsMessageLog.logMessage(
-                                f"Buffer overflow from {client_id} - closing connection",
-                                "QGIS MCP Secure",
-                                Qgis.Critical
-                            )
-                        self._send_error(client_socket, "1", "Request too large")
-                        break
+    def _read_client(self, conn: '_ClientConnection') -> None:
+        """Read what the socket has and dispatch the next complete request"""
+        sock = conn.sock
+        # One buffer serves every client: the loop handles one socket at a
+        # time and feed_data copies the bytes out before the next read
+        view = self._recv_view
+        try:
+            received = sock.recv_into(view)
+            if not received:
+                self._close_client(conn)  # Client disconnected
+                return
+
+            conn.protocol.feed_data(view[:received])
+
+            # TLS may hold decrypted bytes that select() cannot see
+            pending = getattr(sock, 'pending', None)
+            while pending and pending():
+                received = sock.recv_into(view)
+                conn.protocol.feed_data(view[:received])
+        except (BlockingIOError, ssl.SSLWantReadError, ssl.SSLWantWriteError):
+            return
+        except ProtocolException:
+            self._log(f"Buffer overflow from {conn.client_id} - closing connection", 'Critical')
+            self._fail_client(conn, "1", "Request too large")
+            return
+        except OSError:
+            self._close_client(conn)
+            return
 
-                    # Try to read complete messages
-                    while True:
-                        try:
-                            message = protocol_handler.try_read_message()
-                            if not message:
-                                break
-
-                            # Process message
-                            response = self._process_message(
-                                message,
-                                client_id,
-                                authenticated
-                            )
-
-                            # Update authentication status
-                            if message.get('type') == 'authenticate' and response.get('success'):
-                                authenticated = True
-
-                            # Send response
-                            self.protocol.send_message(client_socket, response)
-
-                        except ProtocolException as e:
-                            if HAS_QGIS:
-                                QgsMessageLog.logMessage(
-                                    f"Protocol error from {client_id}: {type(e).__name__}",
-                                    "QGIS MCP Secure",
-                                    Qgis.Warning
-                                )
-                            self._send_error(client_socket, "0", "Invalid request format")
-                            break
-
-                except socket.timeout:
-                    if HAS_QGIS:
-                        QgsMessageLog.logMessage(
-                            f"Client timeout: {client_id}",
-                            "QGIS MCP Secure",
-                            Qgis.Info
-                        )
-                    break
-                except socket.error:
-                    break
+        conn.last_active = time.monotonic()
+        self._dispatch_next(conn)
 
-        except Exception as e:
-            if HAS_QGIS:
-                QgsMessageLog.logMessage(
-                    f"Unexpected error handling {client_id}: {type(e).__name__}",
-                    "QGIS MCP Secure",
-                    Qgis.Critical
+    def _dispatch_next(self, conn: '_ClientConnection') -> None:
+        """Hand the next buffered request to the worker pool"""
+        if conn.busy or conn.closed or conn.closing:
+            return
+
+        try:
+            message = conn.protocol.try_read_message()
+        except ProtocolException as e:
+            self._log(f"Protocol error from {conn.client_id}: {type(e).__name__}", 'Warning')
+            self._fail_client(conn, "0", "Invalid request format")
+            return
+
+        if message is not None:
+            try:
+                future = self._dispatch_pool.submit(
+                    self._process_message, message, conn.client_id, conn.authenticated
                 )
-        finally:
-            client_socket.close()
-            with self._conn_lock:
-                self.active_connections -= 1
-
-            if HAS_QGIS:
-                QgsMessageLog.logMessage(
-                    f"Client disconnected: {client_id}",
-                    "QGIS MCP Secure",
-                    Qgis.Info
+            except RuntimeError:
+                return  # Pool shut down by stop()
+            conn.busy = True
+            self.requests_in_flight += 1
+            future.add_done_callback(partial(self._on_dispatched, conn, message))
+
+        self._update_interest(conn)
+
+    def _on_dispatched(self, conn: '_ClientConnection', message: Dict[str, Any], future: Future) -> None:
+        """Queue a finished request for the loop; runs on a worker thread"""
+        self._dispatched.append((conn, message, future))
+        self._wakeup()
+
+    def _finish_dispatched(self) -> None:
+        """Send the responses of finished requests"""
+        while self._dispatched:
+            conn, message, future = self._dispatched.popleft()
+            conn.busy = False
+            self.requests_in_flight -= 1
+            if conn.closed or future.cancelled():
+                continue
+
+            # A response that cannot be encoded (unserializable value, over
+            # MAX_MESSAGE_SIZE) fails its own client, never the loop
+            try:
+                response = future.result()
+                # Built here, so no schema check needed
+                frame = self.protocol.encode_frame(response, validated=True)
+            except Exception as e:
+                self._log(
+                    f"Cannot send {message.get('type', 'unknown')} response to "
+                    f"{conn.client_id}: {type(e).__name__}",
+                    'Critical'
                 )
+                self._fail_client(conn, message.get('id', '0'), 'Internal server error')
+                continue
+
+            # Update authentication status
+            if message.get('type') == 'authenticate' and response.get('success'):
+                conn.authenticated = True
+
+            conn.out.extend(frame)
+            conn.last_active = time.monotonic()
+            self._flush_client(conn)
+            self._dispatch_next(conn)
+
+    def _flush_client(self, conn: '_ClientConnection') -> None:
+        """Write as much pending output as the socket takes"""
+        out = conn.out
+        try:
+            while out:
+                if conn.vectored:
+                    sent = conn.sock.sendmsg(list(islice(out, self.MAX_IOV)))
+                else:
+                    sent = conn.sock.send(out[0])
+                # A client draining a large response is not idle
+                conn.last_active = time.monotonic()
+                # Drop the parts written, keeping the unsent tail of a partial one
+                while sent:
+                    head = out[0]
+                    if sent < len(head):
+                        out[0] = memoryview(head)[sent:]
+                        break
+                    sent -= len(head)
+                    out.popleft()
+        except (BlockingIOError, ssl.SSLWantReadError, ssl.SSLWantWriteError):
+            pass
+        except OSError:
+            self._close_client(conn)
+            return
+
+        if conn.closing and not conn.out:
+            self._close_client(conn)
+        else:
+            self._update_interest(conn)
+
+    def _fail_client(self, conn: '_ClientConnection', msg_id: str, error: str) -> None:
+        """Send an error response, then close the connection"""
+        conn.out.extend(self.protocol.encode_frame(
+            {'type': 'response', 'id': msg_id, 'success': False, 'error': error},
+            validated=True
+        ))
+        conn.closing = True
+        self._flush_client(conn)
+
+    def _update_interest(self, conn: '_ClientConnection') -> None:
+        """Watch for input unless a request is in flight, and for output if any is queued"""
+        events = 0 if conn.busy or conn.closing else selectors.EVENT_READ
+        if conn.out:
+            events |= selectors.EVENT_WRITE
+        self._set_interest(conn, events)
+
+    def _set_interest(self, conn: '_ClientConnection', events: int) -> None:
+        if conn.closed or events == conn.events:
+            return
+        if not events:
+            self._selector.unregister(conn.sock)
+        elif not conn.events:
+            self._selector.register(conn.sock, events, conn)
+        else:
+            self._selector.modify(conn.sock, events, conn)
+        conn.events = events
+
+    def _close_idle_clients(self) -> Optional[float]:
+        """
+        Disconnect clients that sent nothing for CLIENT_TIMEOUT seconds
+
+        Returns:
+            Seconds until the next client can go idle, or None if none can
+        """
+        now = time.monotonic()
+        cutoff = now - self.CLIENT_TIMEOUT
+        oldest = None
+        for conn in list(self._clients.values()):
+            # A request in flight (e.g. a long-poll) is not idleness
+            if conn.busy:
+                continue
+            if conn.last_active < cutoff:
+                if self._log_connections:
+                    self._log(f"Client timeout: {conn.client_id}", 'Info')
+                self._close_client(conn)
+            elif oldest is None or conn.last_active < oldest:
+                oldest = conn.last_active
+
+        if oldest is None:
+            return None
+        return max(0.0, oldest - cutoff)
+
+    def _close_client(self, conn: '_ClientConnection') -> None:
+        if conn.closed:
+            return
+        conn.closed = True
+
+        if conn.events:
+            try:
+                self._selector.unregister(conn.sock)
+            except (KeyError, ValueError):
+                pass
+        self._clients.pop(conn.fd, None)
+        self.active_connections -= 1
+
+        try:
+            conn.sock.close()
+        except OSError:
+            pass
+
+        if self._log_connections:
+            self._log(f"Client disconnected: {conn.client_id}", 'Info')
 
     def _process_message(
         self,
@@ -368,19 +696,14 @@ class SecureQGISMCPServer:
         Returns:
             Response dictionary
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         msg_id = message.get('id', '0')
         msg_type = message.get('type', 'unknown')
 
         try:
             # Authentication check
-            if self.require_auth and not authenticated and msg_type != 'authenticate':
-                if HAS_QGIS:
-                    QgsMessageLog.logMessage(
-                        f"Unauthenticated request from {client_id}: {msg_type}",
-                        "QGIS MCP Secure",
-                        Qgis.Warning
-                    )
+            if not authenticated and self.require_auth and msg_type != 'authenticate':
+                self._log(f"Unauthenticated request from {client_id}: {msg_type}", 'Warning')
                 return {
                     'type': 'response',
                     'id': msg_id,
@@ -389,17 +712,12 @@ class SecureQGISMCPServer:
                 }
 
             # Get operation type for rate limiting
-            operation_type = self._get_operation_type(msg_type)
+            operation_type = self.OPERATION_TYPES.get(msg_type, 'normal')
 
             # Rate limiting check
             try:
                 if not self.rate_limiter.check_rate_limit(client_id, operation_type):
-                    if HAS_QGIS:
-                        QgsMessageLog.logMessage(
-                            f"Rate limit exceeded for {client_id}: {msg_type}",
-                            "QGIS MCP Secure",
-                            Qgis.Warning
-                        )
+                    self._log(f"Rate limit exceeded for {client_id}: {msg_type}", 'Warning')
                     return {
                         'type': 'response',
                         'id': msg_id,
@@ -429,24 +747,20 @@ class SecureQGISMCPServer:
             result = handler(message, client_id)
 
             # Record performance
-            elapsed = time.time() - start_time
+            elapsed = time.perf_counter() - start_time
             self.perf_monitor.record_command(msg_type, elapsed)
 
             return {
                 'type': 'response',
                 'id': msg_id,
                 'success': True,
+                'epoch': self.layer_epoch,
                 'data': result
             }
 
         except SecurityException as e:
             # Security violation - log but don't reveal details
-            if HAS_QGIS:
-                QgsMessageLog.logMessage(
-                    f"Security violation from {client_id}: {type(e).__name__}",
-                    "QGIS MCP Secure",
-                    Qgis.Critical
-                )
+            self._log(f"Security violation from {client_id}: {type(e).__name__}", 'Critical')
             return {
                 'type': 'response',
                 'id': msg_id,
@@ -455,18 +769,18 @@ class SecureQGISMCPServer:
             }
         except Exception as e:
             # Generic error - don't reveal details
-            if HAS_QGIS:
-                QgsMessageLog.logMessage(
-                    f"Error processing {msg_type} from {client_id}: {type(e).__name__}",
-                    "QGIS MCP Secure",
-                    Qgis.Critical
-                )
-                # Log full traceback internally
-                QgsMessageLog.logMessage(
-                    traceback.format_exc(),
-                    "QGIS MCP Secure",
-                    Qgis.Critical
-                )
+            self._log(
+                f"Error processing {msg_type} from {client_id}: {type(e).__name__}",
+                'Critical'
+            )
+            # Log full traceback internally, once per failure kind; a client
+            # repeating a failing request should not cost a stack format each time
+            failure = (msg_type, type(e).__name__)
+            if HAS_QGIS and failure not in self._logged_failures:
+                if len(self._logged_failures) >= self.MAX_LOGGED_FAILURES:
+                    self._logged_failures.clear()
+                self._logged_failures.add(failure)
+                self._log(traceback.format_exc(), 'Critical')
             return {
                 'type': 'response',
                 'id': msg_id,
@@ -474,29 +788,13 @@ class SecureQGISMCPServer:
                 'error': 'Internal server error'
             }
 
+    def _bump_layer_epoch(self, *args) -> None:
+        """Invalidate client-side layer caches after project layers change"""
+        self.layer_epoch += 1
+
     def _get_operation_type(self, msg_type: str) -> str:
         """Map message type to rate limiting category"""
-        if msg_type == 'authenticate':
-            return 'authentication'
-        elif msg_type in ('execute_code', 'load_layer'):
-            return 'expensive'
-        elif msg_type in ('ping', 'get_stats'):
-            return 'cheap'
-        else:
-            return 'normal'
-
-    def _send_error(self, client_socket: socket.socket, msg_id: str, error: str) -> None:
-        """Send error response"""
-        try:
-            response = {
-                'type': 'response',
-                'id': msg_id,
-                'success': False,
-                'error': error
-            }
-            self.protocol.send_message(client_socket, response)
-        except:
-            pass
+        return self.OPERATION_TYPES.get(msg_type, 'normal')
 
     # Command Handlers
 
@@ -507,21 +805,11 @@ class SecureQGISMCPServer:
 
         if self.auth_manager.verify_token(client_id, token):
             self.rate_limiter.record_successful_auth(client_id)
-            if HAS_QGIS:
-                QgsMessageLog.logMessage(
-                    f"Client authenticated: {client_id}",
-                    "QGIS MCP Secure",
-                    Qgis.Success
-                )
+            self._log(f"Client authenticated: {client_id}", 'Success')
             return {'authenticated': True}
         else:
             self.rate_limiter.record_failed_auth(client_id)
-            if HAS_QGIS:
-                QgsMessageLog.logMessage(
-                    f"Authentication failed: {client_id}",
-                    "QGIS MCP Secure",
-                    Qgis.Warning
-                )
+            self._log(f"Authentication failed: {client_id}", 'Warning')
             raise SecurityException("Invalid authentication token")
 
     def _handle_list_layers(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
@@ -543,6 +831,51 @@ class SecureQGISMCPServer:
         data = message.get('data', {})
         return self.feature_access.get_features_optimized(**data)
 
+    def _handle_aggregate(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
+        """Handle aggregate request (computed server-side, returns a single value)"""
+        if not HAS_QGIS:
+            raise RuntimeError("QGIS not available")
+
+        from qgis.core import QgsAggregateCalculator, QgsVectorLayer
+
+        data = message.get('data', {})
+        layer_id = data.get('layer_id', '')
+        field = data.get('field', '')
+        op = data.get('op', 'sum')
+
+        layer = QgsProject.instance().mapLayer(layer_id)
+        if not isinstance(layer, QgsVectorLayer):
+            raise ValueError(f"Vector layer not found: {layer_id}")
+
+        aggregates = {
+            'count': QgsAggregateCalculator.Count,
+            'sum': QgsAggregateCalculator.Sum,
+            'mean': QgsAggregateCalculator.Mean,
+            'min': QgsAggregateCalculator.Min,
+            'max': QgsAggregateCalculator.Max,
+            'median': QgsAggregateCalculator.Median,
+            'stdev': QgsAggregateCalculator.StDevSample,
+            'range': QgsAggregateCalculator.Range,
+        }
+
+        # Plain feature count needs no attribute access at all
+        if op == 'count' and field == '*' and not data.get('filter_expression'):
+            return {'value': layer.featureCount(), 'op': op, 'field': field}
+
+        parameters = QgsAggregateCalculator.AggregateParameters()
+        if data.get('filter_expression'):
+            parameters.filter = data['filter_expression']
+
+        # '*' counts rows; any non-null constant expression works for that
+        value, ok = layer.aggregate(
+            aggregates[op], '1' if field == '*' else field, parameters
+        )
+        if not ok:
+            raise ValueError(f"Could not compute {op} of {field}")
+
+        # min/max/range of temporal fields yield QDate/QDateTime, empty input NULL
+        return {'value': serialize_attribute_value(value), 'op': op, 'field': field}
+
     def _handle_load_layer(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
         """Handle load layer request"""
         if not HAS_QGIS:
@@ -600,29 +933,30 @@ class SecureQGISMCPServer:
 
     def _handle_get_stats(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
         """Handle get statistics request"""
+        uptime = time.monotonic() - self._start_time if self._start_time else 0
         return {
             'performance': self.perf_monitor.get_performance_report(),
             'cache': self.feature_access.geometry_cache.get_stats(),
             'server': {
-                'uptime_seconds': int(time.time() - getattr(self, '_start_time', time.time())),
+                'uptime_seconds': int(uptime),
                 'active_connections': self.active_connections,
-                'total_connections': len(self.client_threads)
+                'total_connections': self.total_connections,
+                'requests_in_flight': self.requests_in_flight
             }
         }
 
     def _handle_ping(self, message: Dict[str, Any], client_id: str) -> Dict[str, Any]:
         """Handle ping request"""
-        return {
-            'pong': True,
-            'timestamp': datetime.now().isoformat(),
-            'server_version': '2.0.0-secure'
-        }
+        response = self._PING_TEMPLATE.copy()
+        response['timestamp'] = datetime.now().isoformat()
+        return response
 
 
 def start_secure_server(
     port: int = 9876,
     use_tls: bool = False,
-    require_auth: bool = True
+    require_auth: bool = True,
+    socket_path: Optional[str] = None
 ) -> SecureQGISMCPServer:
     """
     Start secure QGIS MCP server
@@ -631,6 +965,7 @@ def start_secure_server(
         port: Port number
         use_tls: Enable TLS/SSL encryption
         require_auth: Require authentication (strongly recommended)
+        socket_path: Listen on this Unix domain socket instead of TCP
 
     Returns:
         Running server instance
@@ -639,7 +974,8 @@ def start_secure_server(
         host='127.0.0.1',
         port=port,
         use_tls=use_tls,
-        require_auth=require_auth
+        require_auth=require_auth,
+        socket_path=socket_path
     )
 
     # Start in background thread
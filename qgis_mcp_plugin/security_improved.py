@@ -12,7 +12,7 @@ import unicodedata
 import urllib.parse
 import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Any
+from typing import Dict, List, Optional, Set, Tuple, Any
 
 try:
     from qgis.core import QgsMessageLog, Qgis
@@ -566,7 +566,8 @@ class ImprovedRateLimiter:
             'cheap': {'max': 100, 'window': 60}               # 100 per min
         }
 
-        self.request_history: Dict[str, List[float]] = {}
+        # Token buckets keyed by (client, operation type): [tokens, last_refill]
+        self.buckets: Dict[Tuple[str, str], List[float]] = {}
         self.failed_auth_attempts: Dict[str, List[float]] = {}
         self.lockouts: Dict[str, float] = {}
         self._lock = threading.Lock()
@@ -589,7 +590,7 @@ class ImprovedRateLimiter:
             now = time.time()
 
             # Check if client is locked out
-            if client_addr in self.lockouts:
+            if self.lockouts and client_addr in self.lockouts:
                 lockout_until = self.lockouts[client_addr]
                 if now < lockout_until:
                     remaining = int(lockout_until - now)
@@ -599,31 +600,27 @@ class ImprovedRateLimiter:
                 else:
                     del self.lockouts[client_addr]
 
-            # Get limits for operation type
+            # Each bucket holds up to 'max' tokens and refills at
+            # max/window tokens per second, so the sustained rate matches
+            # the configured window without keeping per-request timestamps
             limits = self.limits.get(operation_type, self.limits['normal'])
-            max_requests = limits['max']
-            window_seconds = limits['window']
-
-            # Initialize history
-            key = f"{client_addr}:{operation_type}"
-            if key not in self.request_history:
-                self.request_history[key] = []
-
-            # Remove old requests
-            cutoff = now - window_seconds
-            self.request_history[key] = [
-                t for t in self.request_history[key] if t > cutoff
-            ]
-
-            # Check limit
-            if len(self.request_history[key]) >= max_requests:
+            capacity = limits['max']
+            rate = capacity / limits['window']
+
+            key = (client_addr, operation_type)
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = [float(capacity), now]
+            else:
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+
+            if bucket[0] < 1.0:
                 return False
-
-            # Add current request
-            self.request_history[key].append(now)
+            bucket[0] -= 1.0
 
             # Periodic cleanup
-            if len(self.request_history) > 1000:
+            if len(self.buckets) > 1000:
                 self._cleanup_old_clients(now)
 
             return True
@@ -680,16 +677,17 @@ class ImprovedRateLimiter:
                 del self.lockouts[client_addr]
 
     def _cleanup_old_clients(self, now: float) -> None:
-        """Remove clients with no recent requests"""
-        cutoff = now - max(limit['window'] for limit in self.limits.values()) * 2
-
-        to_remove = [
-            key for key, requests in self.request_history.items()
-            if not requests or max(requests) < cutoff
-        ]
+        """Remove buckets that have refilled completely (idle clients)"""
+        to_remove = []
+        for key, (tokens, last_refill) in self.buckets.items():
+            limits = self.limits.get(key[1], self.limits['normal'])
+            capacity = limits['max']
+            refilled = tokens + (now - last_refill) * capacity / limits['window']
+            if refilled >= capacity:
+                to_remove.append(key)
 
         for key in to_remove:
-            del self.request_history[key]
+            del self.buckets[key]
 
 
 class AuthenticationManager:
@@ -711,6 +709,17 @@ class AuthenticationManager:
             self.api_token = self._generate_token()
             self.storage.store_token(self.api_token)
 
+    @property
+    def api_token(self) -> str:
+        """Current API token"""
+        return self._api_token
+
+    @api_token.setter
+    def api_token(self, token: str) -> None:
+        self._api_token = token
+        # Encoded once; compare_digest on bytes also accepts non-ASCII input
+        self._token_bytes = token.encode('utf-8')
+
     def _generate_token(self) -> str:
         """Generate cryptographically secure token"""
         return secrets.token_urlsafe(32)
@@ -726,7 +735,12 @@ class AuthenticationManager:
         Returns:
             True if token is valid
         """
-        if hmac.compare_digest(self.api_token, provided_token):
+        if isinstance(provided_token, str):
+            provided_token = provided_token.encode('utf-8')
+        elif not isinstance(provided_token, bytes):
+            return False
+
+        if hmac.compare_digest(self._token_bytes, provided_token):
             with self._lock:
                 self.authenticated_clients.add(client_addr)
             return True
@@ -12,14 +12,22 @@ Features:
 - Token management
 """
 
+import atexit
+import base64
+import copy
+import hashlib
+import os
+import select
 import socket
+import ssl
 import threading
 import time
 import uuid
+import weakref
 from contextlib import contextmanager
 from pathlib import Path
-from queue import Empty, Queue
-from typing import Any, Dict, List, Optional
+from queue import Empty, Full, Queue
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 
 # Import protocol and TLS handler from plugin (should be available in Python path)
 try:
@@ -53,6 +61,7 @@ class ConnectionPool:
         max_connections: int = 5,
         use_tls: bool = False,
         connection_timeout: float = 10.0,
+        socket_path: Optional[str] = None,
     ):
         """
         Initialize connection pool
@@ -63,9 +72,12 @@ class ConnectionPool:
             max_connections: Maximum number of pooled connections
             use_tls: Use TLS/SSL encryption
             connection_timeout: Connection timeout in seconds
+            socket_path: Connect to this Unix domain socket instead of
+                host/port (TLS is not used on it)
         """
         self.host = host
         self.port = port
+        self.socket_path = socket_path
         self.max_connections = max_connections
         self.use_tls = use_tls
         self.connection_timeout = connection_timeout
@@ -87,6 +99,12 @@ class ConnectionPool:
             ClientException: If connection fails
         """
         try:
+            if self.socket_path is not None:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(self.connection_timeout)
+                sock.connect(self.socket_path)
+                return sock
+
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(self.connection_timeout)
             sock.connect((self.host, self.port))
@@ -114,23 +132,33 @@ class ConnectionPool:
             ClientException: If connection cannot be acquired
         """
         conn = None
+        holds_slot = False  # Whether this call counts toward max_connections
         try:
             # Try to get existing connection from pool
             try:
                 conn = self._pool.get_nowait()
+                holds_slot = True
             except Empty:
                 # Create new connection if under limit
                 with self._lock:
                     if self._active_connections < self.max_connections:
                         self._active_connections += 1
-                        conn = self._create_connection()
-                    else:
-                        # Wait for available connection
+                        holds_slot = True
+
+                if holds_slot:
+                    conn = self._create_connection()
+                else:
+                    # Wait for available connection
+                    try:
                         conn = self._pool.get(timeout=self.connection_timeout)
+                    except Empty:
+                        raise ClientException("Timed out waiting for a pooled connection")
+                    holds_slot = True
 
             # Verify connection is still alive
             if not self._is_connection_alive(conn):
                 conn.close()
+                conn = None
                 conn = self._create_connection()
 
             yield conn
@@ -150,11 +178,14 @@ class ConnectionPool:
             if conn:
                 try:
                     self._pool.put_nowait(conn)
-                except:
-                    # Pool is full, close connection
+                except Full:
                     conn.close()
-                    with self._lock:
-                        self._active_connections -= 1
+                    conn = None
+
+            # A connection that was closed or never opened frees its slot
+            if holds_slot and conn is None:
+                with self._lock:
+                    self._active_connections -= 1
 
     def _is_connection_alive(self, sock: socket.socket) -> bool:
         """
@@ -167,11 +198,22 @@ class ConnectionPool:
             True if connection is alive
         """
         try:
-            # Use MSG_PEEK to check without consuming data
-            sock.setblocking(False)
-            data = sock.recv(1, socket.MSG_PEEK)
-            sock.setblocking(True)
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (ValueError, OSError):
+            return False  # Already closed
+
+        # An idle live connection has nothing to read
+        if not readable:
             return True
+
+        # TLS cannot peek; the server sends nothing unsolicited, so readable
+        # means close_notify or EOF
+        if isinstance(sock, ssl.SSLSocket):
+            return False
+
+        try:
+            # Use MSG_PEEK to check without consuming data
+            return sock.recv(1, socket.MSG_PEEK) != b""
         except (socket.error, OSError):
             return False
 
@@ -211,6 +253,8 @@ class SecureQGISMCPClient:
         max_connections: int = 5,
         request_timeout: float = 30.0,
         max_retries: int = 3,
+        layer_cache_ttl: float = 0.0,
+        socket_path: Optional[str] = None,
     ):
         """
         Initialize secure QGIS MCP client
@@ -224,6 +268,12 @@ class SecureQGISMCPClient:
             max_connections: Maximum pooled connections
             request_timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
+            layer_cache_ttl: Seconds to reuse list_layers results; 0 (the
+                default) disables the cache. Only layers being added or
+                removed invalidate it early, so cached feature counts and
+                extents can be up to this old
+            socket_path: Connect to the server's Unix domain socket instead of
+                host/port; lower latency for local use
         """
         self.host = host
         self.port = port
@@ -231,6 +281,7 @@ class SecureQGISMCPClient:
         self.auto_authenticate = auto_authenticate
         self.request_timeout = request_timeout
         self.max_retries = max_retries
+        self.layer_cache_ttl = layer_cache_ttl
 
         # Token management
         self.token_storage = SecureTokenStorage()
@@ -251,15 +302,26 @@ class SecureQGISMCPClient:
             max_connections=max_connections,
             use_tls=use_tls,
             connection_timeout=10.0,
+            socket_path=socket_path,
         )
 
         # Protocol handler
         self.protocol = ProtocolHandler(use_msgpack=True, validate_schema=True)
 
-        # Authentication state
+        # Authentication state; the server authenticates each connection, so
+        # the client tracks which pooled sockets have sent the token
         self.authenticated = False
+        self._authenticated_conns: "weakref.WeakSet[socket.socket]" = weakref.WeakSet()
         self._auth_lock = threading.Lock()
 
+        # Shared clients (see connect) stay open until interpreter exit
+        self._shared = False
+
+        # Layer listings cached until the server's layer epoch moves
+        self.layer_epoch: Optional[int] = None
+        self._layer_cache: Dict[tuple, tuple] = {}
+        self._layer_cache_lock = threading.Lock()
+
     def _ensure_authenticated(self, conn: socket.socket) -> None:
         """
         Ensure connection is authenticated
@@ -270,9 +332,10 @@ class SecureQGISMCPClient:
         Raises:
             ClientException: If authentication fails
         """
+        if conn in self._authenticated_conns:
+            return
+
         with self._auth_lock:
-            if self.authenticated:
-                return
 
             if not self.token:
                 raise ClientException("No authentication token available")
@@ -295,6 +358,7 @@ class SecureQGISMCPClient:
                     error = response.get("error", "Unknown error")
                     raise ClientException(f"Authentication failed: {error}")
 
+                self._authenticated_conns.add(conn)
                 self.authenticated = True
 
             except (socket.error, ProtocolException) as e:
@@ -347,13 +411,13 @@ class SecureQGISMCPClient:
                         error = response.get("error", "Unknown error")
                         raise ClientException(f"Server error: {error}")
 
+                    if "epoch" in response:
+                        self.layer_epoch = response["epoch"]
+
                     return response.get("data", {})
 
             except (socket.error, ProtocolException, ClientException) as e:
                 last_error = e
-                # Reset authentication state on connection error
-                with self._auth_lock:
-                    self.authenticated = False
 
                 if attempt < self.max_retries - 1:
                     # Wait before retry with exponential backoff
@@ -384,6 +448,7 @@ class SecureQGISMCPClient:
 
         with self._auth_lock:
             self.authenticated = False
+            self._authenticated_conns.clear()
 
         try:
             with self.pool.get_connection() as conn:
@@ -411,8 +476,32 @@ class SecureQGISMCPClient:
 
         Returns:
             Layer list with metadata
+
+        Note:
+            With layer_cache_ttl set, results are reused for up to that many
+            seconds, as long as no response to this client has reported
+            layers being added or removed. Edits to existing layers and
+            changes made through other clients are not seen meanwhile.
         """
-        return self.send_request("list_layers", {"offset": offset, "limit": limit})
+        if self.layer_cache_ttl <= 0:
+            return self.send_request("list_layers", {"offset": offset, "limit": limit})
+
+        key = (offset, limit)
+        now = time.monotonic()
+
+        with self._layer_cache_lock:
+            cached = self._layer_cache.get(key)
+        if cached:
+            epoch, fetched_at, layers = cached
+            if epoch == self.layer_epoch and now - fetched_at < self.layer_cache_ttl:
+                # Callers get their own copy, so one caller's edits never leak
+                return copy.deepcopy(layers)
+
+        layers = self.send_request("list_layers", {"offset": offset, "limit": limit})
+
+        with self._layer_cache_lock:
+            self._layer_cache[key] = (self.layer_epoch, now, copy.deepcopy(layers))
+        return layers
 
     def get_features(
         self,
@@ -422,6 +511,8 @@ class SecureQGISMCPClient:
         filter_expression: Optional[str] = None,
         attributes_only: bool = False,
         simplify_tolerance: Optional[float] = None,
+        geometry: str = "wkb",
+        columnar: bool = False,
     ) -> Dict[str, Any]:
         """
         Get features from layer
@@ -433,9 +524,13 @@ class SecureQGISMCPClient:
             filter_expression: Attribute filter expression
             attributes_only: Skip geometry
             simplify_tolerance: Geometry simplification tolerance
+            geometry: Geometry detail: "wkb" (full), "bbox" (extent only) or "none"
+            columnar: Return "ids", "columns" (one list per field) and
+                "geometries" lists instead of a "features" list
 
         Returns:
-            Features data
+            Features data; full geometries have format "wkb" (raw bytes, over
+            MessagePack) or "wkb_base64"
         """
         data = {"layer_id": layer_id, "limit": limit}
 
@@ -447,9 +542,38 @@ class SecureQGISMCPClient:
             data["attributes_only"] = attributes_only
         if simplify_tolerance:
             data["simplify_tolerance"] = simplify_tolerance
+        if geometry != "wkb":
+            data["geometry"] = geometry
+        if columnar:
+            data["columnar"] = columnar
 
         return self.send_request("get_features", data)
 
+    def aggregate(
+        self,
+        layer_id: str,
+        field: str,
+        op: str = "sum",
+        filter_expression: Optional[str] = None,
+    ) -> Any:
+        """
+        Compute an aggregate over a layer field on the server
+
+        Args:
+            layer_id: Layer ID
+            field: Field name or expression ('*' with op='count' counts features)
+            op: Aggregate (count, sum, mean, min, max, median, stdev, range)
+            filter_expression: Only aggregate features matching this expression
+
+        Returns:
+            Aggregate value
+        """
+        data = {"layer_id": layer_id, "field": field, "op": op}
+        if filter_expression:
+            data["filter_expression"] = filter_expression
+
+        return self.send_request("aggregate", data)["value"]
+
     def load_layer(self, path: str, layer_name: Optional[str] = None) -> Dict[str, Any]:
         """
         Load layer from file
@@ -483,6 +607,242 @@ class SecureQGISMCPClient:
         """
         return self.send_request("execute_code", {"code": code})
 
+    def wait_for_operation(
+        self,
+        request_id: str,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Block until an async operation finishes
+
+        The server parks each request until the operation completes or its
+        progress moves, so no client-side sleep/poll loop is needed.
+
+        Args:
+            request_id: Async operation ID
+            progress_callback: Called with the progress percentage on each update
+            timeout: Maximum seconds to wait (None to wait indefinitely)
+
+        Returns:
+            Final operation status
+
+        Raises:
+            ClientException: If the operation does not finish within timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        last_progress = -1
+
+        while True:
+            # Each long-poll must return before the socket read times out
+            wait = self.request_timeout / 2
+            if deadline is not None:
+                wait = min(wait, max(deadline - time.monotonic(), 0.0))
+
+            status = self.send_request(
+                "wait_async_operation",
+                {"request_id": request_id, "last_progress": last_progress, "timeout": wait},
+            )
+
+            progress = status.get("progress", 0)
+            if progress_callback and progress != last_progress:
+                progress_callback(progress)
+            last_progress = progress
+
+            if status.get("completed"):
+                return status
+
+            if deadline is not None and time.monotonic() >= deadline:
+                raise ClientException(f"Operation {request_id} did not finish within {timeout}s")
+
+    def execute_pipeline(
+        self, steps: List[Dict[str, Any]], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a chain of processing algorithms in a single request
+
+        Parameter values like "$step1.OUTPUT" or "$prev.OUTPUT" are replaced
+        on the server with the output of an earlier step.
+
+        Args:
+            steps: List of {"algorithm_id": ..., "parameters": {...}} dicts
+            timeout: Maximum seconds to wait for the pipeline
+
+        Returns:
+            Dict with per-step outputs ("steps") and the final output
+            ("result"). Layers output by the last step are added to the
+            project; in-memory layers of earlier steps are discarded and
+            reported as None.
+
+        Raises:
+            ClientException: If a step fails or the pipeline times out
+
+        Example:
+            >>> client.execute_pipeline([
+            ...     {"algorithm_id": "native:buffer",
+            ...      "parameters": {"INPUT": layer_id, "DISTANCE": 100, "OUTPUT": "memory:"}},
+            ...     {"algorithm_id": "native:dissolve",
+            ...      "parameters": {"INPUT": "$prev.OUTPUT", "OUTPUT": "memory:"}},
+            ... ])
+        """
+        response = self.send_request("execute_pipeline_async", {"steps": steps})
+        status = self.wait_for_operation(response["request_id"], timeout=timeout)
+
+        if status.get("status") != "completed":
+            raise ClientException(f"Pipeline failed: {status.get('error')}")
+
+        return status["result"]
+
+    def iter_features(
+        self,
+        layer_id: str,
+        batch_size: int = 1000,
+        timeout: Optional[float] = None,
+        **params: Any,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream features from a layer in batches
+
+        The server publishes each batch as soon as it is read, so the first
+        batch arrives while the rest of the query is still running.
+
+        Args:
+            layer_id: Layer ID
+            batch_size: Features per batch
+            timeout: Maximum seconds to wait for the whole query
+            **params: get_features parameters (limit, bbox, filter_expression, ...)
+
+        Yields:
+            Lists of feature dicts
+
+        Raises:
+            ClientException: If the query fails or times out
+        """
+        response = self.send_request(
+            "get_features_async",
+            {**params, "layer_id": layer_id, "batch_size": batch_size, "stream": True},
+        )
+        request_id = response["request_id"]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        start = 0
+
+        while True:
+            wait = self.request_timeout / 2
+            if deadline is not None:
+                wait = min(wait, max(deadline - time.monotonic(), 0.0))
+
+            partials = self.send_request(
+                "fetch_partial_results",
+                {"request_id": request_id, "start": start, "wait": wait},
+            )
+            yield from partials["results"]
+            start = partials["next"]
+
+            if partials["completed"]:
+                if partials["status"] != "completed":
+                    status = self.send_request("check_async_status", {"request_id": request_id})
+                    raise ClientException(f"Feature query failed: {status.get('error')}")
+                return
+
+            if deadline is not None and time.monotonic() >= deadline:
+                self.send_request("cancel_async_operation", {"request_id": request_id})
+                raise ClientException(f"Feature query did not finish within {timeout}s")
+
+    def get_operation_status_batch(
+        self, request_ids: List[str], wait: float = 0.0
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get the status of several async operations in one request
+
+        Args:
+            request_ids: Async operation IDs
+            wait: Seconds the server may block until at least one finishes
+
+        Returns:
+            Mapping of operation ID to status (None for unknown IDs)
+        """
+        wait = min(wait, self.request_timeout / 2)
+        response = self.send_request(
+            "check_async_status_batch", {"request_ids": list(request_ids), "wait": wait}
+        )
+        return response.get("operations", {})
+
+    def render_map_to_file(
+        self, path: str, timeout: Optional[float] = None, **params: Any
+    ) -> int:
+        """
+        Render map and stream the image straight to a file
+
+        The server keeps the PNG on disk and the client fetches it in
+        chunks, so neither side holds a base64 copy of the whole render.
+        The download goes to a temporary file next to ``path`` and only
+        replaces it once the content hash matches, so a failed or corrupt
+        download never leaves a partial image behind.
+
+        Args:
+            path: Output file path
+            timeout: Maximum seconds to wait for the render
+            **params: Render parameters (width, height, extent, layer_ids)
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            ClientException: If a format other than PNG is requested, or if
+                rendering fails, times out or the download does not match the
+                server's content hash
+        """
+        # The server always encodes PNG; refuse rather than mislabel the file
+        fmt = params.pop("format", "PNG")
+        if str(fmt).upper() != "PNG" or "quality" in params:
+            raise ClientException(
+                f"Unsupported render format {fmt!r}: the server only renders PNG"
+            )
+
+        response = self.send_request("render_map_async", {**params, "encoding": "file"})
+        request_id = response["request_id"]
+        status = self.wait_for_operation(request_id, timeout=timeout)
+
+        if status.get("status") != "completed":
+            raise ClientException(f"Render failed: {status.get('error')}")
+
+        result = status["result"]
+        chunk_encoding = "binary" if self.protocol.use_msgpack else "base64"
+        digest = hashlib.sha256()
+
+        def chunks():
+            offset = 0
+            while True:
+                chunk = self.send_request(
+                    "download_render_chunk",
+                    {"request_id": request_id, "offset": offset, "encoding": chunk_encoding},
+                )
+                if "data" in chunk:
+                    data = chunk["data"]
+                else:
+                    data = base64.b64decode(chunk["data_base64"])
+                digest.update(data)
+                offset += len(data)
+                yield data
+                if chunk["eof"] or not data:
+                    return
+
+        # Same directory as the target, so os.replace() stays on one filesystem
+        tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+        try:
+            written = _write_file(tmp_path, chunks(), size=result["image_size"])
+
+            if "sha256:" + digest.hexdigest() != result["content_hash"]:
+                raise ClientException("Rendered image failed content hash check")
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass  # Never created
+            raise
+        return written
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get server statistics
@@ -502,21 +862,84 @@ class SecureQGISMCPClient:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
-        self.close()
+        if not self._shared:
+            self.close()
+
+
+def _write_file(path: str, chunks: Iterable[bytes], size: int = 0) -> int:
+    """
+    Write chunks of bytes to a file without intermediate joins or buffering
+
+    Args:
+        path: Output file path
+        chunks: File contents, in order
+        size: Expected total size, reserved up front when known
+
+    Returns:
+        Number of bytes written
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    written = 0
+    try:
+        # Reserve the full size up front so large renders land in one extent
+        if size and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except OSError:
+                pass  # Not supported by this filesystem
+
+        for chunk in chunks:
+            view = memoryview(chunk)
+            offset = 0
+            while offset < len(view):
+                offset += os.write(fd, view[offset:])
+            written += offset
+
+        # Trim any reservation the download did not fill
+        if written < size:
+            os.ftruncate(fd, written)
+    finally:
+        os.close(fd)
+    return written
+
+
+_shared_clients: Dict[tuple, SecureQGISMCPClient] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def _close_shared_clients() -> None:
+    """Close clients kept open by connect() when QGIS_MCP_REUSE is set"""
+    with _shared_clients_lock:
+        for client in _shared_clients.values():
+            client.close()
+        _shared_clients.clear()
+
+
+atexit.register(_close_shared_clients)
 
 
 # Convenience function
 def connect(
-    host: str = "127.0.0.1", port: int = 9876, token: Optional[str] = None, use_tls: bool = False
+    host: str = "127.0.0.1",
+    port: int = 9876,
+    token: Optional[str] = None,
+    use_tls: bool = False,
+    socket_path: Optional[str] = None,
 ) -> SecureQGISMCPClient:
     """
     Create and connect secure QGIS MCP client
 
+    If the QGIS_MCP_REUSE environment variable is set, one client per
+    (host, port, token, use_tls, socket_path) is kept for the life of the
+    process, so repeated connect() blocks reuse its authenticated pooled
+    connections instead of reconnecting and re-authenticating each time.
+
     Args:
         host: Server host
         port: Server port
         token: Authentication token
         use_tls: Use TLS/SSL encryption
+        socket_path: Connect to this Unix domain socket instead of host/port
 
     Returns:
         Connected client instance
@@ -526,6 +949,28 @@ def connect(
         ...     layers = client.list_layers()
         ...     print(layers)
     """
-    return SecureQGISMCPClient(
-        host=host, port=port, token=token, use_tls=use_tls, auto_authenticate=True
-    )
+    if not os.environ.get("QGIS_MCP_REUSE"):
+        return SecureQGISMCPClient(
+            host=host,
+            port=port,
+            token=token,
+            use_tls=use_tls,
+            auto_authenticate=True,
+            socket_path=socket_path,
+        )
+
+    key = (host, port, token, use_tls, socket_path)
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = SecureQGISMCPClient(
+                host=host,
+                port=port,
+                token=token,
+                use_tls=use_tls,
+                auto_authenticate=True,
+                socket_path=socket_path,
+            )
+            client._shared = True
+            _shared_clients[key] = client
+        return client
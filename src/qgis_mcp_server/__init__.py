@@ -21,6 +21,14 @@ Usage with Claude Desktop:
 
 __version__ = "1.0.0"
 
-from .server import main
-
 __all__ = ["main"]
+
+
+def __getattr__(name):
+    # The server module configures logging (and opens its log file) on
+    # import, so only load it once main is actually needed
+    if name == "main":
+        from .server import main
+
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
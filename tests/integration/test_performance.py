@@ -105,7 +105,7 @@ class TestRateLimiterPerformance:
             rate_limiter.check_rate_limit(client, "normal")
 
         # Should have stored data for all clients
-        assert len(rate_limiter.request_history) <= num_clients * 4  # 4 operation types
+        assert len(rate_limiter.buckets) <= num_clients * 4  # 4 operation types
 
 
 @pytest.mark.slow
@@ -301,7 +301,7 @@ class TestMemoryEfficiency:
 
         # Should trigger cleanup at 1000+ clients
         # Verify size is bounded (relaxed from < 2000 to <= 2000 for CI)
-        assert len(rate_limiter.request_history) <= 2000
+        assert len(rate_limiter.buckets) <= 2000
 
     def test_buffered_protocol_memory(self, buffered_protocol):
         """Test buffered protocol memory management"""
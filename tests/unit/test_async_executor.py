@@ -0,0 +1,452 @@
+"""
+Unit tests for Async Operation Manager
+
+Tests cover:
+- Operation lifecycle
+- Progress reporting
+- Waiting for completion
+- Cancellation
+"""
+
+import asyncio
+import gc
+import threading
+import time
+import weakref
+
+import pytest
+from async_executor import (
+    AsyncCommandExecutor,
+    AsyncOperationManager,
+    OperationStatus,
+)
+
+
+def stepped_handler(steps=5, delay=0.02, _progress_callback=None):
+    """Handler that reports progress in equal steps"""
+    for i in range(steps):
+        time.sleep(delay)
+        if _progress_callback:
+            _progress_callback(int((i + 1) / steps * 100), f"Step {i + 1}/{steps}")
+    return {"steps": steps}
+
+
+async def async_stepped_handler(steps=5, delay=0.02, _progress_callback=None):
+    """Coroutine handler that reports progress in equal steps"""
+    for i in range(steps):
+        await asyncio.sleep(delay)
+        if _progress_callback:
+            _progress_callback(int((i + 1) / steps * 100), f"Step {i + 1}/{steps}")
+    return {"steps": steps}
+
+
+def waiting_handler(wait=5.0, _progress_callback=None, _cancel_event=None):
+    """Handler that blocks on its cancel event instead of polling"""
+    if _cancel_event.wait(timeout=wait):
+        return "interrupted"
+    return "waited"
+
+
+def batching_handler(batches=3, delay=0.02, _progress_callback=None):
+    """Handler that streams one partial result per step"""
+    for i in range(batches):
+        time.sleep(delay)
+        _progress_callback(int((i + 1) / batches * 100), f"Batch {i + 1}", partial=[i])
+    return {"batches": batches}
+
+
+def failing_handler(_progress_callback=None):
+    """Handler that always raises"""
+    raise ValueError("boom")
+
+
+@pytest.fixture
+def manager():
+    """Create a fresh operation manager"""
+    mgr = AsyncOperationManager(max_concurrent=5)
+    yield mgr
+    mgr.cancel_all()
+
+
+def wait_until_finished(manager, request_id, timeout=5.0):
+    """Wait for an operation to reach a terminal state"""
+    deadline = time.monotonic() + timeout
+    status = manager.get_status(request_id)
+    while not status["completed"] and time.monotonic() < deadline:
+        status = manager.wait_for_change(
+            request_id, last_progress=status["progress"], timeout=timeout
+        )
+    assert status["completed"], f"Operation {request_id} did not finish"
+    return status
+
+
+class TestOperationLifecycle:
+    """Test starting and completing operations"""
+
+    def test_operation_completes(self, manager):
+        """Test that a handler result is stored on completion"""
+        manager.start_operation("op_1", "test", stepped_handler, {"steps": 2})
+        status = wait_until_finished(manager, "op_1")
+
+        assert status["status"] == OperationStatus.COMPLETED.value
+        assert status["result"] == {"steps": 2}
+        assert status["progress"] == 100
+
+    def test_operation_failure_recorded(self, manager):
+        """Test that handler exceptions mark the operation as failed"""
+        manager.start_operation("op_fail", "test", failing_handler, {})
+        status = wait_until_finished(manager, "op_fail")
+
+        assert status["status"] == OperationStatus.FAILED.value
+        assert "boom" in status["error"]
+
+    def test_timeout_enforced_without_progress(self, manager):
+        """Test that handlers that never report progress still time out"""
+        def silent_handler(_progress_callback=None):
+            time.sleep(1.0)
+            return "late"
+
+        start = time.monotonic()
+        manager.start_operation("op_silent", "test", silent_handler, {}, timeout=0.1)
+        status = wait_until_finished(manager, "op_silent")
+
+        assert status["status"] == OperationStatus.TIMEOUT.value
+        assert time.monotonic() - start < 0.9
+
+        time.sleep(1.0)  # Late result from the abandoned handler is discarded
+        assert manager.get_status("op_silent")["status"] == OperationStatus.TIMEOUT.value
+
+    def test_duplicate_request_id_rejected(self, manager):
+        """Test that request IDs must be unique"""
+        manager.start_operation("op_dup", "test", stepped_handler, {"steps": 1})
+
+        with pytest.raises(ValueError):
+            manager.start_operation("op_dup", "test", stepped_handler, {"steps": 1})
+
+    def test_operations_reuse_pool_workers(self, manager):
+        """Test that handlers run on the shared worker pool"""
+        def thread_name_handler(_progress_callback=None):
+            return threading.current_thread().name
+
+        for i in range(3):
+            manager.start_operation(f"op_t{i}", "test", thread_name_handler, {})
+            status = wait_until_finished(manager, f"op_t{i}")
+            assert status["result"].startswith("qgis-mcp-async")
+
+    def test_concurrent_limit_enforced(self):
+        """Test that operations beyond max_concurrent are rejected"""
+        mgr = AsyncOperationManager(max_concurrent=1)
+        try:
+            mgr.start_operation("op_a", "test", stepped_handler, {"steps": 1, "delay": 0.5})
+            with pytest.raises(RuntimeError, match="Too many concurrent"):
+                mgr.start_operation("op_b", "test", stepped_handler, {"steps": 1})
+        finally:
+            mgr.cancel_all()
+
+    def test_shutdown_cancels_and_rejects_new_operations(self):
+        """Test that shutdown cancels running operations and refuses new ones"""
+        mgr = AsyncOperationManager(max_concurrent=2)
+        mgr.start_operation("op_wait", "test", waiting_handler, {"wait": 5.0})
+        mgr.shutdown()
+
+        status = wait_until_finished(mgr, "op_wait")
+        assert status["status"] == OperationStatus.CANCELLED.value
+        with pytest.raises(RuntimeError, match="shut down"):
+            mgr.start_operation("op_late", "test", stepped_handler, {"steps": 1})
+        mgr.shutdown()  # Idempotent
+
+    def test_unknown_operation_status(self, manager):
+        """Test status of unknown operation is None"""
+        assert manager.get_status("missing") is None
+        assert manager.wait_for_change("missing", timeout=0.1) is None
+
+
+class TestCleanup:
+    """Test removal of finished operations"""
+
+    def test_cleanup_removes_old_finished(self, manager):
+        """Test that only finished operations past cleanup_after are removed"""
+        manager.cleanup_after = 0
+        manager.start_operation("op_done", "test", stepped_handler, {"steps": 1})
+        wait_until_finished(manager, "op_done")
+        manager.start_operation("op_running", "test", stepped_handler, {"steps": 1, "delay": 1.0})
+
+        snapshot = manager.operations
+        assert manager.cleanup_completed() == 1
+
+        assert manager.get_status("op_done") is None
+        assert manager.get_status("op_running") is not None
+        assert "op_done" in snapshot  # Readers holding the old dict are unaffected
+
+    def test_cleanup_releases_executor_before_deadline(self, manager):
+        """Test that the timeout watchdog does not keep cleaned-up operations alive"""
+        manager.cleanup_after = 0
+        manager.start_operation("op_done", "test", stepped_handler, {"steps": 1}, timeout=3600)
+        wait_until_finished(manager, "op_done")
+        executor_ref = weakref.ref(manager.operations["op_done"])
+
+        assert manager.cleanup_completed() == 1
+        gc.collect()
+
+        assert executor_ref() is None
+
+
+class TestProgressCallbacks:
+    """Test progress callback throttling"""
+
+    def test_progress_callbacks_throttled(self):
+        """Test that rapid progress updates are coalesced but state stays fresh"""
+        def chatty_handler(_progress_callback=None):
+            for i in range(1000):
+                _progress_callback(i // 10, "working")
+            return "done"
+
+        executor = AsyncCommandExecutor("op_chatty", "test", chatty_handler, {})
+        emitted = []
+        executor.connect_signal("progress", lambda rid, pct, msg: emitted.append(pct))
+        executor.run()
+
+        assert executor.result_obj.status == OperationStatus.COMPLETED
+        assert len(emitted) < 50
+        assert emitted[-1] == 100
+
+
+class TestStats:
+    """Test operation statistics"""
+
+    def test_stats_track_transitions(self, manager):
+        """Test that per-status counts follow operations through their lifecycle"""
+        manager.start_operation("op_ok", "test", stepped_handler, {"steps": 1})
+        manager.start_operation("op_bad", "test", failing_handler, {})
+        wait_until_finished(manager, "op_ok")
+        wait_until_finished(manager, "op_bad")
+
+        stats = manager.get_stats()
+        assert stats["total_operations"] == 2
+        assert stats["by_status"] == {"completed": 1, "failed": 1}
+
+        manager.cleanup_after = 0
+        manager.cleanup_completed()
+        assert manager.get_stats()["total_operations"] == 0
+
+    def test_racing_finishers_counted_once(self, manager):
+        """Test that concurrent cancel/expire leave one terminal state and exact counts"""
+        for i in range(manager.max_concurrent):
+            manager.start_operation(f"op_{i}", "test", waiting_handler, {"wait": 5.0})
+
+        executors = list(manager.operations.values())
+        barrier = threading.Barrier(3)
+
+        def finish(method):
+            barrier.wait()
+            for executor in executors:
+                getattr(executor, method)()
+
+        threads = [threading.Thread(target=finish, args=(m,)) for m in ("cancel", "expire", "cancel")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        by_status = manager.get_stats()["by_status"]
+        assert sum(by_status.values()) == manager.max_concurrent
+        assert manager._active_count() == 0
+        assert len(manager._completion_heap) == manager.max_concurrent
+
+        # A finished operation never changes state again
+        executors[0]._mark_completed({"late": True})
+        assert executors[0].result_obj.result is None
+
+
+class TestStatusSnapshot:
+    """Test status dictionaries"""
+
+    def test_finished_status_cached(self, manager):
+        """Test that a finished operation's status dict is built once"""
+        manager.start_operation("op_snap", "test", stepped_handler, {"steps": 1})
+        wait_until_finished(manager, "op_snap")
+
+        first = manager.get_status("op_snap")
+        assert manager.get_status("op_snap") is first
+        assert first["result"] == {"steps": 1}
+
+    def test_running_status_not_cached(self, manager):
+        """Test that running operations report fresh dicts"""
+        manager.start_operation("op_live", "test", stepped_handler, {"steps": 1, "delay": 0.5})
+
+        assert manager.get_status("op_live") is not manager.get_status("op_live")
+
+
+class TestWaitForChange:
+    """Test server-side waiting instead of client polling"""
+
+    def test_wait_returns_on_progress(self, manager):
+        """Test that waiters wake up on progress updates"""
+        manager.start_operation("op_p", "test", stepped_handler, {"steps": 5, "delay": 0.05})
+
+        seen = []
+        last = -1
+        while True:
+            status = manager.wait_for_change("op_p", last_progress=last, timeout=5.0)
+            seen.append(status["progress"])
+            last = status["progress"]
+            if status["completed"]:
+                break
+
+        assert seen == sorted(seen)
+        assert seen[-1] == 100
+        assert len(seen) > 1
+
+    def test_wait_times_out(self, manager):
+        """Test that a wait without changes returns after the timeout"""
+        manager.start_operation("op_slow", "test", stepped_handler, {"steps": 1, "delay": 1.0})
+
+        start = time.monotonic()
+        status = manager.wait_for_change("op_slow", last_progress=0, timeout=0.1)
+        elapsed = time.monotonic() - start
+
+        assert not status["completed"]
+        assert elapsed < 0.9
+
+    def test_wait_wakes_on_cancel(self, manager):
+        """Test that cancellation wakes blocked waiters"""
+        manager.start_operation("op_c", "test", stepped_handler, {"steps": 1, "delay": 1.0})
+
+        timer = threading.Timer(0.05, manager.cancel_operation, args=("op_c",))
+        timer.start()
+
+        status = manager.wait_for_change("op_c", last_progress=0, timeout=5.0)
+        timer.join()
+
+        assert status["status"] == OperationStatus.CANCELLED.value
+        assert status["completed"]
+
+
+class TestCancelEvent:
+    """Test handlers blocking on the cancellation event"""
+
+    def test_cancel_wakes_handler(self, manager):
+        """Test that cancellation releases a handler waiting on its event"""
+        manager.start_operation("op_ev", "test", waiting_handler, {})
+        executor = manager.operations["op_ev"]
+        while executor.result_obj.status is OperationStatus.PENDING:
+            time.sleep(0.01)
+
+        start = time.monotonic()
+        manager.cancel_operation("op_ev")
+        executor.future.result(timeout=5.0)
+
+        assert time.monotonic() - start < 1.0
+        assert manager.get_status("op_ev")["status"] == OperationStatus.CANCELLED.value
+
+    def test_timeout_wakes_handler(self, manager):
+        """Test that the timeout watchdog sets the same event"""
+        manager.start_operation("op_ev_t", "test", waiting_handler, {}, timeout=0.1)
+        executor = manager.operations["op_ev_t"]
+
+        executor.future.result(timeout=5.0)
+        assert executor.cancel_event.is_set()
+        assert manager.get_status("op_ev_t")["status"] == OperationStatus.TIMEOUT.value
+
+    def test_event_not_passed_to_other_handlers(self, manager):
+        """Test that handlers without the parameter are called as before"""
+        manager.start_operation("op_plain", "test", stepped_handler, {"steps": 1})
+        status = wait_until_finished(manager, "op_plain")
+
+        assert status["status"] == OperationStatus.COMPLETED.value
+
+
+class TestPartialResults:
+    """Test results streamed before an operation finishes"""
+
+    def test_partials_collected_in_order(self, manager):
+        """Test that fetching from the last index returns every batch once"""
+        manager.start_operation("op_s", "test", batching_handler, {"batches": 4})
+
+        received = []
+        start = 0
+        while True:
+            partials = manager.get_partial_results("op_s", start=start, wait=5.0)
+            received.extend(partials["results"])
+            start = partials["next"]
+            if partials["completed"]:
+                break
+
+        assert received == [[0], [1], [2], [3]]
+        assert partials["status"] == OperationStatus.COMPLETED.value
+        assert manager.get_status("op_s")["partial_count"] == 4
+
+    def test_wait_returns_on_first_partial(self, manager):
+        """Test that a waiter wakes for a partial result, not only completion"""
+        manager.start_operation("op_s1", "test", batching_handler,
+                                {"batches": 2, "delay": 0.05})
+        # Second batch sleeps again, so only the first can be back this early
+        partials = manager.get_partial_results("op_s1", wait=5.0)
+
+        assert partials["results"][0] == [0]
+        assert partials["next"] >= 1
+
+    def test_unknown_operation(self, manager):
+        """Test that an unknown request ID returns None"""
+        assert manager.get_partial_results("missing") is None
+
+
+class TestStatusBatch:
+    """Test batched status queries"""
+
+    def test_batch_returns_all_requested(self, manager):
+        """Test that one call returns every requested status"""
+        for i in range(3):
+            manager.start_operation(f"op_{i}", "test", stepped_handler, {"steps": 1})
+
+        statuses = manager.get_status_batch(["op_0", "op_1", "op_2", "missing"])
+
+        assert set(statuses) == {"op_0", "op_1", "op_2", "missing"}
+        assert statuses["missing"] is None
+        assert all(statuses[f"op_{i}"]["request_id"] == f"op_{i}" for i in range(3))
+
+    def test_batch_wait_returns_on_first_completion(self, manager):
+        """Test that waiting returns as soon as any operation finishes"""
+        manager.start_operation("fast", "test", stepped_handler, {"steps": 1, "delay": 0.05})
+        manager.start_operation("slow", "test", stepped_handler, {"steps": 1, "delay": 2.0})
+
+        start = time.monotonic()
+        statuses = manager.get_status_batch(["fast", "slow"], wait=5.0)
+        elapsed = time.monotonic() - start
+
+        assert statuses["fast"]["completed"]
+        assert not statuses["slow"]["completed"]
+        assert elapsed < 1.5
+
+
+class TestCoroutineHandlers:
+    """Test coroutine handlers scheduled on the event loop"""
+
+    def test_coroutine_operation_completes(self, manager):
+        """Test that coroutine handlers run and report progress"""
+        manager.start_operation("op_async", "test", async_stepped_handler, {"steps": 3})
+        status = wait_until_finished(manager, "op_async")
+
+        assert status["status"] == OperationStatus.COMPLETED.value
+        assert status["result"] == {"steps": 3}
+
+    def test_coroutine_operation_timeout(self, manager):
+        """Test that coroutine handlers are stopped at their timeout"""
+        manager.start_operation(
+            "op_async_slow", "test", async_stepped_handler,
+            {"steps": 1, "delay": 5.0}, timeout=0.1
+        )
+        status = wait_until_finished(manager, "op_async_slow")
+
+        assert status["status"] == OperationStatus.TIMEOUT.value
+
+    def test_coroutine_operation_cancel(self, manager):
+        """Test that cancelling a coroutine operation stops it"""
+        manager.start_operation(
+            "op_async_c", "test", async_stepped_handler, {"steps": 1, "delay": 5.0}
+        )
+        assert manager.cancel_operation("op_async_c")
+
+        status = wait_until_finished(manager, "op_async_c")
+        assert status["status"] == OperationStatus.CANCELLED.value
+
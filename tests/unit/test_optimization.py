@@ -0,0 +1,273 @@
+"""
+Unit tests for the optimization module
+
+Tests cover:
+- LRU cache ordering
+- Geometry cache byte budget, keys and per-layer invalidation
+- Field name caching and invalidation
+"""
+
+import importlib
+import sys
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def optimization(mock_qgis):
+    """optimization module, imported against the mocked qgis.core"""
+    return importlib.import_module("optimization")
+
+
+def geom(size):
+    """Cached geometry entry whose encoded WKB is ``size`` bytes"""
+    return {"type": "Point", "data": "0" * size}
+
+
+def assert_consistent(cache):
+    """Check that the byte count and layer index match the cached entries"""
+    entries = cache.cache.cache
+    assert cache.total_bytes == sum(len(value["data"]) for value in entries.values())
+
+    indexed = set().union(*cache._layer_index.values()) if cache._layer_index else set()
+    assert indexed == set(entries)
+    assert all(cache._layer_index.values())
+    for layer_id, keys in cache._layer_index.items():
+        assert all(key[0] == layer_id for key in keys)
+
+
+class TestLRUCache:
+    """Test least recently used ordering"""
+
+    def test_least_recently_used_evicted(self, optimization):
+        """Test that get() refreshes a key and the oldest key is evicted"""
+        cache = optimization.LRUCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+
+    def test_reput_existing_key_does_not_evict(self, optimization):
+        """Test that updating a key at capacity replaces it in place"""
+        cache = optimization.LRUCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("a", 10)
+
+        assert cache.size() == 2
+        assert cache.get("a") == 10 and cache.get("b") == 2
+
+
+class TestGeometryCache:
+    """Test the simplified geometry cache"""
+
+    def test_tolerance_is_part_of_key(self, optimization):
+        """Test that full and simplified geometries of a feature are separate entries"""
+        cache = optimization.GeometryCache()
+        cache.put_geometry("layer_1", 1, geom(4))
+        cache.put_geometry("layer_1", 1, geom(8), simplify_tolerance=0.5)
+
+        assert cache.get_geometry("layer_1", 1)["data"] == "0" * 4
+        assert cache.get_geometry("layer_1", 1, simplify_tolerance=0)["data"] == "0" * 4
+        assert cache.get_geometry("layer_1", 1, simplify_tolerance=0.5)["data"] == "0" * 8
+        assert cache.get_geometry("layer_1", 1, simplify_tolerance=1.0) is None
+        assert cache.get_stats()["size"] == 2
+
+    def test_eviction_by_bytes(self, optimization):
+        """Test that least recently used entries are evicted to stay within max_bytes"""
+        cache = optimization.GeometryCache(max_size=100, max_bytes=100)
+        for fid in range(4):
+            cache.put_geometry("layer_1", fid, geom(30))
+        assert cache.get_geometry("layer_1", 0) is None
+        assert cache.total_bytes == 90
+
+        cache.get_geometry("layer_1", 1)
+        cache.put_geometry("layer_2", 0, geom(50))
+
+        assert cache.get_geometry("layer_1", 1) is not None
+        assert cache.get_geometry("layer_1", 2) is None
+        assert cache.get_geometry("layer_1", 3) is None
+        assert cache.total_bytes == 80
+        assert_consistent(cache)
+
+    def test_eviction_by_count(self, optimization):
+        """Test that max_size still bounds the number of entries"""
+        cache = optimization.GeometryCache(max_size=3)
+        for fid in range(5):
+            cache.put_geometry("layer_1", fid, geom(1))
+
+        assert cache.get_stats()["size"] == 3
+        assert cache.get_geometry("layer_1", 1) is None
+        assert_consistent(cache)
+
+    def test_entry_larger_than_budget_skipped(self, optimization):
+        """Test that an entry over max_bytes is not cached and evicts nothing"""
+        cache = optimization.GeometryCache(max_bytes=100)
+        cache.put_geometry("layer_1", 1, geom(10))
+        cache.put_geometry("layer_1", 2, geom(101))
+
+        assert cache.get_geometry("layer_1", 1) is not None
+        assert cache.get_geometry("layer_1", 2) is None
+        assert cache.total_bytes == 10
+        assert_consistent(cache)
+
+    def test_reput_existing_key(self, optimization):
+        """Test that replacing an entry updates bytes without evicting others"""
+        cache = optimization.GeometryCache(max_size=2, max_bytes=100)
+        cache.put_geometry("layer_1", 1, geom(40))
+        cache.put_geometry("layer_1", 2, geom(40))
+        cache.put_geometry("layer_1", 1, geom(60))
+
+        assert cache.get_stats()["size"] == 2
+        assert cache.get_geometry("layer_1", 1)["data"] == "0" * 60
+        assert cache.get_geometry("layer_1", 2) is not None
+        assert cache.total_bytes == 100
+        assert_consistent(cache)
+
+    def test_invalidate_layer(self, optimization):
+        """Test that only the layer's entries are removed and counted"""
+        cache = optimization.GeometryCache()
+        for fid in range(3):
+            cache.put_geometry("layer_1", fid, geom(10))
+        cache.put_geometry("layer_1", 0, geom(10), simplify_tolerance=0.5)
+        cache.put_geometry("layer_2", 0, geom(20))
+
+        assert cache.invalidate_layer("layer_1") == 4
+        assert cache.invalidate_layer("layer_1") == 0
+        assert cache.invalidate_layer("missing") == 0
+
+        assert cache.get_geometry("layer_1", 0) is None
+        assert cache.get_geometry("layer_2", 0) is not None
+        assert cache.total_bytes == 20
+        assert_consistent(cache)
+
+    def test_index_consistent_after_eviction(self, optimization):
+        """Test that a layer evicted entirely leaves no index entry behind"""
+        cache = optimization.GeometryCache(max_size=2)
+        cache.put_geometry("layer_1", 1, geom(1))
+        cache.put_geometry("layer_2", 1, geom(1))
+        cache.put_geometry("layer_2", 2, geom(1))
+
+        assert "layer_1" not in cache._layer_index
+        assert cache.invalidate_layer("layer_1") == 0
+        assert cache.invalidate_layer("layer_2") == 2
+        assert cache.get_stats()["size"] == 0
+        assert_consistent(cache)
+
+    def test_stats_and_clear(self, optimization):
+        """Test hit/miss counting and that clear() resets entries and counters"""
+        cache = optimization.GeometryCache(max_bytes=1000)
+        cache.put_geometry("layer_1", 1, geom(10))
+        cache.get_geometry("layer_1", 1)
+        cache.get_geometry("layer_1", 2)
+
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 50.0)
+        assert (stats["bytes"], stats["max_bytes"]) == (10, 1000)
+
+        cache.clear()
+        stats = cache.get_stats()
+        assert (stats["size"], stats["bytes"], stats["hits"], stats["misses"]) == (0, 0, 0, 0)
+        assert_consistent(cache)
+
+    def test_concurrent_access(self, optimization):
+        """Test that puts, gets and invalidations from many threads keep bookkeeping exact"""
+        cache = optimization.GeometryCache(max_size=50, max_bytes=2000)
+        barrier = threading.Barrier(4)
+
+        def worker(n):
+            barrier.wait()
+            for i in range(2000):
+                layer_id = f"layer_{i % 3}"
+                cache.put_geometry(layer_id, i % 40, geom(10 + n), simplify_tolerance=n % 2)
+                cache.get_geometry(layer_id, (i * 7) % 40)
+                if i % 97 == 0:
+                    cache.invalidate_layer(layer_id)
+
+        # Switch threads often so unlocked read-modify-write sequences would interleave
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        stats = cache.get_stats()
+        assert stats["size"] <= 50 and stats["bytes"] <= 2000
+        assert stats["hits"] + stats["misses"] == 4 * 2000
+        assert_consistent(cache)
+
+
+class FakeSignal:
+    """Minimal stand-in for a Qt signal"""
+
+    def __init__(self):
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+    def emit(self, *args):
+        for slot in list(self.slots):
+            slot(*args)
+
+
+class FakeField:
+    def __init__(self, name, type_name="String"):
+        self._name = name
+        self._type_name = type_name
+
+    def name(self):
+        return self._name
+
+    def typeName(self):
+        return self._type_name
+
+
+class FakeLayer:
+    def __init__(self, field_names):
+        self.field_list = [FakeField(name) for name in field_names]
+        self.updatedFields = FakeSignal()
+        self.willBeDeleted = FakeSignal()
+
+    def fields(self):
+        return self.field_list
+
+
+class TestFieldCache:
+    """Test per-layer field name caching"""
+
+    def test_fields_cached_until_updated(self, optimization):
+        """Test that fields are read once and re-read after updatedFields"""
+        access = optimization.OptimizedFeatureAccess()
+        layer = FakeLayer(["a", "b"])
+
+        assert access._get_fields("layer_1", layer)[0] == ["a", "b"]
+        layer.field_list = [FakeField("c")]
+        assert access._get_fields("layer_1", layer)[0] == ["a", "b"]
+
+        layer.updatedFields.emit()
+        assert access._get_fields("layer_1", layer)[0] == ["c"]
+
+    def test_reloaded_layer_with_same_id_is_watched(self, optimization):
+        """Test that a layer replacing a deleted one with the same ID gets its own signals"""
+        access = optimization.OptimizedFeatureAccess()
+        old_layer = FakeLayer(["a"])
+        access._get_fields("layer_1", old_layer)
+        old_layer.willBeDeleted.emit()
+
+        new_layer = FakeLayer(["x", "y"])
+        assert access._get_fields("layer_1", new_layer)[0] == ["x", "y"]
+        assert len(new_layer.updatedFields.slots) == 1
+
+        new_layer.field_list = [FakeField("z")]
+        new_layer.updatedFields.emit()
+        assert access._get_fields("layer_1", new_layer)[0] == ["z"]
@@ -62,6 +62,13 @@ class TestMessageSerialization:
 
         assert result == message
 
+    def test_serialize_non_string_keys(self, protocol_handler):
+        """Test that non-string keys become strings, as with stdlib json"""
+        message = {"type": "test", "id": "msg_001", "data": {1: "a"}}
+        data = protocol_handler.serialize(message)
+
+        assert protocol_handler.deserialize(data)["data"] == {"1": "a"}
+
     def test_serialize_invalid_type_fails(self, protocol_handler):
         """Test that serializing non-dict fails"""
         pytest.skip("Protocol handler serialize() accepts various types via msgpack/json")
@@ -107,6 +114,17 @@ class TestMessagePack:
         # (though not guaranteed for all messages)
         assert msgpack_size <= json_size * 1.2  # Within 20%
 
+    def test_msgpack_serialize_from_threads(self, msgpack_protocol):
+        """Test that one handler serializes correctly from many threads"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        def round_trip(i):
+            message = {"type": "ping", "id": f"msg_{i}", "data": {"blob": bytes([i % 256]) * i}}
+            return msgpack_protocol.deserialize(msgpack_protocol.serialize(message)) == message
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert all(pool.map(round_trip, range(500)))
+
 
 class TestSchemaValidation:
     """Test JSON Schema validation"""
@@ -167,6 +185,74 @@ class TestSchemaValidation:
         with pytest.raises(ProtocolException, match="validation failed"):
             protocol_handler.validate_message(message)
 
+    def test_response_with_epoch(self, protocol_handler):
+        """Test that responses may carry the layer epoch"""
+        message = {"type": "response", "id": "msg_001", "success": True, "epoch": 3, "data": {}}
+        protocol_handler.validate_message(message)  # Should not raise
+
+    def test_get_features_geometry_modes(self, protocol_handler):
+        """Test that get_features accepts only known geometry modes"""
+        for mode in ("wkb", "bbox", "none"):
+            message = {
+                "type": "get_features",
+                "id": "msg_001",
+                "data": {"layer_id": "layer_1", "geometry": mode},
+            }
+            protocol_handler.validate_message(message)  # Should not raise
+
+        message = {
+            "type": "get_features",
+            "id": "msg_001",
+            "data": {"layer_id": "layer_1", "geometry": "wkt_full"},
+        }
+        with pytest.raises(ProtocolException, match="validation failed"):
+            protocol_handler.validate_message(message)
+
+    def test_get_features_columnar_flag(self, protocol_handler):
+        """Test that get_features accepts a boolean columnar flag"""
+        message = {
+            "type": "get_features",
+            "id": "msg_001",
+            "data": {"layer_id": "layer_1", "columnar": True},
+        }
+        protocol_handler.validate_message(message)  # Should not raise
+
+        message["data"]["columnar"] = "yes"
+        with pytest.raises(ProtocolException, match="validation failed"):
+            protocol_handler.validate_message(message)
+
+    def test_valid_aggregate_message(self, protocol_handler):
+        """Test that valid aggregate message passes validation"""
+        message = {
+            "type": "aggregate",
+            "id": "msg_001",
+            "data": {"layer_id": "layer_1", "field": "area_km2", "op": "sum"},
+        }
+        protocol_handler.validate_message(message)  # Should not raise
+
+    def test_aggregate_unknown_op(self, protocol_handler):
+        """Test that aggregate with unsupported operation fails"""
+        message = {
+            "type": "aggregate",
+            "id": "msg_001",
+            "data": {"layer_id": "layer_1", "field": "area_km2", "op": "product"},
+        }
+        with pytest.raises(ProtocolException, match="validation failed"):
+            protocol_handler.validate_message(message)
+
+    def test_validators_built_once(self, protocol_handler, monkeypatch):
+        """Test that validation reuses the validators compiled at import"""
+        import jsonschema
+
+        def fail(*args, **kwargs):
+            raise AssertionError("validator rebuilt per message")
+
+        monkeypatch.setattr(jsonschema, "validate", fail)
+
+        protocol_handler.validate_message({"type": "ping", "id": "msg_001"})
+        with pytest.raises(ProtocolException, match="validation failed"):
+            protocol_handler.validate_message({"type": "", "id": "msg_001"})
+
 
 class TestLengthPrefixFraming:
     """Test length-prefix protocol framing"""
@@ -193,6 +279,24 @@ class TestLengthPrefixFraming:
         actual_message_len = len(packed) - protocol_handler.HEADER_SIZE
         assert message_len == actual_message_len
 
+    def test_pack_trusted_message_skips_validation(self, protocol_handler):
+        """Test that validated=True bypasses the schema check"""
+        message = {"type": "ping", "id": "msg_001", "extra_field": "internal"}
+
+        with pytest.raises(ProtocolException, match="validation failed"):
+            protocol_handler.pack_message(message)
+
+        packed = protocol_handler.pack_message(message, validated=True)
+        assert protocol_handler.deserialize(packed[4:]) == message
+
+    def test_encode_frame_matches_pack_message(self, protocol_handler):
+        """Test that encode_frame returns the packed message in two parts"""
+        message = {"type": "ping", "id": "msg_001"}
+        header, payload = protocol_handler.encode_frame(message)
+
+        assert len(header) == protocol_handler.HEADER_SIZE
+        assert header + payload == protocol_handler.pack_message(message)
+
     def test_message_too_large_blocked(self, protocol_handler):
         """Test that oversized messages are blocked"""
         from protocol import ProtocolHandler
@@ -248,6 +352,47 @@ class TestSocketCommunication:
             received = protocol_handler.receive_message(server_sock, timeout=1.0)
             assert received == expected
 
+    def test_small_message_single_recv(self, protocol_handler, socket_pair):
+        """Test that header and body of a small message arrive in one recv"""
+        server_sock, client_sock = socket_pair
+
+        class CountingSocket:
+            def __init__(self, sock):
+                self.sock = sock
+                self.recv_calls = 0
+
+            def settimeout(self, timeout):
+                self.sock.settimeout(timeout)
+
+            def recv(self, size):
+                self.recv_calls += 1
+                return self.sock.recv(size)
+
+        counting = CountingSocket(server_sock)
+        protocol_handler.send_message(client_sock, {"type": "ping", "id": "msg_001"})
+
+        assert protocol_handler.receive_message(counting, timeout=1.0)["id"] == "msg_001"
+        assert counting.recv_calls == 1
+
+    def test_messages_in_one_send(self, protocol_handler, socket_pair):
+        """Test that bytes read past one message are kept for the next"""
+        server_sock, client_sock = socket_pair
+        first = protocol_handler.pack_message({"type": "ping", "id": "msg_001"})
+        second = protocol_handler.pack_message({"type": "ping", "id": "msg_002"})
+        client_sock.sendall(first + second)
+
+        assert protocol_handler.receive_message(server_sock, timeout=1.0)["id"] == "msg_001"
+        assert protocol_handler.receive_message(server_sock, timeout=1.0)["id"] == "msg_002"
+
+    def test_truncated_message_fails(self, protocol_handler, socket_pair):
+        """Test that a connection closed mid-body is reported"""
+        server_sock, client_sock = socket_pair
+        client_sock.sendall(struct.pack("!I", 100) + b"x" * 10)
+        client_sock.close()
+
+        with pytest.raises(ProtocolException, match="closed before message complete"):
+            protocol_handler.receive_message(server_sock, timeout=1.0)
+
     def test_receive_timeout(self, protocol_handler, socket_pair):
         """Test that receive times out correctly"""
         server_sock, client_sock = socket_pair
@@ -285,6 +430,31 @@ class TestSocketCommunication:
 
         assert received["data"] == large_data
 
+    @pytest.mark.parametrize("sendmsg_limit", [None, 2, 50000])
+    def test_send_large_message_partial_writes(self, sendmsg_limit):
+        """Test that large frames survive short vectored writes and no sendmsg"""
+        handler = ProtocolHandler(use_msgpack=False, validate_schema=False)
+        message = {"type": "ping", "id": "msg_001", "data": "x" * 100000}
+
+        class ShortWriteSocket:
+            def __init__(self):
+                self.sent = bytearray()
+
+            def sendmsg(self, buffers):
+                if sendmsg_limit is None:
+                    raise NotImplementedError
+                data = b"".join(buffers)[:sendmsg_limit]
+                self.sent += data
+                return len(data)
+
+            def sendall(self, data):
+                self.sent += data
+
+        sock = ShortWriteSocket()
+        handler.send_message(sock, message)
+
+        assert bytes(sock.sent) == handler.pack_message(message)
+
 
 class TestBufferedProtocol:
     """Test buffered protocol handler"""
@@ -347,6 +517,23 @@ class TestBufferedProtocol:
         assert result1 == messages[0]
         assert result2 == messages[1]
 
+    def test_read_many_messages_with_partial_tail(self, buffered_protocol):
+        """Test consuming many buffered messages while a partial one is pending"""
+        handler = ProtocolHandler(use_msgpack=False, validate_schema=True)
+        packed = [handler.pack_message({"type": "ping", "id": f"msg_{i}"}) for i in range(200)]
+        tail = handler.pack_message({"type": "ping", "id": "msg_tail"})
+
+        buffered_protocol.feed_data(b"".join(packed) + tail[:5])
+        for i in range(200):
+            assert buffered_protocol.try_read_message()["id"] == f"msg_{i}"
+
+        assert buffered_protocol.try_read_message() is None
+        assert buffered_protocol.get_buffer_size() == 5
+
+        buffered_protocol.feed_data(tail[5:])
+        assert buffered_protocol.try_read_message()["id"] == "msg_tail"
+        assert buffered_protocol.get_buffer_size() == 0
+
     def test_buffer_overflow_protection(self, buffered_protocol):
         """Test that buffer overflow is prevented"""
         # Try to feed more than max buffer size
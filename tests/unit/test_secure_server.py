@@ -0,0 +1,275 @@
+"""
+Unit tests for the Secure Server selector loop
+
+Runs the real server on loopback without QGIS (mock_qgis for imports).
+
+Tests cover:
+- Authentication gating
+- Pipelined requests
+- Idle client timeout
+- Partial writes of large responses
+- Responses that cannot be encoded
+- Aggregate values of temporal fields
+"""
+
+import importlib
+import socket
+import threading
+import time
+
+import pytest
+from protocol import ProtocolHandler
+
+
+@pytest.fixture
+def server_module(mock_qgis, monkeypatch):
+    """Secure server module, with QGIS integration turned off"""
+    module = importlib.import_module("qgis_mcp_plugin.qgis_mcp_server_secure")
+    monkeypatch.setattr(module, "HAS_QGIS", False)
+    return module
+
+
+@pytest.fixture
+def server(server_module):
+    """Secure server running its selector loop on an ephemeral port"""
+    srv = server_module.SecureQGISMCPServer(port=0, require_auth=True)
+    thread = threading.Thread(target=srv.start, daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + 5
+    while not srv.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+    srv.port = srv.server_socket.getsockname()[1]
+    srv.thread = thread
+
+    yield srv
+
+    srv.stop()
+    thread.join(timeout=5)
+    srv.auth_manager.storage.delete_token()
+
+
+@pytest.fixture
+def client_protocol():
+    return ProtocolHandler(use_msgpack=True, validate_schema=False)
+
+
+def connect(server, protocol=None, authenticate=False):
+    """Open a client connection, optionally authenticating it first"""
+    sock = socket.create_connection(("127.0.0.1", server.port), timeout=5)
+    if authenticate:
+        protocol.send_message(
+            sock,
+            {"type": "authenticate", "id": "auth", "data": {"token": server.auth_manager.api_token}},
+        )
+        assert protocol.receive_message(sock, timeout=5)["success"] is True
+    return sock
+
+
+def wait_closed(sock, timeout=5.0):
+    """Wait until the server closes the connection"""
+    sock.settimeout(timeout)
+    try:
+        while sock.recv(65536):
+            pass
+    except ConnectionResetError:
+        pass
+
+
+class TestAuthenticationGating:
+    """Test that requests need an authenticated connection"""
+
+    def test_request_before_authentication_rejected(self, server, client_protocol):
+        """Test that commands are refused until the connection authenticates"""
+        with connect(server) as sock:
+            client_protocol.send_message(sock, {"type": "ping", "id": "p1"})
+            response = client_protocol.receive_message(sock, timeout=5)
+
+        assert response["success"] is False
+        assert response["error"] == "Authentication required"
+
+    def test_wrong_token_rejected(self, server, client_protocol):
+        """Test that a wrong token does not authenticate the connection"""
+        with connect(server) as sock:
+            client_protocol.send_message(
+                sock, {"type": "authenticate", "id": "a1", "data": {"token": "x" * 43}}
+            )
+            assert client_protocol.receive_message(sock, timeout=5)["success"] is False
+
+            client_protocol.send_message(sock, {"type": "ping", "id": "p1"})
+            assert client_protocol.receive_message(sock, timeout=5)["success"] is False
+
+    def test_authentication_is_per_connection(self, server, client_protocol):
+        """Test that authenticating one connection does not authenticate another"""
+        with connect(server, client_protocol, authenticate=True) as authed, connect(server) as other:
+            client_protocol.send_message(authed, {"type": "ping", "id": "p1"})
+            assert client_protocol.receive_message(authed, timeout=5)["data"]["pong"] is True
+
+            client_protocol.send_message(other, {"type": "ping", "id": "p2"})
+            assert client_protocol.receive_message(other, timeout=5)["success"] is False
+
+
+class TestPipelining:
+    """Test several requests sent before reading any response"""
+
+    def test_pipelined_requests_answered_in_order(self, server, client_protocol):
+        """Test that requests in one write are all answered, in order"""
+        ids = [f"msg_{i}" for i in range(10)]
+        with connect(server, client_protocol, authenticate=True) as sock:
+            sock.sendall(b"".join(
+                client_protocol.pack_message({"type": "ping", "id": msg_id}) for msg_id in ids
+            ))
+            responses = [client_protocol.receive_message(sock, timeout=5) for _ in ids]
+
+        assert [r["id"] for r in responses] == ids
+        assert all(r["success"] for r in responses)
+
+    def test_request_split_across_writes(self, server, client_protocol):
+        """Test that a frame arriving a few bytes at a time is reassembled"""
+        frame = client_protocol.pack_message({"type": "ping", "id": "split"})
+        with connect(server, client_protocol, authenticate=True) as sock:
+            for i in range(0, len(frame), 3):
+                sock.sendall(frame[i:i + 3])
+                time.sleep(0.005)
+            response = client_protocol.receive_message(sock, timeout=5)
+
+        assert response["id"] == "split"
+        assert response["success"] is True
+
+
+class TestIdleTimeout:
+    """Test disconnection of idle clients"""
+
+    def test_idle_client_disconnected(self, server, client_protocol):
+        """Test that a client sending nothing is closed after CLIENT_TIMEOUT"""
+        server.CLIENT_TIMEOUT = 0.3
+        with connect(server) as sock:
+            # Wake the loop so it picks up the shorter timeout
+            client_protocol.send_message(sock, {"type": "ping", "id": "p1"})
+            client_protocol.receive_message(sock, timeout=5)
+
+            started = time.monotonic()
+            wait_closed(sock)
+
+        assert time.monotonic() - started < 3
+        assert server.active_connections == 0
+
+    def test_active_client_kept(self, server, client_protocol):
+        """Test that a client sending requests within the timeout stays connected"""
+        server.CLIENT_TIMEOUT = 0.5
+        with connect(server, client_protocol, authenticate=True) as sock:
+            for i in range(5):
+                time.sleep(0.2)
+                client_protocol.send_message(sock, {"type": "ping", "id": f"p{i}"})
+                assert client_protocol.receive_message(sock, timeout=5)["success"] is True
+
+
+class TestPartialWrites:
+    """Test responses larger than the socket send buffer"""
+
+    def test_large_response_delivered_to_slow_reader(self, server, client_protocol):
+        """Test that a response sent over many partial writes arrives intact"""
+        blob = bytes(range(256)) * (4 * 1024 * 4)  # 4 MiB
+        server.command_handlers["ping"] = lambda message, client_id: {"blob": blob}
+        # Draining output counts as activity, so the slow read must not time out
+        server.CLIENT_TIMEOUT = 1.0
+
+        with connect(server, client_protocol, authenticate=True) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)
+            sock.sendall(
+                client_protocol.pack_message({"type": "ping", "id": "big1"})
+                + client_protocol.pack_message({"type": "ping", "id": "big2"})
+            )
+            # Let the server fill the socket buffers and park the rest
+            time.sleep(0.3)
+            first = client_protocol.receive_message(sock, timeout=10)
+            second = client_protocol.receive_message(sock, timeout=10)
+
+        assert first["id"] == "big1" and first["data"]["blob"] == blob
+        assert second["id"] == "big2" and second["data"]["blob"] == blob
+
+
+class TestUnencodableResponses:
+    """Test that a response that cannot be sent fails only its own client"""
+
+    @pytest.mark.parametrize(
+        "result",
+        [
+            {"value": object()},
+            {"blob": b"x" * (ProtocolHandler.MAX_MESSAGE_SIZE + 1)},
+        ],
+        ids=["unserializable", "too_large"],
+    )
+    def test_failure_closes_only_that_client(self, server, client_protocol, result):
+        """Test that the server reports the error, closes the client and keeps serving"""
+        server.command_handlers["aggregate"] = lambda message, client_id: result
+
+        with connect(server, client_protocol, authenticate=True) as bystander:
+            with connect(server, client_protocol, authenticate=True) as sock:
+                client_protocol.send_message(
+                    sock,
+                    {"type": "aggregate", "id": "agg1",
+                     "data": {"layer_id": "l1", "field": "f", "op": "count"}},
+                )
+                response = client_protocol.receive_message(sock, timeout=5)
+                wait_closed(sock)
+
+            assert response["id"] == "agg1"
+            assert response["success"] is False
+            assert response["error"] == "Internal server error"
+
+            assert server.thread.is_alive()
+            assert server.running
+            client_protocol.send_message(bystander, {"type": "ping", "id": "p1"})
+            assert client_protocol.receive_message(bystander, timeout=5)["success"] is True
+
+
+class FakeQDate:
+    """Stand-in for a QDate aggregate result"""
+
+    def isNull(self):
+        return False
+
+    def __str__(self):
+        return "2024-01-31"
+
+
+class FakeNullVariant:
+    """Stand-in for a NULL QVariant aggregate result"""
+
+    def isNull(self):
+        return True
+
+
+class TestAggregateValues:
+    """Test that aggregate results are always serializable"""
+
+    @pytest.fixture
+    def handler_server(self, server_module, monkeypatch):
+        """Server whose handlers see the mocked QGIS project (selector loop not started)"""
+        srv = server_module.SecureQGISMCPServer(port=0, require_auth=True)
+        monkeypatch.setattr(server_module, "HAS_QGIS", True)
+        yield srv
+        srv.auth_manager.storage.delete_token()
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [(FakeQDate(), "2024-01-31"), (FakeNullVariant(), None), (42.5, 42.5)],
+        ids=["date", "null", "number"],
+    )
+    def test_aggregate_value_serializable(self, handler_server, mock_qgis, value, expected):
+        """Test that temporal and NULL aggregate results are converted before sending"""
+        layer = mock_qgis["core"].QgsVectorLayer("", "dates", "memory")
+        layer.aggregate = lambda aggregate, expression, parameters: (value, True)
+        mock_qgis["project"].addMapLayer(layer)
+        try:
+            result = handler_server._handle_aggregate(
+                {"type": "aggregate", "id": "agg1",
+                 "data": {"layer_id": layer.id(), "field": "observed", "op": "max"}},
+                "127.0.0.1:1",
+            )
+        finally:
+            del mock_qgis["project"]._layers[layer.id()]
+
+        assert result["value"] == expected
+        ProtocolHandler(use_msgpack=True).serialize(result)
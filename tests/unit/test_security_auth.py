@@ -137,6 +137,14 @@ class TestTokenVerification:
         result = auth_manager.verify_token(client, wrong_token)
         assert result is False
 
+    def test_non_ascii_and_non_string_tokens_rejected(self, auth_manager):
+        """Test that malformed tokens are rejected instead of raising"""
+        client = "127.0.0.1:12351"
+
+        assert auth_manager.verify_token(client, "jeton-invalide-é") is False
+        assert auth_manager.verify_token(client, 12345) is False
+        assert auth_manager.verify_token(client, None) is False
+
 
 class TestAuthenticationTracking:
     """Test authentication state tracking"""
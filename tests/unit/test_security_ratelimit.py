@@ -306,24 +306,22 @@ class TestLockoutMechanism:
 class TestCleanupMechanism:
     """Test automatic cleanup of old data"""
 
-    def test_old_requests_removed(self, rate_limiter):
-        """Test that old requests are removed from history"""
+    def test_idle_bucket_refills(self, rate_limiter):
+        """Test that an exhausted bucket refills after the window passes"""
         client = "127.0.0.1:10022"
 
-        # Add some requests
-        for i in range(10):
+        # Exhaust the bucket
+        for i in range(30):
             rate_limiter.check_rate_limit(client, "normal")
+        assert rate_limiter.check_rate_limit(client, "normal") is False
 
-        # Manually age the requests
-        key = f"{client}:normal"
-        old_time = time.time() - 3600  # 1 hour ago
-        rate_limiter.request_history[key] = [old_time] * 10
-
-        # Next check should clean up old requests
-        rate_limiter.check_rate_limit(client, "normal")
+        # Manually age the bucket
+        key = (client, "normal")
+        rate_limiter.buckets[key][1] = time.time() - 3600  # 1 hour ago
 
-        # Old requests should be gone
-        assert len(rate_limiter.request_history[key]) == 1  # Only the new one
+        # Next check should refill to capacity and consume one token
+        assert rate_limiter.check_rate_limit(client, "normal") is True
+        assert rate_limiter.buckets[key][0] == pytest.approx(29, abs=0.01)
 
     def test_old_clients_cleaned_up(self, rate_limiter):
         """Test that old clients are removed from tracking"""
@@ -334,7 +332,7 @@ class TestCleanupMechanism:
 
         # Should trigger cleanup
         # Verify cleanup happened (size should not grow unbounded)
-        assert len(rate_limiter.request_history) <= 1500
+        assert len(rate_limiter.buckets) <= 1500
 
     def test_old_failed_auth_attempts_removed(self, rate_limiter):
         """Test that old failed auth attempts are removed"""